@@ -0,0 +1,398 @@
+"""Scale benchmarks of core chemlite operations.
+
+Usage:
+    python benchmarks/bench_chemlite.py --sizes 100 1000 10000 --output bench.json
+"""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from argparse import ArgumentParser
+from typing import Callable, Dict, List, Tuple
+from json import dump as json_dump, dumps as json_dumps
+from math import log
+from os import path as os_path
+from platform import platform, python_version
+from statistics import median
+from io import StringIO
+from sys import path as sys_path, stderr, stdout
+from time import perf_counter, strftime
+
+# Make 'chemlite' and 'generators' importable when run from anywhere
+HERE = os_path.dirname(os_path.realpath(__file__))
+sys_path[:0] = [HERE, os_path.dirname(HERE)]
+
+from brs_utils import Cache  # noqa: E402
+from chemlite import Compound, CompoundIndex, Reaction, __version__  # noqa: E402
+from chemlite.serializer import (  # noqa: E402
+    dump_reactions_smiles,
+    dumps_pathway,
+)
+from generators import (  # noqa: E402
+    make_compounds,
+    make_pathway,
+    make_reaction_strings,
+    make_reactions,
+    make_stoichio,
+)
+
+# Number of synthetic compounds to pick reactions species from
+NB_COMPOUNDS = 1000
+
+
+def _bench_parse(size: int) -> Tuple[Callable, Callable]:
+    def setup():
+        return make_reaction_strings(size, NB_COMPOUNDS)
+
+    def run(rxns):
+        for rxn in rxns:
+            Reaction.parse(rxn)
+
+    return setup, run
+
+
+def _bench_construction(size: int) -> Tuple[Callable, Callable]:
+    def setup():
+        return make_stoichio(size, NB_COMPOUNDS)
+
+    def run(rxns):
+        for i, rxn in enumerate(rxns):
+            Reaction(id=f"rxn_{i}", **rxn)
+
+    return setup, run
+
+
+def _on_reactions(method: str) -> Callable:
+    def bench(size: int) -> Tuple[Callable, Callable]:
+        def setup():
+            return make_reactions(size, NB_COMPOUNDS)
+
+        def run(rxns):
+            for rxn in rxns:
+                getattr(rxn, method)()
+
+        return setup, run
+
+    return bench
+
+
+def _bench_reactions_smiles(size: int) -> Tuple[Callable, Callable]:
+    def setup():
+        return make_reactions(size, NB_COMPOUNDS)
+
+    def run(rxns):
+        dump_reactions_smiles(rxns, StringIO())
+
+    return setup, run
+
+
+def _on_pathway(func: Callable) -> Callable:
+    def bench(size: int) -> Tuple[Callable, Callable]:
+        def setup():
+            return make_pathway(size)
+
+        return setup, func
+
+    return bench
+
+
+def _bench_pathway_eq(size: int) -> Tuple[Callable, Callable]:
+    def setup():
+        return make_pathway(size, "pathway_1"), make_pathway(size, "pathway_2")
+
+    def run(pathways):
+        return pathways[0] == pathways[1]
+
+    return setup, run
+
+
+def _bench_pathway_diff(size: int) -> Tuple[Callable, Callable]:
+    def setup():
+        return make_pathway(size, "pathway_1"), make_pathway(size, "pathway_2")
+
+    def run(pathways):
+        return pathways[0].diff(pathways[1])
+
+    return setup, run
+
+
+def _bench_pathway_rename(size: int) -> Tuple[Callable, Callable, Callable]:
+    # a synthetic compound in every reaction is renamed, rather than a
+    # cofactor shared with other operations
+    cmpd_id = "BENCH_RENAME"
+    new_id = f"{cmpd_id}_renamed"
+
+    def setup():
+        pathway = make_pathway(size)
+        Compound(id=cmpd_id)
+        for rxn in pathway.get_list_of_reactions():
+            rxn.add_product(cmpd_id, 1)
+        return pathway
+
+    def run(pathway):
+        pathway.rename_compound(cmpd_id, new_id)
+
+    def teardown(pathway):
+        # the compound is registered under both IDs once renamed
+        for spe_id in (cmpd_id, new_id):
+            compound = Cache.get(spe_id)
+            if compound is not None:
+                CompoundIndex.remove_compound(compound)
+                Cache.remove_object_by_id(spe_id)
+
+    return setup, run, teardown
+
+
+# Operations to time. Each entry builds (setup, run[, teardown]) functions for
+# a given size, only 'run' is timed.
+BENCHMARKS: Dict[str, Callable] = {
+    "Reaction.parse": _bench_parse,
+    "Reaction.__init__": _bench_construction,
+    "Reaction.get_reactants": _on_reactions("get_reactants"),
+    "Reaction.get_smiles": _on_reactions("get_smiles"),
+    "serializer.dump_reactions_smiles": _bench_reactions_smiles,
+    "Reaction._to_dict": _on_reactions("_to_dict"),
+    "Pathway._to_dict": _on_pathway(lambda pathway: pathway._to_dict()),
+    "json.dumps(Pathway._to_dict())": _on_pathway(
+        lambda pathway: json_dumps(pathway._to_dict())
+    ),
+    "serializer.dumps_pathway": _on_pathway(dumps_pathway),
+    "Pathway.__eq__": _bench_pathway_eq,
+    "Pathway.diff": _bench_pathway_diff,
+    "Pathway.net_reaction": _on_pathway(lambda pathway: pathway.net_reaction()),
+    "Pathway.copy+replace_reaction": _on_pathway(
+        lambda pathway: pathway.copy().replace_reaction(
+            "rxn_0", pathway.get_reaction("rxn_1")
+        )
+    ),
+    "Pathway.rename_compound": _bench_pathway_rename,
+}
+
+# Operations known to be quadratic, skipped above 'quadratic_limit'
+# (none since Pathway.__eq__ compares hashed sets of reactions)
+QUADRATIC: List[str] = []
+
+
+def time_operation(
+    setup: Callable, run: Callable, repeats: int, teardown: Callable = None
+) -> List[float]:
+    """Times 'run' over 'repeats' runs, each on a fresh 'setup' result
+
+    Parameters
+    ----------
+    setup: Callable
+        Function building the input of 'run' (not timed)
+    run: Callable
+        Function to time
+    repeats: int
+        Number of runs
+    teardown: Callable
+        Function undoing side effects of 'setup' and 'run' on their input
+        (not timed), e.g. compounds left in the cache
+
+    Returns
+    -------
+    timings: List[float]
+        Elapsed time (in seconds) of each run
+    """
+    timings = []
+    for _ in range(repeats):
+        data = setup()
+        start = perf_counter()
+        run(data)
+        timings.append(perf_counter() - start)
+        if teardown is not None:
+            teardown(data)
+    return timings
+
+
+def scaling_exponent(points: List[Tuple[int, float]]) -> float:
+    """Returns the slope of the log-log least squares fit of (size, time)
+    points, i.e. k in time ~ size^k (1 for linear, 2 for quadratic...)
+
+    Parameters
+    ----------
+    points: List[Tuple[int, float]]
+        (size, time) points
+
+    Returns
+    -------
+    exponent: float
+        Scaling exponent, None if less than two points are available
+    """
+    points = [(log(size), log(t)) for size, t in points if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    return cov / var if var else None
+
+
+def run_benchmarks(
+    sizes: List[int],
+    operations: List[str] = None,
+    repeats: int = 3,
+    quadratic_limit: int = 10**3,
+    verbose: bool = False,
+) -> Dict:
+    """Runs benchmarks for all operations at all sizes
+
+    Parameters
+    ----------
+    sizes: List[int]
+        Sizes (number of reactions, reactions strings or pathway steps)
+    operations: List[str]
+        Names of operations to run (default: all in BENCHMARKS)
+    repeats: int
+        Number of runs per (operation, size)
+    quadratic_limit: int
+        Size above which quadratic operations are skipped
+    verbose: bool
+        Print progress on stderr
+
+    Returns
+    -------
+    report: Dict
+        Machine-readable report with environment, raw results and scaling
+    """
+    if operations is None:
+        operations = list(BENCHMARKS)
+    # Compounds species of synthetic reactions are picked from
+    make_compounds(NB_COMPOUNDS)
+    results = []
+    scaling = {}
+    for op in operations:
+        points = []
+        for size in sorted(sizes):
+            if op in QUADRATIC and size > quadratic_limit:
+                results.append({"operation": op, "size": size, "skipped": True})
+                continue
+            setup, run, *teardown = BENCHMARKS[op](size)
+            timings = time_operation(setup, run, repeats, *teardown)
+            best = min(timings)
+            points.append((size, best))
+            results.append(
+                {
+                    "operation": op,
+                    "size": size,
+                    "repeats": repeats,
+                    "best_s": best,
+                    "median_s": median(timings),
+                    "per_item_us": best / size * 1e6,
+                }
+            )
+            if verbose:
+                print(f"{op:<36} {size:>9} {best:>12.6f} s", file=stderr, flush=True)
+        scaling[op] = scaling_exponent(points)
+    return {
+        "chemlite_version": __version__,
+        "python": python_version(),
+        "platform": platform(),
+        "date": strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": sorted(sizes),
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def print_scaling(report: Dict, file=stderr) -> None:
+    """Prints a summary table of the scaling curves of a report
+
+    Parameters
+    ----------
+    report: Dict
+        Report returned by run_benchmarks()
+    file: TextIO
+        Stream to print to (default: stderr, stdout being kept for JSON)
+    """
+    sizes = report["sizes"]
+    timings = {
+        (res["operation"], res["size"]): res.get("best_s") for res in report["results"]
+    }
+    print(
+        f"{'operation':<36}"
+        + "".join(f"{size:>12}" for size in sizes)
+        + f"{'exponent':>10}",
+        file=file,
+    )
+    for op, exponent in report["scaling"].items():
+        cells = [timings.get((op, size)) for size in sizes]
+        print(
+            f"{op:<36}"
+            + "".join(f"{'-':>12}" if t is None else f"{t:>12.5f}" for t in cells)
+            + ("" if exponent is None else f"{exponent:>10.2f}"),
+            file=file,
+        )
+
+
+def main(args: List[str] = None) -> Dict:
+    parser = ArgumentParser(description="Scale benchmarks of chemlite operations")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10**2, 10**3, 10**4],
+        help="problem sizes (default: 100 1000 10000)",
+    )
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=None,
+        help="operations to run (default: all)",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--quadratic-limit",
+        type=int,
+        default=10**3,
+        help="skip quadratic operations above this size",
+    )
+    parser.add_argument(
+        "--output", help="JSON file to write the report to (default: stdout)"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    parsed = parser.parse_args(args)
+
+    report = run_benchmarks(
+        sizes=parsed.sizes,
+        operations=parsed.operations,
+        repeats=parsed.repeats,
+        quadratic_limit=parsed.quadratic_limit,
+        verbose=parsed.verbose,
+    )
+    print_scaling(report)
+    if parsed.output:
+        with open(parsed.output, "w") as fp:
+            json_dump(report, fp, indent=2)
+    else:
+        json_dump(report, stdout, indent=2)
+        print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
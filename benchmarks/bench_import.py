@@ -0,0 +1,115 @@
+"""Import time benchmarks of chemlite.
+
+Usage:
+    python benchmarks/bench_import.py --repeats 20 --output import.json
+"""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from argparse import ArgumentParser
+from typing import Dict, List
+from json import dump as json_dump
+from os import environ, path as os_path, pathsep
+from statistics import median
+from subprocess import run
+from sys import executable, stderr, stdout
+from time import perf_counter
+
+HERE = os_path.dirname(os_path.realpath(__file__))
+
+# Statements to time, each one in a fresh interpreter
+STATEMENTS: Dict[str, str] = {
+    "interpreter": "pass",
+    "import chemlite": "import chemlite",
+    "from chemlite import Reaction": "from chemlite import Reaction",
+    "from chemlite import Pathway": "from chemlite import Pathway",
+}
+
+
+def time_statement(statement: str, repeats: int) -> List[float]:
+    """Times the execution of 'statement' in fresh interpreters
+
+    Parameters
+    ----------
+    statement: str
+        Python statement to run
+    repeats: int
+        Number of interpreters to spawn
+
+    Returns
+    -------
+    timings: List[float]
+        Wall-clock time (in seconds) of each interpreter run
+    """
+    env = dict(environ)
+    # import the chemlite of this repository
+    env["PYTHONPATH"] = pathsep.join(
+        [os_path.dirname(HERE)] + [p for p in [env.get("PYTHONPATH")] if p]
+    )
+    timings = []
+    for _ in range(repeats):
+        start = perf_counter()
+        run([executable, "-c", statement], env=env, check=True)
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def main(args: List[str] = None) -> Dict:
+    parser = ArgumentParser(description="Import time benchmarks of chemlite")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument(
+        "--output", help="JSON file to write the report to (default: stdout)"
+    )
+    parsed = parser.parse_args(args)
+
+    results = []
+    for name, statement in STATEMENTS.items():
+        timings = time_statement(statement, parsed.repeats)
+        results.append(
+            {
+                "statement": name,
+                "repeats": parsed.repeats,
+                "best_s": min(timings),
+                "median_s": median(timings),
+            }
+        )
+        print(f"{name:<32}{min(timings):>12.5f} s", file=stderr)
+    # time spent in chemlite only, interpreter startup apart
+    startup = results[0]["best_s"]
+    for res in results:
+        res["overhead_s"] = res["best_s"] - startup
+
+    report = {"python": executable, "results": results}
+    if parsed.output:
+        with open(parsed.output, "w") as fp:
+            json_dump(report, fp, indent=2)
+    else:
+        json_dump(report, stdout, indent=2)
+        print()
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Synthetic generators of compounds, reactions and pathways for benchmarks."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, List
+from random import Random
+from string import ascii_uppercase
+
+from chemlite import Compound, Reaction, Pathway
+
+# Species shared by most reactions, as H+, H2O, NADPH... in real pathways
+COFACTORS = ["MNXM1", "MNXM2", "MNXM4", "MNXM5", "MNXM6", "MNXM13"]
+
+
+def compound_id(i: int) -> str:
+    """Returns the ID of the i-th synthetic compound"""
+    return f"CMPD_{i:010d}"
+
+
+def make_compound_dict(i: int, rng: Random) -> Dict:
+    """Returns the attributes of the i-th synthetic compound
+
+    Parameters
+    ----------
+    i: int
+        Index of the compound
+    rng: Random
+        Random generator
+
+    Returns
+    -------
+    compound: Dict
+        Attributes of the compound, as accepted by Compound.from_dict()
+    """
+    block1 = "".join(rng.choice(ascii_uppercase) for _ in range(14))
+    block2 = "".join(rng.choice(ascii_uppercase) for _ in range(8))
+    length = rng.randint(3, 30)
+    return {
+        "id": compound_id(i),
+        "name": f"compound {i}",
+        "smiles": "C" * length + "O",
+        "inchi": f"InChI=1S/C{length}H{2 * length + 2}O/c1-{length}",
+        "inchikey": f"{block1}-{block2}SA-N",
+        "formula": f"C{length}H{2 * length + 2}O",
+    }
+
+
+def make_compounds(n: int, seed: int = 0) -> List[Compound]:
+    """Builds n synthetic compounds (registered in the cache)
+
+    Parameters
+    ----------
+    n: int
+        Number of compounds
+    seed: int
+        Seed of the random generator
+
+    Returns
+    -------
+    compounds: List[Compound]
+        Synthetic compounds, cofactors first
+    """
+    rng = Random(seed)
+    compounds = [
+        Compound(id=cof, smiles="[H+]" if cof == "MNXM1" else "O") for cof in COFACTORS
+    ]
+    compounds += [Compound.from_dict(make_compound_dict(i, rng)) for i in range(n)]
+    return compounds
+
+
+def make_stoichio(n: int, nb_compounds: int, seed: int = 0) -> List[Dict]:
+    """Returns n stoichiometric definitions of reactions between
+    nb_compounds synthetic compounds and the cofactors
+
+    Parameters
+    ----------
+    n: int
+        Number of reactions
+    nb_compounds: int
+        Number of distinct (non cofactor) compounds to pick species from
+    seed: int
+        Seed of the random generator
+
+    Returns
+    -------
+    reactions: List[Dict]
+        List of {'reactants': {...}, 'products': {...}}
+    """
+    rng = Random(seed)
+    reactions = []
+    for _ in range(n):
+        left = {compound_id(rng.randrange(nb_compounds)): rng.randint(1, 2)}
+        right = {compound_id(rng.randrange(nb_compounds)): 1}
+        left[rng.choice(COFACTORS)] = rng.randint(1, 3)
+        right[rng.choice(COFACTORS)] = 1
+        reactions.append({"reactants": left, "products": right})
+    return reactions
+
+
+def make_reaction_strings(n: int, nb_compounds: int, seed: int = 0) -> List[str]:
+    """Returns n reactions written as 'a A + b B = c C' strings
+
+    Parameters
+    ----------
+    n: int
+        Number of reactions
+    nb_compounds: int
+        Number of distinct compounds to pick species from
+    seed: int
+        Seed of the random generator
+
+    Returns
+    -------
+    reactions: List[str]
+        Reactions strings, as accepted by Reaction.parse()
+    """
+    return [
+        " = ".join(
+            " + ".join(f"{sto} {spe_id}" for spe_id, sto in side.items())
+            for side in (rxn["reactants"], rxn["products"])
+        )
+        for rxn in make_stoichio(n, nb_compounds, seed)
+    ]
+
+
+def make_reactions(n: int, nb_compounds: int, seed: int = 0) -> List[Reaction]:
+    """Builds n synthetic reactions
+
+    Parameters
+    ----------
+    n: int
+        Number of reactions
+    nb_compounds: int
+        Number of distinct compounds to pick species from
+    seed: int
+        Seed of the random generator
+
+    Returns
+    -------
+    reactions: List[Reaction]
+        Synthetic reactions
+    """
+    return [
+        Reaction(id=f"rxn_{i}", ec_numbers=["1.1.1.1"], **rxn)
+        for i, rxn in enumerate(make_stoichio(n, nb_compounds, seed))
+    ]
+
+
+def make_pathway(n: int, id: str = "pathway", offset: int = 0) -> Pathway:
+    """Builds a linear pathway of n reactions where the product of each
+    step is the substrate of the next one, with cofactors on both sides
+
+    Parameters
+    ----------
+    n: int
+        Number of reactions
+    id: str
+        ID of the pathway
+    offset: int
+        Index of the first compound of the chain
+
+    Returns
+    -------
+    pathway: Pathway
+        Synthetic pathway, which target is the last compound of the chain
+    """
+    pathway = Pathway(id=id)
+    for i in range(n):
+        cof = COFACTORS[i % len(COFACTORS)]
+        pathway.add_reaction(
+            Reaction(
+                id=f"rxn_{i}",
+                reactants={compound_id(offset + i): 1, cof: 1},
+                products={compound_id(offset + i + 1): 1, "MNXM1": 1},
+            )
+        )
+    pathway.set_target_id(compound_id(offset + n))
+    return pathway
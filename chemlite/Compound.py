@@ -26,10 +26,13 @@
 
 from typing import (
     Dict,
+    Tuple,
 )
 from logging import Logger, getLogger
 from brs_utils import Cache
 from chemlite.Object import Object
+from chemlite.CompoundIndex import CompoundIndex
+from chemlite.CompoundRegistry import CompoundRegistry
 
 
 class Compound(Object):
@@ -44,13 +47,22 @@ class Compound(Object):
         name: str = "",
         logger: Logger = getLogger(__name__),
     ):
+        self.__indexed = False
         super().__init__(id=id, logger=logger)
-        self.set_smiles(smiles)
-        self.set_inchi(inchi)
-        self.set_inchikey(inchikey)
-        self.set_formula(formula)
-        self.set_name(name)
+        # fields are set directly to index the compound once
+        self.__smiles = smiles
+        self.__inchi = inchi
+        self.__inchikey = inchikey
+        self.__formula = formula
+        self.__name = name
+        # the compound replaces the one with the same ID, if any
+        previous = Cache.get(self.get_id())
+        if previous is not None and previous is not self:
+            CompoundIndex.remove_compound(previous)
+        CompoundIndex.add_compound(self)
+        self.__indexed = True
         Cache.add(self, self.get_id())
+        CompoundRegistry.add(self)
 
     ## OUT METHODS
     # def __repr__(self):
@@ -97,6 +109,29 @@ class Compound(Object):
             "formula": self.get_formula(),
         }
 
+    def _content(self) -> Tuple:
+        """Return the attributes the equality of compounds relies on:
+            - id
+            - name
+            - smiles
+            - inchi
+            - inchikey
+            - formula
+
+        Returns
+        -------
+        content: Tuple
+            Attributes of the compound
+        """
+        return (
+            self.get_id(),
+            self.__name,
+            self.__smiles,
+            self.__inchi,
+            self.__inchikey,
+            self.__formula,
+        )
+
     ## READ METHODS
     def get_name(self) -> str:
         """Returns the name of the compound
@@ -149,6 +184,24 @@ class Compound(Object):
         return self.__formula
 
     ## WRITE METHODS
+    def set_id(self, id: str) -> None:
+        """Set the compound's id and update indexes
+
+        Parameters
+        ----------
+        id: str
+            String to set the compound's ID to
+        """
+        if not self.__indexed:
+            super().set_id(id)
+            return
+        CompoundIndex.remove_compound(self)
+        try:
+            super().set_id(id)
+        finally:
+            # indexed under the new ID, or the former one if rejected
+            CompoundIndex.add_compound(self)
+
     def set_name(self, name: str) -> None:
         """Set the name of the compound
 
@@ -157,7 +210,10 @@ class Compound(Object):
         name: str
             String to set the compound's name to
         """
+        CompoundIndex.remove(self, "name", self.__name)
         self.__name = name
+        CompoundIndex.add(self, "name", name)
+        self._invalidate_hash()
 
     def set_smiles(self, smiles: str) -> None:
         """Set the SMILES string of the compound
@@ -167,7 +223,10 @@ class Compound(Object):
         smiles: str
             String to set the compound's SMILES string to
         """
+        CompoundIndex.remove(self, "smiles", self.__smiles)
         self.__smiles = smiles
+        CompoundIndex.add(self, "smiles", smiles)
+        self._invalidate_hash()
 
     def set_inchi(self, inchi: str) -> None:
         """Set the InChI of the compound
@@ -178,6 +237,7 @@ class Compound(Object):
             String to set the compound's InChI to
         """
         self.__inchi = inchi
+        self._invalidate_hash()
 
     def set_inchikey(self, inchikey: str) -> None:
         """Set the InChIKey of the compound
@@ -187,7 +247,18 @@ class Compound(Object):
         inchikey: str
             String to set the compound's InChIKey to
         """
+        if self.__inchikey:
+            CompoundIndex.remove(self, "inchikey", self.__inchikey)
+            CompoundIndex.remove(
+                self, "inchikey_prefix", CompoundIndex.inchikey_prefix(self.__inchikey)
+            )
         self.__inchikey = inchikey
+        if inchikey:
+            CompoundIndex.add(self, "inchikey", inchikey)
+            CompoundIndex.add(
+                self, "inchikey_prefix", CompoundIndex.inchikey_prefix(inchikey)
+            )
+        self._invalidate_hash()
 
     def set_formula(self, formula: str) -> None:
         """Set the formula of the compound
@@ -197,4 +268,7 @@ class Compound(Object):
         formula: str
             String to set the compound's formula to
         """
+        CompoundIndex.remove(self, "formula", self.__formula)
         self.__formula = formula
+        CompoundIndex.add(self, "formula", formula)
+        self._invalidate_hash()
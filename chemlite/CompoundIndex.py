@@ -0,0 +1,203 @@
+"""Secondary indexes of compounds."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from chemlite.Compound import Compound
+
+
+class CompoundIndex:
+    """Indexes of compounds on their InChIKey (full key and first block, i.e.
+    connectivity), SMILES, formula and name. Compounds are indexed when
+    built and indexes are kept up to date by Compound setters.
+    Empty values are not indexed.
+    """
+
+    FIELDS = ["inchikey", "inchikey_prefix", "smiles", "formula", "name"]
+
+    # field -> value -> compound ID -> compound
+    __indexes: Dict[str, Dict[str, Dict[str, "Compound"]]] = {
+        field: {} for field in FIELDS
+    }
+
+    @staticmethod
+    def inchikey_prefix(inchikey: str) -> str:
+        """Returns the first block of an InChIKey (connectivity layer)
+
+        Parameters
+        ----------
+        inchikey: str
+            InChIKey (or its first block)
+
+        Returns
+        -------
+        prefix: str
+            First block of the InChIKey
+        """
+        return inchikey.split("-", 1)[0]
+
+    ## READ METHODS
+    @staticmethod
+    def find(field: str, value: str) -> List["Compound"]:
+        """Returns compounds whose 'field' is equal to 'value'
+
+        Parameters
+        ----------
+        field: str
+            One of CompoundIndex.FIELDS
+        value: str
+            Value to look for
+
+        Returns
+        -------
+        compounds: List[Compound]
+            Compounds found, empty list if none
+        """
+        return list(CompoundIndex.__indexes[field].get(value, {}).values())
+
+    @staticmethod
+    def find_by_inchikey(inchikey: str) -> List["Compound"]:
+        """Returns compounds with InChIKey 'inchikey'"""
+        return CompoundIndex.find("inchikey", inchikey)
+
+    @staticmethod
+    def find_by_inchikey_prefix(inchikey: str) -> List["Compound"]:
+        """Returns compounds whose InChIKey has the same first block
+        as 'inchikey' (full InChIKey or first block)"""
+        return CompoundIndex.find(
+            "inchikey_prefix", CompoundIndex.inchikey_prefix(inchikey)
+        )
+
+    @staticmethod
+    def find_by_smiles(smiles: str) -> List["Compound"]:
+        """Returns compounds with SMILES 'smiles' (compared as strings)"""
+        return CompoundIndex.find("smiles", smiles)
+
+    @staticmethod
+    def find_by_formula(formula: str) -> List["Compound"]:
+        """Returns compounds with formula 'formula'"""
+        return CompoundIndex.find("formula", formula)
+
+    @staticmethod
+    def find_by_name(name: str) -> List["Compound"]:
+        """Returns compounds named 'name'"""
+        return CompoundIndex.find("name", name)
+
+    @staticmethod
+    def get_groups(field: str) -> Dict[str, List["Compound"]]:
+        """Returns indexed compounds grouped by value of 'field'
+
+        Parameters
+        ----------
+        field: str
+            One of CompoundIndex.FIELDS
+
+        Returns
+        -------
+        groups: Dict[str, List[Compound]]
+            Compounds for each value of 'field'
+        """
+        return {
+            value: list(bucket.values())
+            for value, bucket in CompoundIndex.__indexes[field].items()
+        }
+
+    ## WRITE METHODS
+    @staticmethod
+    def add(compound: "Compound", field: str, value: str) -> None:
+        """Index 'compound' under 'value' of 'field', if 'value' is not empty
+
+        Parameters
+        ----------
+        compound: Compound
+            Compound to index
+        field: str
+            One of CompoundIndex.FIELDS
+        value: str
+            Value of the field
+        """
+        if value:
+            index = CompoundIndex.__indexes[field]
+            bucket = index.get(value)
+            if bucket is None:
+                index[value] = {compound.get_id(): compound}
+            else:
+                bucket[compound.get_id()] = compound
+
+    @staticmethod
+    def remove(compound: "Compound", field: str, value: str) -> None:
+        """Remove 'compound' from the index of 'field' under 'value'.
+        Another compound indexed under the same ID is left untouched.
+
+        Parameters
+        ----------
+        compound: Compound
+            Compound to remove
+        field: str
+            One of CompoundIndex.FIELDS
+        value: str
+            Value of the field
+        """
+        if value:
+            index = CompoundIndex.__indexes[field]
+            bucket = index.get(value)
+            if bucket is not None and bucket.get(compound.get_id()) is compound:
+                del bucket[compound.get_id()]
+                if not bucket:
+                    del index[value]
+
+    @staticmethod
+    def add_compound(compound: "Compound") -> None:
+        """Index all fields of 'compound'"""
+        cmpd_id = compound.get_id()
+        for field, value in CompoundIndex.__values(compound).items():
+            if value:
+                bucket = CompoundIndex.__indexes[field].setdefault(value, {})
+                bucket[cmpd_id] = compound
+
+    @staticmethod
+    def remove_compound(compound: "Compound") -> None:
+        """Remove 'compound' from all indexes"""
+        for field, value in CompoundIndex.__values(compound).items():
+            CompoundIndex.remove(compound, field, value)
+
+    @staticmethod
+    def clear() -> None:
+        """Empty all indexes"""
+        for index in CompoundIndex.__indexes.values():
+            index.clear()
+
+    @staticmethod
+    def __values(compound: "Compound") -> Dict[str, str]:
+        inchikey = compound.get_inchikey()
+        return {
+            "inchikey": inchikey,
+            "inchikey_prefix": inchikey and CompoundIndex.inchikey_prefix(inchikey),
+            "smiles": compound.get_smiles(),
+            "formula": compound.get_formula(),
+            "name": compound.get_name(),
+        }
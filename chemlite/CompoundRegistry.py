@@ -0,0 +1,266 @@
+"""Bounded registry of compounds."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterator, List, Optional, Set, TYPE_CHECKING
+from collections import OrderedDict
+from contextlib import contextmanager
+from gc import get_objects
+from weakref import ref
+
+from brs_utils import Cache
+from chemlite.CompoundIndex import CompoundIndex
+
+if TYPE_CHECKING:  # pragma: no cover
+    from chemlite.Compound import Compound
+    from chemlite.Pathway import Pathway
+    from chemlite.Reaction import Reaction
+
+
+class CompoundRegistry:
+    """Capacity limit of the compounds registered in the cache (including
+    placeholders added by reactions). Unbounded by default; once a capacity
+    is set, the least recently used compounds (built, or set in a reaction)
+    are removed from the cache and indexes when the registry is full.
+    Compounds of live reactions, and targets of live pathways, are never
+    evicted: reactions and pathways are tracked through weak references
+    and only scanned when compounds have to be evicted.
+
+    Compounds only referenced by user code may be evicted: they remain
+    usable, but Cache.get() does not return them any more.
+    """
+
+    # None if unbounded
+    __capacity: Optional[int] = None
+    # compound ID -> None, least recently used first
+    __lru: "OrderedDict[str, None]" = OrderedDict()
+    # size the registry has to exceed to evict compounds
+    __threshold: Optional[int] = None
+    # id() -> weak reference to live reactions and pathways, tracked by
+    # identity since their hash depends on their (mutable) content
+    __reactions: Dict[int, "ref[Reaction]"] = {}
+    __pathways: Dict[int, "ref[Pathway]"] = {}
+    # IDs of compounds added while eviction is suspended, None if it is not
+    # (see suspended())
+    __suspended: Optional[Set[str]] = None
+
+    ## READ METHODS
+    @staticmethod
+    def get_capacity() -> Optional[int]:
+        """Returns the maximum number of compounds, None if unbounded"""
+        return CompoundRegistry.__capacity
+
+    @staticmethod
+    def get_nb_compounds() -> int:
+        """Returns the number of compounds tracked by the registry,
+        0 if unbounded"""
+        return len(CompoundRegistry.__lru)
+
+    @staticmethod
+    def get_pinned_ids() -> set:
+        """Returns the IDs of compounds that cannot be evicted, i.e.
+        species of live reactions, targets of live pathways and compounds
+        added while eviction is suspended"""
+        pinned = set(CompoundRegistry.__suspended or ())
+        for rxn in list(CompoundRegistry.__reactions.values()):
+            rxn = rxn()
+            if rxn is not None:
+                pinned.update(rxn.get_species_set())
+        for pathway in list(CompoundRegistry.__pathways.values()):
+            pathway = pathway()
+            if pathway is not None:
+                pinned.add(pathway.get_target_id())
+        return pinned
+
+    ## WRITE METHODS
+    @staticmethod
+    def set_capacity(capacity: Optional[int]) -> None:
+        """Set the maximum number of compounds registered, None to make the
+        registry unbounded again. Compounds, reactions and pathways already
+        built are tracked from then on, and compounds are evicted if needed.
+
+        Parameters
+        ----------
+        capacity: Optional[int]
+            Maximum number of compounds, None if unbounded
+        """
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"Capacity must be >= 1, got {capacity}")
+        was_bounded = CompoundRegistry.__capacity is not None
+        CompoundRegistry.__capacity = capacity
+        CompoundRegistry.__threshold = capacity
+        if capacity is None:
+            CompoundRegistry.__lru.clear()
+            CompoundRegistry.__reactions.clear()
+            CompoundRegistry.__pathways.clear()
+            return
+        if not was_bounded:
+            CompoundRegistry.__track_existing()
+        CompoundRegistry.evict()
+
+    @staticmethod
+    def add(compound: "Compound") -> None:
+        """Register 'compound' as the most recently used one, and evict
+        compounds if the registry is full (never 'compound' itself)
+
+        Parameters
+        ----------
+        compound: Compound
+            Compound added to the cache
+        """
+        if CompoundRegistry.__capacity is None:
+            return
+        lru = CompoundRegistry.__lru
+        cmpd_id = compound.get_id()
+        lru[cmpd_id] = None
+        lru.move_to_end(cmpd_id)
+        if CompoundRegistry.__suspended is not None:
+            CompoundRegistry.__suspended.add(cmpd_id)
+        elif len(lru) > CompoundRegistry.__threshold:
+            CompoundRegistry.evict(keep=cmpd_id)
+
+    @staticmethod
+    def touch(cmpd_id: str) -> None:
+        """Mark the compound with ID 'cmpd_id' as the most recently used one
+
+        Parameters
+        ----------
+        cmpd_id: str
+            ID of the compound
+        """
+        if CompoundRegistry.__capacity is not None:
+            if cmpd_id in CompoundRegistry.__lru:
+                CompoundRegistry.__lru.move_to_end(cmpd_id)
+
+    @staticmethod
+    def track_reaction(rxn: "Reaction") -> None:
+        """Keep the species of 'rxn' from being evicted as long as it is alive
+
+        Parameters
+        ----------
+        rxn: Reaction
+            Reaction to track
+        """
+        if CompoundRegistry.__capacity is not None:
+            CompoundRegistry.__track(CompoundRegistry.__reactions, rxn)
+
+    @staticmethod
+    def track_pathway(pathway: "Pathway") -> None:
+        """Keep the target of 'pathway' from being evicted as long as it is
+        alive (its species are kept by its reactions)
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to track
+        """
+        if CompoundRegistry.__capacity is not None:
+            CompoundRegistry.__track(CompoundRegistry.__pathways, pathway)
+
+    @staticmethod
+    @contextmanager
+    def suspended() -> Iterator[None]:
+        """Context manager suspending eviction: compounds added within the
+        context are pinned until its exit, where the registry is brought
+        back below its capacity. Used to build compounds before the
+        reactions that pin them (e.g. in Pathway.from_dict()).
+
+        Example:
+            with CompoundRegistry.suspended():
+                compounds = [Compound.from_dict(cmpd) for cmpd in cmpds]
+                reactions = [Reaction.from_dict(rxn) for rxn in rxns]
+        """
+        if CompoundRegistry.__suspended is not None:
+            # nested, eviction is resumed by the outermost context
+            yield
+            return
+        CompoundRegistry.__suspended = set()
+        try:
+            yield
+        finally:
+            CompoundRegistry.__suspended = None
+            threshold = CompoundRegistry.__threshold
+            if threshold is not None and len(CompoundRegistry.__lru) > threshold:
+                CompoundRegistry.evict()
+
+    @staticmethod
+    def evict(keep: str = None) -> List[str]:
+        """Remove least recently used compounds from the cache and indexes
+        until the registry is below its capacity (by a quarter, so that
+        evictions are amortized), except pinned ones (see get_pinned_ids())
+
+        Parameters
+        ----------
+        keep: str
+            ID of a compound not to evict
+
+        Returns
+        -------
+        evicted: List[str]
+            IDs of evicted compounds
+        """
+        capacity = CompoundRegistry.__capacity
+        lru = CompoundRegistry.__lru
+        if capacity is None or len(lru) <= capacity:
+            return []
+        slack = max(1, capacity // 4)
+        pinned = CompoundRegistry.get_pinned_ids()
+        pinned.add(keep)
+        evicted = []
+        for cmpd_id in list(lru):
+            if len(lru) <= capacity - slack:
+                break
+            if cmpd_id in pinned:
+                continue
+            del lru[cmpd_id]
+            compound = Cache.get(cmpd_id)
+            if compound is not None:
+                CompoundIndex.remove_compound(compound)
+                Cache.remove_object_by_id(cmpd_id)
+            evicted.append(cmpd_id)
+        # pinned compounds are not scanned again before the registry grows
+        CompoundRegistry.__threshold = max(capacity, len(lru) + slack)
+        return evicted
+
+    @staticmethod
+    def __track_existing() -> None:
+        from chemlite.Compound import Compound
+        from chemlite.Pathway import Pathway
+        from chemlite.Reaction import Reaction
+
+        for cmpd_id in Cache.get_list_of_objects():
+            if isinstance(Cache.get(cmpd_id), Compound):
+                CompoundRegistry.__lru[cmpd_id] = None
+        for obj in get_objects():
+            if isinstance(obj, Reaction):
+                CompoundRegistry.__track(CompoundRegistry.__reactions, obj)
+            elif isinstance(obj, Pathway):
+                CompoundRegistry.__track(CompoundRegistry.__pathways, obj)
+
+    @staticmethod
+    def __track(refs: Dict[int, ref], obj) -> None:
+        key = id(obj)
+        # the entry is dropped as soon as the object dies
+        refs[key] = ref(obj, lambda _: refs.pop(key, None))
@@ -0,0 +1,244 @@
+"""An immutable, interned reaction."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, FrozenSet, List, Tuple, Union
+from logging import Logger, getLogger
+from weakref import WeakValueDictionary
+
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+
+class FrozenReaction(Reaction):
+    """Immutable reaction, with canonical stoichiometry, species
+    and hash computed once. Identical reactions (same ID, EC numbers
+    and stoichiometry) can be shared through an intern table
+    (see intern()) rather than copied in each pathway.
+    """
+
+    # (id, EC numbers, canonical key) -> frozen reaction, entries are
+    # dropped as soon as the reaction is not referenced anymore
+    __interned: "WeakValueDictionary[Tuple, FrozenReaction]" = WeakValueDictionary()
+
+    def __init__(
+        self,
+        id: str,
+        ec_numbers: Union[List[str], str] = [],
+        reactants: Dict[str, int] = {},
+        products: Dict[str, int] = {},
+        logger: Logger = getLogger(__name__),
+    ):
+        self.__frozen = False
+        super().__init__(
+            id=id,
+            ec_numbers=ec_numbers,
+            reactants=reactants,
+            products=products,
+            logger=logger,
+        )
+        self.__key = super().get_key()
+        self.__species = frozenset(spe_id for side in self.__key for spe_id, _ in side)
+        # hash computed once and for all
+        hash(self)
+        self.__frozen = True
+
+    def __eq__(self, other) -> bool:
+        # defined here to be called first when compared with a Reaction
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return super().__hash__()
+
+    @staticmethod
+    def intern(rxn: Reaction) -> "FrozenReaction":
+        """Returns the frozen reaction identical to 'rxn' (same ID,
+        EC numbers and stoichiometry) from the intern table, frozen
+        from 'rxn' and added to the table if not found
+
+        Parameters
+        ----------
+        rxn: Reaction
+            Reaction to intern
+
+        Returns
+        -------
+        reaction: FrozenReaction
+            The interned reaction
+        """
+        key = FrozenReaction.get_intern_key(rxn)
+        frozen = FrozenReaction.__interned.get(key)
+        if frozen is None:
+            if isinstance(rxn, FrozenReaction):
+                frozen = rxn
+            else:
+                frozen = FrozenReaction(
+                    id=rxn.get_id(),
+                    ec_numbers=rxn.get_ec_numbers(),
+                    reactants=dict(rxn.iter_reactants()),
+                    products=dict(rxn.iter_products()),
+                    logger=rxn.get_logger(),
+                )
+            FrozenReaction.__interned[key] = frozen
+        return frozen
+
+    @staticmethod
+    def intern_pathway(pathway: Pathway) -> int:
+        """Replace reactions of a pathway by their interned frozen reaction
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to intern reactions of
+
+        Returns
+        -------
+        nb: int
+            Number of reactions replaced in the pathway
+        """
+        nb = 0
+        for rxn_id, rxn in list(pathway.get_reactions().items()):
+            frozen = FrozenReaction.intern(rxn)
+            if frozen is not rxn:
+                pathway.replace_reaction(rxn_id, frozen)
+                nb += 1
+        return nb
+
+    @staticmethod
+    def get_intern_key(rxn: Reaction) -> Tuple:
+        """Returns the key of a reaction in the intern table
+
+        Parameters
+        ----------
+        rxn: Reaction
+            Reaction to return the key of
+
+        Returns
+        -------
+        key: Tuple
+            ID, EC numbers and canonical key of the reaction
+        """
+        return (rxn.get_id(), tuple(rxn.get_ec_numbers()), rxn.get_key())
+
+    @staticmethod
+    def get_nb_interned() -> int:
+        """Returns the number of reactions in the intern table"""
+        return len(FrozenReaction.__interned)
+
+    def copy(self) -> Reaction:
+        """Returns a mutable copy of the reaction
+
+        Returns
+        -------
+        reaction: Reaction
+            Mutable copy of the reaction
+        """
+        return Reaction(
+            id=self.get_id(),
+            ec_numbers=self.get_ec_numbers(),
+            reactants=self.get_reactants(),
+            products=self.get_products(),
+            logger=self.get_logger(),
+        )
+
+    def freeze(self) -> "FrozenReaction":
+        """Returns the reaction itself, already frozen"""
+        return self
+
+    ## READ METHODS
+    def is_frozen(self) -> bool:
+        """Returns True once the reaction is built"""
+        return self.__frozen
+
+    def get_key(self, directed: bool = True) -> Tuple:
+        """Returns the canonical key of the reaction (see Reaction.get_key()),
+        computed once"""
+        if not self.__frozen:
+            return super().get_key(directed)
+        left, right = self.__key
+        if not directed and right < left:
+            return (right, left)
+        return self.__key
+
+    def get_species_set(self) -> FrozenSet[str]:
+        """Returns the set of species IDs, computed once"""
+        if not self.__frozen:
+            return super().get_species_set()
+        return self.__species
+
+    def get_ec_numbers(self) -> List[str]:
+        return list(super().get_ec_numbers())
+
+    # stoichiometry is read from the canonical key once frozen
+    def get_reactants(self) -> Dict[str, int]:
+        if not self.__frozen:
+            return super().get_reactants()
+        return dict(self.__key[0])
+
+    def get_products(self) -> Dict[str, int]:
+        if not self.__frozen:
+            return super().get_products()
+        return dict(self.__key[1])
+
+    def get_species_ids(self) -> List[str]:
+        if not self.__frozen:
+            return super().get_species_ids()
+        return sorted(self.__species)
+
+    ## WRITE METHODS
+    def __check_mutable(self) -> None:
+        # setters are only allowed while the reaction is built
+        if self.__frozen:
+            raise TypeError(
+                f"Reaction {self.get_id()} is frozen, use copy() to modify it"
+            )
+
+    def set_id(self, id: str) -> None:
+        self.__check_mutable()
+        super().set_id(id)
+
+    def set_ec_numbers(self, numbers: List[str]) -> None:
+        self.__check_mutable()
+        super().set_ec_numbers(numbers)
+
+    def add_ec_number(self, number: str) -> None:
+        self.__check_mutable()
+        super().add_ec_number(number)
+
+    def set_reactants(self, compounds: Dict[str, int]) -> None:
+        self.__check_mutable()
+        super().set_reactants(compounds)
+
+    def set_reactant(self, cmpd_id: str, stoichio: int) -> None:
+        self.__check_mutable()
+        super().set_reactant(cmpd_id, stoichio)
+
+    def set_products(self, compounds: Dict[str, int]) -> None:
+        self.__check_mutable()
+        super().set_products(compounds)
+
+    def set_product(self, cmpd_id: str, stoichio: int) -> None:
+        self.__check_mutable()
+        super().set_product(cmpd_id, stoichio)
@@ -24,7 +24,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Dict, Union, TypeVar
+from typing import Dict, Tuple, Union, TypeVar
 from logging import Logger, getLogger
 
 
@@ -32,6 +32,7 @@ class Object:
 
     def __init__(self, id: str, logger: Logger = getLogger(__name__)):
         self.__logger = logger
+        self.__hash = None
         self.set_id(id)
 
     def to_string(self) -> str:
@@ -65,8 +66,50 @@ class Object:
         """
         return {"id": self.get_id()}
 
+    def _content(self) -> Tuple:
+        """Return the attributes the equality of objects relies on:
+            - id
+
+        Returns
+        -------
+        content: Tuple
+            Attributes of the object
+        """
+        return (self.get_id(),)
+
+    def _hash_content(self) -> int:
+        """Compute the hash of the object from its content
+
+        Returns
+        -------
+        hash: int
+            Hash of the object
+        """
+        return hash(self._content())
+
+    def _invalidate_hash(self) -> None:
+        """Drop the cached hash of the object, must be called
+        each time an attribute of its content is modified"""
+        self.__hash = None
+
+    def __hash__(self) -> int:
+        """Return the hash of the object, computed from its content
+        and cached until the content is modified through a setter.
+        As for any mutable object, an object must not be modified
+        while it is stored in a set or used as a dict key.
+
+        Returns
+        -------
+        hash: int
+            Hash of the object
+        """
+        if self.__hash is None:
+            self.__hash = self._hash_content()
+        return self.__hash
+
     def __eq__(self, other) -> bool:
-        """Return the equality status of two Object objects
+        """Return the equality status of two Object objects.
+        Hashes are compared first, then contents.
 
         Parameters
         ----------
@@ -78,10 +121,19 @@ class Object:
         equal: bool
             Return true if the two objects are equal, False otherwise
         """
+        if self is other:
+            return True
         if isinstance(self, other.__class__):
-            return self._to_dict() == other._to_dict()
+            return hash(self) == hash(other) and self._content() == other._content()
         return False
 
+    def __getstate__(self) -> Dict:
+        # hashes of strings differ from one process to another,
+        # the cached hash must not be pickled
+        state = self.__dict__.copy()
+        state["_Object__hash"] = None
+        return state
+
     ## READ METHODS
     def get_id(self) -> str:
         """Return the ID of the object
@@ -118,3 +170,4 @@ class Object:
             raise ValueError("id argument must not be empty for an Object")
         else:
             self.__id = id
+            self._invalidate_hash()
@@ -25,15 +25,21 @@
 # THE SOFTWARE.
 
 from typing import (
+    Callable,
     Dict,
+    Iterable,
     List,
+    Tuple,
 )
+from copy import copy
+from heapq import heapify, heappop, heappush
 from logging import (
     Logger,
     getLogger,
 )
 from brs_utils import Cache
 from chemlite.Compound import Compound
+from chemlite.CompoundRegistry import CompoundRegistry
 from chemlite.Reaction import Reaction
 from chemlite.Object import Object
 
@@ -45,12 +51,92 @@ class Pathway(Object):
     ):
         super().__init__(id=id, logger=logger)
         self.__reactions = {}
+        # True if the dict of reactions is shared with a copy of the pathway
+        self.__shared = False
+        # IDs of reactions copied by edit_reaction(), i.e. not shared with
+        # copies of the pathway or anything else
+        self.__owned = set()
+        # IDs of reactions shared with copies of the pathway (see copy())
+        self.__copied = set()
+        self.__hash_version = None
+        # cached topology (see get_topology()), and version of reactions
+        # when computed
+        self.__topology = None
+        self.__topology_version = None
         self.set_target_id(None)
+        # the target is pinned if the registry is bounded
+        CompoundRegistry.track_pathway(self)
 
     ## OUT METHODS
     # def __repr__(self):
     #     return dumps(self._to_dict(), indent=4)
 
+    @staticmethod
+    def from_dict(
+        pathway: Dict, id: str = None, logger: Logger = getLogger(__name__)
+    ) -> "Pathway":
+        """Build a pathway, its reactions and compounds from a dictionary
+        as returned by _to_dict()
+
+        Parameters
+        ----------
+        pathway: Dict
+            Dictionary of the pathway
+        id: str
+            ID of the pathway, if not in the dictionary
+        logger : Logger
+            The logger object.
+
+        Returns
+        -------
+        pathway: Pathway
+            The pathway
+        """
+        # compounds first, so that reactions do not create placeholders
+        # (species missing from the cache when serialized are null); they
+        # are not pinned by any reaction yet, so eviction is suspended
+        with CompoundRegistry.suspended():
+            for spe_id, compound in pathway.get("species", {}).items():
+                if compound is not None:
+                    Compound.from_dict({"id": spe_id, **compound})
+            pw = Pathway(id=pathway.get("id", id), logger=logger)
+            for rxn_id, rxn in pathway.get("reactions", {}).items():
+                pw.add_reaction(
+                    Reaction.from_dict(rxn, id=rxn_id, logger=logger), rxn_id
+                )
+            pw.set_target_id(pathway.get("target_id"))
+        return pw
+
+    def copy(self, id: str = None) -> "Pathway":
+        """Returns a copy-on-write clone of the pathway: the clone shares
+        reactions with the pathway until either of them modifies them
+        (see edit_reaction()), so that copying is O(1).
+
+        Parameters
+        ----------
+        id: str
+            ID of the clone, the one of the pathway if None
+
+        Returns
+        -------
+        pathway: Pathway
+            Clone of the pathway
+        """
+        pathway = copy(self)
+        for pw in (self, pathway):
+            pw.__shared = True
+            pw.__owned = set()
+            pw.__copied = set(self.__reactions)
+        if id is not None:
+            pathway.set_id(id)
+        return pathway
+
+    def __setstate__(self, state: Dict) -> None:
+        # pathways built by copy(), deepcopy() or unpickling pin their
+        # target as well
+        self.__dict__.update(state)
+        CompoundRegistry.track_pathway(self)
+
     def to_string(self):
         """Returns the string representation of the pathway
 
@@ -64,7 +150,13 @@ class Pathway(Object):
             + f"Pathway {self.get_id()}\n"
             + "----------------\n"
             + f"Target: {self.get_target_id()}\n"
-            + "\n".join([rxn.__str__() for rxn in self.get_reactions().values()])
+            + "\n".join(
+                [
+                    # reactions may be shared under another ID
+                    rxn.to_string(id=rxn_id)
+                    for rxn_id, rxn in self.get_reactions().items()
+                ]
+            )
         )
 
     def _to_dict(self, full=False) -> Dict:
@@ -93,9 +185,62 @@ class Pathway(Object):
             d.update(super()._to_dict())
         return d
 
+    def _content(self) -> Tuple:
+        """Return the attributes the equality of pathways relies on:
+            - target_id
+            - reactions (as a set, regardless of their IDs and order)
+
+        Returns
+        -------
+        content: Tuple
+            Target ID and set of reactions of the pathway
+        """
+        return (self.get_target_id(), frozenset(self.get_list_of_reactions()))
+
+    def _hash_content(self) -> int:
+        """Compute the hash of the pathway from its target
+        and the (cached) hashes of its reactions
+
+        Returns
+        -------
+        hash: int
+            Hash of the pathway
+        """
+        return hash(
+            (
+                self.get_target_id(),
+                frozenset(hash(rxn) for rxn in self.get_list_of_reactions()),
+            )
+        )
+
+    def _invalidate_hash(self) -> None:
+        """Drop the cached hash and topology of the pathway"""
+        super()._invalidate_hash()
+        self.__topology = None
+
+    def __hash__(self) -> int:
+        """Return the hash of the pathway. The cached hash is dropped when
+        the pathway is modified (reactions, target), or when any of its
+        reactions has been modified since it has been computed. Reactions
+        may be modified in place without the pathway knowing, so checking
+        the cached hash is still O(R) (sum of versions of the R reactions),
+        but without hashing reactions again.
+
+        Returns
+        -------
+        hash: int
+            Hash of the pathway
+        """
+        version = self.__get_version()
+        if self.__hash_version != version:
+            self._invalidate_hash()
+            self.__hash_version = version
+        return super().__hash__()
+
     def __eq__(self: "Pathway", other: "Pathway") -> bool:
         """Compare if all reactions of one pathway are
-        in the other and vice-versa.
+        in the other and vice-versa, and if targets are the same.
+        Hashes are compared first.
 
         Parameters
         ----------
@@ -106,19 +251,7 @@ class Pathway(Object):
         -------
         bool
         """
-        if isinstance(self, other.__class__):
-            return (
-                all(  # all reactions of self are in other
-                    rxn in self.get_list_of_reactions()
-                    for rxn in other.get_list_of_reactions()
-                )
-                and all(  # all reactions of other are in self
-                    rxn in other.get_list_of_reactions()
-                    for rxn in self.get_list_of_reactions()
-                )
-                and self.get_target_id() == other.get_target_id()
-            )
-        return False
+        return super().__eq__(other)
 
     ## READ METHODS
     def get_nb_reactions(self) -> int:
@@ -303,17 +436,87 @@ class Pathway(Object):
             ID of the target compound of the pathway
         """
         self.__target_id = target_id
+        self._invalidate_hash()
 
     def get_target_rxn_id(self) -> str:
         """Get the ID of the reaction that produces
         the target compound of the pathway."""
-        for rxn in self.get_list_of_reactions():
+        # ID within the pathway, shared reactions may have another one
+        for rxn_id, rxn in self.get_reactions().items():
             if self.get_target_id() in rxn.get_products_ids():
-                return rxn.get_id()
+                return rxn_id
+
+    def get_topology(self) -> Dict:
+        """Returns the topology of the pathway, from precursors to target.
+        Reactions are linked through species: a reaction precedes the ones
+        that consume its products. The topology is cached until the pathway
+        (reactions, target) or one of its reactions is modified, and must
+        not be modified.
+
+        Returns
+        -------
+        topology: Dict
+            - order: List[str], IDs of reactions sorted from precursors to
+              target (in order of addition when not constrained). Reactions
+              of a cycle are sorted together, by decreasing depth
+            - cycles: List[List[str]], IDs of reactions of each cycle,
+              cofactors recycled within the pathway make cycles as well
+            - branches: Dict[str, List[str]], species produced within the
+              pathway and consumed by several reactions -> IDs of consumers
+            - depths: Dict[str, int], ID of reactions leading to the target
+              -> number of steps to the target (1 for reactions producing it)
+            - unreachable: List[str], IDs of reactions not leading to the
+              target (empty if no target is set)
+        """
+        version = self.__get_version()
+        if self.__topology is None or self.__topology_version != version:
+            self.__topology = self.__compute_topology()
+            self.__topology_version = version
+        return self.__topology
+
+    def get_ordered_reactions_ids(self) -> List[str]:
+        """Returns IDs of reactions sorted from precursors to target
+        (see get_topology())
+
+        Returns
+        -------
+        rxn_ids: List[str]
+            Sorted IDs of reactions
+        """
+        return list(self.get_topology()["order"])
+
+    def edit_reaction(self, rxn_id: str) -> Reaction:
+        """Returns the reaction with ID 'rxn_id' to modify it in place.
+        The first time, the reaction is replaced by a private copy, since it
+        may be shared (with copies of the pathway, other pathways or a
+        ReactionStore) or frozen.
+
+        Parameters
+        ----------
+        rxn_id: str
+            ID of the reaction
+
+        Returns
+        -------
+        reaction: Reaction
+            Reaction that can be modified, None if not found
+        """
+        rxn = self.get_reaction(rxn_id)
+        if rxn is None:
+            return None
+        if rxn_id in self.__owned:
+            return rxn
+        rxn = rxn.copy()
+        self.add_reaction(rxn, rxn_id)
+        self.__owned.add(rxn_id)
+        return rxn
 
     def rename_compound(self, id: str, new_id: str) -> None:
         """Rename a compound within the pathway. Actually, the
-        compound is renamed over all reactions
+        compound is renamed over all reactions: in place, so that other
+        holders of the reactions see the new ID, except for reactions
+        shared with copies of the pathway or frozen, which are replaced
+        by a private copy (see edit_reaction())
 
         Parameters
         ----------
@@ -322,8 +525,10 @@ class Pathway(Object):
         new_id: str
             ID that the compound has to be renamed to
         """
-        for rxn in self.get_reactions().values():
+        for rxn_id, rxn in list(self.get_reactions().items()):
             if id in rxn.get_species_ids():
+                if rxn.is_frozen() or rxn_id in self.__copied:
+                    rxn = self.edit_reaction(rxn_id)
                 # rename compound in cache
                 compound = Cache.get(id)
                 # Check if id is in the cache (not already renamed)
@@ -350,7 +555,7 @@ class Pathway(Object):
         b: bool
             True if replacement has been done, False otherwise
         """
-        self.get_logger().debug(rxn_id + " " + rxn.to_string())
+        self.get_logger().debug("%s %s", rxn_id, rxn)
         if rxn_id in self.get_reactions_ids():
             self.add_reaction(rxn, rxn_id)
             return True
@@ -374,12 +579,17 @@ class Pathway(Object):
         new_id: str
             ID that the compound has to be renamed to
         """
-        self.get_logger().debug(rxn)
+        self.get_logger().debug("%s", rxn)
 
         # RXN ID
         if rxn_id is None:
             rxn_id = rxn.get_id()
+        self.__own_reactions()
         self.__reactions[rxn_id] = rxn
+        # the reaction may be shared, but not with copies of the pathway
+        self.__owned.discard(rxn_id)
+        self.__copied.discard(rxn_id)
+        self._invalidate_hash()
 
     def del_reaction(self, rxn_id: str) -> bool:
         """Remove a reaction from the pathway. Returns True if the
@@ -395,8 +605,13 @@ class Pathway(Object):
         b: bool
             True if deletion has been done, False otherwise
         """
+        if rxn_id in self.__reactions:
+            self.__own_reactions()
         try:
             del self.__reactions[rxn_id]
+            self.__owned.discard(rxn_id)
+            self.__copied.discard(rxn_id)
+            self._invalidate_hash()
             return True
         except KeyError:
             self.get_logger().error(
@@ -404,6 +619,168 @@ class Pathway(Object):
             )
             return False
 
+    def __compute_topology(self) -> Dict:
+        rxn_ids = self.get_reactions_ids()
+        nb_rxns = len(rxn_ids)
+        # graph of reactions (0..nb_rxns-1) and species (nb_rxns..):
+        # reaction -> its products, species -> reactions consuming it
+        graph: List[List[int]] = [[] for _ in range(nb_rxns)]
+        nodes: Dict[str, int] = {}
+        reactants: List[List[int]] = []
+        producers: Dict[int, List[int]] = {}
+        for i, rxn in enumerate(self.get_list_of_reactions()):
+            reactants.append([])
+            for spe_id, _ in rxn.iter_reactants():
+                node = Pathway.__get_node(nodes, graph, spe_id)
+                graph[node].append(i)
+                reactants[i].append(node)
+            for spe_id, _ in rxn.iter_products():
+                node = Pathway.__get_node(nodes, graph, spe_id)
+                graph[i].append(node)
+                producers.setdefault(node, []).append(i)
+
+        # depth of reactions, by breadth-first search backwards from the target
+        depths: Dict[int, int] = {}
+        target = nodes.get(self.get_target_id())
+        if target is not None:
+            depth = 1
+            layer = producers.get(target, [])
+            visited = {target}
+            while layer:
+                next_layer = []
+                for i in layer:
+                    if i not in depths:
+                        depths[i] = depth
+                        for node in reactants[i]:
+                            if node not in visited:
+                                visited.add(node)
+                                next_layer += producers.get(node, [])
+                layer = next_layer
+                depth += 1
+
+        order, cycles = Pathway.__sort_graph(
+            graph, nb_rxns, key=lambda i: (-depths.get(i, 0), i)
+        )
+
+        return {
+            "order": [rxn_ids[i] for i in order],
+            "cycles": [[rxn_ids[i] for i in cycle] for cycle in cycles],
+            "branches": {
+                spe_id: [rxn_ids[i] for i in graph[node]]
+                for spe_id, node in nodes.items()
+                if len(graph[node]) > 1 and node in producers
+            },
+            "depths": {rxn_ids[i]: depth for i, depth in depths.items()},
+            "unreachable": (
+                []
+                if target is None
+                else [rxn_ids[i] for i in range(nb_rxns) if i not in depths]
+            ),
+        }
+
+    @staticmethod
+    def __get_node(nodes: Dict[str, int], graph: List[List[int]], spe_id: str) -> int:
+        node = nodes.get(spe_id)
+        if node is None:
+            node = nodes[spe_id] = len(graph)
+            graph.append([])
+        return node
+
+    @staticmethod
+    def __sort_graph(
+        graph: List[List[int]], nb_rxns: int, key: Callable
+    ) -> Tuple[List, List]:
+        """Returns reactions (nodes < nb_rxns) sorted topologically and cycles
+        of reactions, from strongly connected components (Tarjan).
+        Reactions of a component are sorted by 'key'."""
+        index: List[int] = [-1] * len(graph)
+        low: List[int] = [0] * len(graph)
+        stack: List[int] = []
+        on_stack = [False] * len(graph)
+        components: List[List[int]] = []
+        counter = 0
+        for root in range(len(graph)):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(graph[root]))]
+            while work:
+                node, successors = work[-1]
+                for succ in successors:
+                    if index[succ] == -1:
+                        index[succ] = low[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack[succ] = True
+                        work.append((succ, iter(graph[succ])))
+                        break
+                    if on_stack[succ]:
+                        low[node] = min(low[node], index[succ])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack[member] = False
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        # components sorted topologically (Kahn), the one with the lowest
+        # node first when several are ready
+        comp_of = [0] * len(graph)
+        for comp, component in enumerate(components):
+            for node in component:
+                comp_of[node] = comp
+        indegree = [0] * len(components)
+        for node, successors in enumerate(graph):
+            for succ in successors:
+                if comp_of[succ] != comp_of[node]:
+                    indegree[comp_of[succ]] += 1
+        ready = [
+            (min(component), comp)
+            for comp, component in enumerate(components)
+            if not indegree[comp]
+        ]
+        heapify(ready)
+        order = []
+        cycles = []
+        while ready:
+            _, comp = heappop(ready)
+            rxns = sorted(
+                (node for node in components[comp] if node < nb_rxns), key=key
+            )
+            order += rxns
+            if len(components[comp]) > 1:
+                cycles.append(rxns)
+            for node in components[comp]:
+                for succ in graph[node]:
+                    succ_comp = comp_of[succ]
+                    if succ_comp != comp:
+                        indegree[succ_comp] -= 1
+                        if not indegree[succ_comp]:
+                            heappush(ready, (min(components[succ_comp]), succ_comp))
+        return order, cycles
+
+    def __get_version(self) -> int:
+        # increases each time a reaction of the pathway is modified in place,
+        # changes of the set of reactions invalidate caches directly
+        return sum(rxn._version for rxn in self.__reactions.values())
+
+    def __own_reactions(self) -> None:
+        # copy the dict of reactions if shared with a copy
+        if self.__shared:
+            self.__reactions = dict(self.__reactions)
+            self.__shared = False
+
     ## MISC
     def net_reaction(self) -> Dict[str, float]:
         """Returns the net reaction (or pseudo-reaction) of the pathway,
@@ -412,6 +789,118 @@ class Pathway(Object):
         """
         return Reaction.sum_stoichio(self.get_reactions().values())
 
+    def diff(self, other: "Pathway") -> Dict:
+        """Returns the differences between the pathway and 'other', in linear
+        time. Reactions are matched by content (hash, then equality) first,
+        so that a reaction under another ID is reported as renamed.
+        Remaining reactions with the same ID in both pathways are changed,
+        the others are removed (from the pathway) or added (in 'other').
+
+        Parameters
+        ----------
+        other: Pathway
+            Pathway to compare with
+
+        Returns
+        -------
+        diff: Dict
+            - added: List[str], IDs of reactions only in 'other'
+            - removed: List[str], IDs of reactions only in the pathway
+            - changed: List[str], IDs of reactions with different contents
+            - renamed: Dict[str, str], ID in the pathway -> ID in 'other'
+            - target_id: Tuple[str, str], both targets if different, else None
+            - net_reaction: Dict[str, float], net reaction of 'other'
+              minus the one of the pathway
+        """
+        # reaction -> IDs in the pathway with this content
+        unmatched: Dict[Reaction, List[str]] = {}
+        for rxn_id, rxn in self.get_reactions().items():
+            unmatched.setdefault(rxn, []).append(rxn_id)
+        removed = dict.fromkeys(self.get_reactions_ids())
+        added = {}
+        renamed = {}
+        for rxn_id, rxn in other.get_reactions().items():
+            ids = unmatched.get(rxn)
+            if not ids:
+                added[rxn_id] = rxn
+                continue
+            # same ID preferred, first one otherwise
+            self_id = rxn_id if rxn_id in ids else ids[0]
+            ids.remove(self_id)
+            del removed[self_id]
+            if self_id != rxn_id:
+                renamed[self_id] = rxn_id
+        changed = [rxn_id for rxn_id in added if rxn_id in removed]
+        for rxn_id in changed:
+            # not a removal then an addition
+            del removed[rxn_id]
+            del added[rxn_id]
+
+        # only unmatched reactions make the net reactions differ
+        net = Reaction.sum_stoichio(
+            [other.get_reaction(rxn_id) for rxn_id in changed] + list(added.values())
+        )
+        for spe_id, spe_sto in Reaction.sum_stoichio(
+            [self.get_reaction(rxn_id) for rxn_id in changed + list(removed)]
+        ).items():
+            net[spe_id] = net.get(spe_id, 0) - spe_sto
+
+        target_id = (self.get_target_id(), other.get_target_id())
+        return {
+            "added": list(added),
+            "removed": list(removed),
+            "changed": changed,
+            "renamed": renamed,
+            "target_id": target_id if target_id[0] != target_id[1] else None,
+            "net_reaction": {
+                spe_id: spe_sto for spe_id, spe_sto in net.items() if spe_sto != 0
+            },
+        }
+
+    @staticmethod
+    def net_reactions(
+        pathways: Iterable["Pathway"], species: Iterable[str] = None
+    ) -> List[Dict[str, float]]:
+        """Returns net reactions of many pathways at once (see net_reaction()).
+        Reactions shared by pathways (equal content) form a pool where the
+        list of signed coefficients of each one is computed once, then
+        coefficients are accumulated in a dict per pathway.
+
+        Parameters
+        ----------
+        pathways: Iterable[Pathway]
+            Pathways to compute net reactions of
+        species: Iterable[str]
+            IDs of species to restrict net reactions to (e.g. cofactors),
+            all species if None
+
+        Returns
+        -------
+        net_reactions: List[Dict[str, float]]
+            Net reaction of each pathway, in order of 'pathways'
+        """
+        kept = None if species is None else set(species)
+        # reaction (by content) -> sparse stoichiometry
+        pool: Dict[Reaction, List[Tuple[str, float]]] = {}
+        net_reactions = []
+        for pathway in pathways:
+            net: Dict[str, float] = {}
+            for rxn in pathway.get_list_of_reactions():
+                stoichio = pool.get(rxn)
+                if stoichio is None:
+                    stoichio = [
+                        (spe_id, -spe_sto) for spe_id, spe_sto in rxn.iter_reactants()
+                    ] + list(rxn.iter_products())
+                    if kept is not None:
+                        stoichio = [item for item in stoichio if item[0] in kept]
+                    pool[rxn] = stoichio
+                for spe_id, spe_sto in stoichio:
+                    net[spe_id] = net.get(spe_id, 0) + spe_sto
+            net_reactions.append(
+                {spe_id: spe_sto for spe_id, spe_sto in net.items() if spe_sto != 0}
+            )
+        return net_reactions
+
     def pseudo_reaction(self) -> Reaction:
         """Same as net_reaction()"""
         return self.net_reaction()
@@ -0,0 +1,244 @@
+"""An inverted index of pathways on their reactions and compounds."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from logging import Logger, getLogger
+
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+
+class PathwayIndex:
+    """Inverted index of pathways: each reaction (by canonical key, see
+    Reaction.get_key()) and each compound is mapped to the numbers of
+    the pathways it belongs to. Queries intersect or unite bitsets
+    (Python integers, bit i set for pathway number i) built from these
+    posting lists on first use.
+    """
+
+    def __init__(self, directed: bool = True, logger: Logger = getLogger(__name__)):
+        """
+        Parameters
+        ----------
+        directed: bool
+            If False, a reaction and its reverse (A = B and B = A)
+            are considered as the same reaction
+        logger: Logger
+            The logger object
+        """
+        self.__logger = logger
+        self.__directed = directed
+        # pathway number -> pathway
+        self.__pathways: List[Pathway] = []
+        # reaction key or compound ID -> numbers of pathways, in increasing order
+        self.__reactions: Dict[Tuple, List[int]] = {}
+        self.__compounds: Dict[str, List[int]] = {}
+        # bitsets built from posting lists, dropped when they are extended
+        self.__bitsets: Dict[Tuple[bool, Union[Tuple, str]], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.__pathways)
+
+    def __iter__(self) -> Iterator[Pathway]:
+        return iter(self.__pathways)
+
+    ## READ METHODS
+    def is_directed(self) -> bool:
+        """Returns True if the direction of reactions is taken into account"""
+        return self.__directed
+
+    def get_key(self, rxn: Union[Reaction, Tuple]) -> Tuple:
+        """Returns the canonical key of a reaction in the index
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+
+        Returns
+        -------
+        key: Tuple
+            Canonical key of the reaction
+        """
+        if isinstance(rxn, tuple):
+            left, right = rxn
+            if not self.__directed and right < left:
+                return (right, left)
+            return rxn
+        return rxn.get_key(directed=self.__directed)
+
+    def get_pathway(self, number: int) -> Pathway:
+        """Returns the pathway with number 'number'
+
+        Parameters
+        ----------
+        number: int
+            Number of the pathway, i.e. its rank of addition
+
+        Returns
+        -------
+        pathway: Pathway
+            The pathway
+        """
+        return self.__pathways[number]
+
+    def find_all(
+        self,
+        reactions: Iterable[Union[Reaction, Tuple]] = (),
+        compounds: Iterable[str] = (),
+    ) -> List[Pathway]:
+        """Returns pathways that contain all 'reactions' and 'compounds'
+
+        Parameters
+        ----------
+        reactions: Iterable[Union[Reaction, Tuple]]
+            Reactions, or their canonical keys
+        compounds: Iterable[str]
+            IDs of compounds
+
+        Returns
+        -------
+        pathways: List[Pathway]
+            Pathways found, in order of addition
+        """
+        bits = -1
+        for bitset in self.__get_bitsets(reactions, compounds):
+            bits &= bitset
+            if not bits:
+                break
+        if bits == -1:
+            # no criterion
+            return []
+        return self.__get_pathways(bits)
+
+    def find_any(
+        self,
+        reactions: Iterable[Union[Reaction, Tuple]] = (),
+        compounds: Iterable[str] = (),
+    ) -> List[Pathway]:
+        """Returns pathways that contain at least one of 'reactions'
+        or 'compounds'
+
+        Parameters
+        ----------
+        reactions: Iterable[Union[Reaction, Tuple]]
+            Reactions, or their canonical keys
+        compounds: Iterable[str]
+            IDs of compounds
+
+        Returns
+        -------
+        pathways: List[Pathway]
+            Pathways found, in order of addition
+        """
+        bits = 0
+        for bitset in self.__get_bitsets(reactions, compounds):
+            bits |= bitset
+        return self.__get_pathways(bits)
+
+    ## WRITE METHODS
+    def add(self, pathway: Pathway) -> int:
+        """Add a pathway to the index
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to index
+
+        Returns
+        -------
+        number: int
+            Number of the pathway in the index
+        """
+        number = len(self.__pathways)
+        self.__pathways.append(pathway)
+        species = set()
+        for key in {self.get_key(rxn) for rxn in pathway.get_list_of_reactions()}:
+            self.__post(True, key, number)
+            for side in key:
+                species.update(spe_id for spe_id, _ in side)
+        for spe_id in species:
+            self.__post(False, spe_id, number)
+        return number
+
+    def add_pathways(self, pathways: Iterable[Pathway]) -> int:
+        """Add pathways to the index
+
+        Parameters
+        ----------
+        pathways: Iterable[Pathway]
+            Pathways to index
+
+        Returns
+        -------
+        nb: int
+            Number of pathways added
+        """
+        nb = 0
+        for pathway in pathways:
+            self.add(pathway)
+            nb += 1
+        self.__logger.debug("%s pathway(s) indexed", nb)
+        return nb
+
+    def __post(self, is_rxn: bool, key: Union[Tuple, str], number: int) -> None:
+        postings = self.__reactions if is_rxn else self.__compounds
+        postings.setdefault(key, []).append(number)
+        self.__bitsets.pop((is_rxn, key), None)
+
+    def __get_bitsets(
+        self,
+        reactions: Iterable[Union[Reaction, Tuple]],
+        compounds: Iterable[str],
+    ) -> Iterator[int]:
+        for rxn in reactions:
+            yield self.__get_bitset(True, self.get_key(rxn))
+        for cmpd_id in compounds:
+            yield self.__get_bitset(False, cmpd_id)
+
+    def __get_bitset(self, is_rxn: bool, key: Union[Tuple, str]) -> int:
+        bitset = self.__bitsets.get((is_rxn, key))
+        if bitset is None:
+            numbers = (self.__reactions if is_rxn else self.__compounds).get(key)
+            if not numbers:
+                return 0
+            # set bits in a byte array rather than shifting a growing integer
+            array = bytearray(numbers[-1] // 8 + 1)
+            for number in numbers:
+                array[number >> 3] |= 1 << (number & 7)
+            bitset = int.from_bytes(array, "little")
+            self.__bitsets[(is_rxn, key)] = bitset
+        return bitset
+
+    def __get_pathways(self, bits: int) -> List[Pathway]:
+        # positions of set bits, least significant first
+        digits = bin(bits)[:1:-1]
+        pathways = []
+        number = digits.find("1")
+        while number != -1:
+            pathways.append(self.__pathways[number])
+            number = digits.find("1", number + 1)
+        return pathways
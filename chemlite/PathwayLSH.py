@@ -0,0 +1,273 @@
+"""Similarity search over pathways with MinHash and LSH."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+from hashlib import blake2b
+from logging import Logger, getLogger
+from random import Random
+
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+# Mersenne prime, modulus of the hash functions
+_PRIME = (1 << 61) - 1
+
+
+class PathwayLSH:
+    """Approximate similarity search over pathways. Each pathway is
+    described by the set of its reactions (canonical keys, see
+    Reaction.get_key()) and species, summarised by a MinHash signature
+    from which the Jaccard similarity of two sets is estimated.
+    Signatures are split into bands, pathways sharing a band are
+    candidates for similarity (LSH), so that queries do not compare
+    all pathways.
+
+    The probability for two pathways with Jaccard similarity s to be
+    candidates is 1 - (1 - s^r)^b with b bands of r rows.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 32,
+        seed: int = 1,
+        directed: bool = True,
+        logger: Logger = getLogger(__name__),
+    ):
+        """
+        Parameters
+        ----------
+        num_perm: int
+            Number of hash functions, i.e. length of signatures
+        bands: int
+            Number of bands signatures are split into, must divide 'num_perm'
+        seed: int
+            Seed of hash functions, signatures are comparable only
+            if computed with the same seed (and number of functions)
+        directed: bool
+            If False, a reaction and its reverse (A = B and B = A)
+            are considered as the same reaction
+        logger: Logger
+            The logger object
+        """
+        if num_perm % bands:
+            raise ValueError(
+                f"Number of bands ({bands}) must divide num_perm ({num_perm})"
+            )
+        self.__logger = logger
+        self.__directed = directed
+        self.__bands = bands
+        self.__rows = num_perm // bands
+        rand = Random(seed)
+        # (a, b) of hash functions x -> (a * x + b) mod _PRIME
+        self.__perms = [
+            (rand.randrange(1, _PRIME), rand.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self.__pathways: List[Pathway] = []
+        self.__signatures: List[Tuple[int, ...]] = []
+        # one dict per band: band of signature -> numbers of pathways
+        self.__buckets: List[Dict[Tuple[int, ...], List[int]]] = [
+            {} for _ in range(bands)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.__pathways)
+
+    def __iter__(self) -> Iterator[Pathway]:
+        return iter(self.__pathways)
+
+    ## READ METHODS
+    def get_shingles(self, pathway: Pathway) -> Set[str]:
+        """Returns the set of features pathways are compared on:
+        canonical keys of reactions (see Reaction.key_to_string()) and
+        IDs of species
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to describe
+
+        Returns
+        -------
+        shingles: Set[str]
+            Features of the pathway
+        """
+        shingles = set()
+        for rxn in pathway.get_list_of_reactions():
+            key = rxn.get_key(directed=self.__directed)
+            # 1 and 1.0 coefficients give the same feature
+            shingles.add(f"R{Reaction.key_to_string(key)}")
+            for side in key:
+                shingles.update(f"S{spe_id}" for spe_id, _ in side)
+        return shingles
+
+    def get_signature(self, pathway: Pathway) -> Tuple[int, ...]:
+        """Returns the MinHash signature of a pathway. Signatures are
+        stable from one process to another (features are hashed with
+        BLAKE2b rather than hash())
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to compute the signature of
+
+        Returns
+        -------
+        signature: Tuple[int, ...]
+            MinHash signature of the pathway
+        """
+        values = [
+            int.from_bytes(blake2b(shingle.encode(), digest_size=8).digest(), "little")
+            for shingle in self.get_shingles(pathway)
+        ]
+        if not values:
+            return tuple([_PRIME] * len(self.__perms))
+        return tuple(min((a * x + b) % _PRIME for x in values) for a, b in self.__perms)
+
+    @staticmethod
+    def jaccard(signature: Tuple[int, ...], other: Tuple[int, ...]) -> float:
+        """Returns the Jaccard similarity estimated from two signatures
+
+        Parameters
+        ----------
+        signature: Tuple[int, ...]
+            MinHash signature
+        other: Tuple[int, ...]
+            MinHash signature to compare with
+
+        Returns
+        -------
+        similarity: float
+            Estimated Jaccard similarity, between 0 and 1
+        """
+        return sum(x == y for x, y in zip(signature, other)) / len(signature)
+
+    def query(self, pathway: Pathway, k: int = 10) -> List[Tuple[Pathway, float]]:
+        """Returns the (at most) 'k' indexed pathways most similar to
+        'pathway', among the ones sharing at least one band with it
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to look for similar pathways of
+        k: int
+            Maximum number of pathways to return
+
+        Returns
+        -------
+        pathways: List[Tuple[Pathway, float]]
+            Pathways and their estimated Jaccard similarity,
+            most similar first ('pathway' itself excluded)
+        """
+        signature = self.get_signature(pathway)
+        candidates = set()
+        for buckets, band in zip(self.__buckets, self.__get_bands(signature)):
+            candidates.update(buckets.get(band, ()))
+        scored = [
+            (self.jaccard(signature, self.__signatures[number]), number)
+            for number in candidates
+            if self.__pathways[number] is not pathway
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(self.__pathways[number], score) for score, number in scored[:k]]
+
+    def get_near_duplicates(
+        self, threshold: float = 0.8
+    ) -> List[Tuple[Pathway, Pathway, float]]:
+        """Returns pairs of indexed pathways whose estimated Jaccard
+        similarity is at least 'threshold', among pairs sharing a band
+
+        Parameters
+        ----------
+        threshold: float
+            Minimum estimated Jaccard similarity
+
+        Returns
+        -------
+        pairs: List[Tuple[Pathway, Pathway, float]]
+            Pathways (in order of addition) and their similarity,
+            sorted by order of addition
+        """
+        pairs = set()
+        for buckets in self.__buckets:
+            for numbers in buckets.values():
+                for i, first in enumerate(numbers):
+                    for second in numbers[i + 1 :]:
+                        pairs.add((first, second))
+        near = []
+        for first, second in sorted(pairs):
+            score = self.jaccard(self.__signatures[first], self.__signatures[second])
+            if score >= threshold:
+                near.append((self.__pathways[first], self.__pathways[second], score))
+        return near
+
+    ## WRITE METHODS
+    def add(self, pathway: Pathway) -> int:
+        """Add a pathway to the index
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to index
+
+        Returns
+        -------
+        number: int
+            Number of the pathway in the index
+        """
+        number = len(self.__pathways)
+        signature = self.get_signature(pathway)
+        self.__pathways.append(pathway)
+        self.__signatures.append(signature)
+        for buckets, band in zip(self.__buckets, self.__get_bands(signature)):
+            buckets.setdefault(band, []).append(number)
+        return number
+
+    def add_pathways(self, pathways: Iterable[Pathway]) -> int:
+        """Add pathways to the index
+
+        Parameters
+        ----------
+        pathways: Iterable[Pathway]
+            Pathways to index
+
+        Returns
+        -------
+        nb: int
+            Number of pathways added
+        """
+        nb = 0
+        for pathway in pathways:
+            self.add(pathway)
+            nb += 1
+        self.__logger.debug("%s pathway(s) indexed", nb)
+        return nb
+
+    def __get_bands(self, signature: Tuple[int, ...]) -> Iterator[Tuple[int, ...]]:
+        rows = self.__rows
+        for start in range(0, len(signature), rows):
+            yield signature[start : start + rows]
@@ -24,18 +24,26 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Dict, List, Union
-from logging import Logger, getLogger
+from typing import Dict, FrozenSet, Iterator, List, Set, Tuple, Union
+from contextlib import contextmanager
+from logging import DEBUG, Logger, getLogger
 from json import dumps as json_dumps
-from copy import deepcopy
+from copy import copy, deepcopy
+from math import isfinite
 
 from brs_utils import Cache
 from chemlite.Compound import Compound
+from chemlite.CompoundRegistry import CompoundRegistry
 from chemlite.Object import Object
+from chemlite.settings import is_performance_mode
 
 
 class Reaction(Object):
 
+    # IDs of species whose placeholder compound is yet to be built,
+    # None if placeholders are built straight away (see deferred_registration())
+    __pending: Set[str] = None
+
     def get_SIDES() -> List:
         return ["left", "right"]
 
@@ -47,7 +55,14 @@ class Reaction(Object):
         products: Dict[str, int] = {},
         logger: Logger = getLogger(__name__),
     ):
+        # number of modifications of the reaction, used to check if hashes
+        # computed from it (e.g. Pathway's one) are up to date
+        self._version = 0
         super().__init__(id=id, logger=logger)
+        self.__reactants = {}
+        self.__products = {}
+        # species are pinned if the registry is bounded
+        CompoundRegistry.track_reaction(self)
         if isinstance(ec_numbers, list):
             self.set_ec_numbers(ec_numbers)
         else:
@@ -82,7 +97,7 @@ class Reaction(Object):
         transfo: Dict
             Dictionary of the transformation.
         """
-        logger.debug(f"transfo: {rxn}")
+        logger.debug("transfo: %s", rxn)
 
         transfo = Reaction.parse(rxn, logger)
 
@@ -90,6 +105,68 @@ class Reaction(Object):
             id=id, reactants=transfo["left"], products=transfo["right"], logger=logger
         )
 
+    @staticmethod
+    def from_dict(
+        reaction: Dict, id: str = None, logger: Logger = getLogger(__name__)
+    ) -> "Reaction":
+        """Build a reaction from a dictionary as returned by _to_dict()
+
+        Parameters
+        ----------
+        reaction: Dict
+            Dictionary of the reaction
+        id: str
+            ID of the reaction, if not in the dictionary
+        logger : Logger
+            The logger object.
+
+        Returns
+        -------
+        reaction: Reaction
+            The reaction
+        """
+        return Reaction(
+            id=reaction.get("id", id),
+            ec_numbers=reaction.get("ec_numbers", []),
+            reactants=reaction.get("reactants", {}),
+            products=reaction.get("products", {}),
+            logger=logger,
+        )
+
+    def copy(self) -> "Reaction":
+        """Returns a copy of the reaction. Unlike deepcopy(), the logger
+        is shared and species are not registered again.
+
+        Returns
+        -------
+        reaction: Reaction
+            Copy of the reaction
+        """
+        rxn = copy(self)
+        rxn.__ec_numbers = list(self.__ec_numbers)
+        rxn.__reactants = dict(self.__reactants)
+        rxn.__products = dict(self.__products)
+        return rxn
+
+    def __setstate__(self, state: Dict) -> None:
+        # reactions built by copy(), deepcopy() or unpickling pin their
+        # species as well
+        self.__dict__.update(state)
+        CompoundRegistry.track_reaction(self)
+
+    def freeze(self) -> "Reaction":
+        """Returns an immutable copy of the reaction, shared with identical
+        reactions through the intern table of FrozenReaction
+
+        Returns
+        -------
+        reaction: FrozenReaction
+            Frozen copy of the reaction
+        """
+        from chemlite.FrozenReaction import FrozenReaction
+
+        return FrozenReaction.intern(self)
+
     @staticmethod
     def parse(rxn: str, logger: Logger = getLogger(__file__)):
         """
@@ -142,12 +219,19 @@ class Reaction(Object):
                 if _cmpd not in transfo[side]:
                     transfo[side][_cmpd] = 0
                 transfo[side][_cmpd] += _coeff
-        logger.debug("INPUT TRANSFORMATION: " + str(json_dumps(transfo, indent=4)))
+        if logger.isEnabledFor(DEBUG):
+            logger.debug("INPUT TRANSFORMATION: %s", json_dumps(transfo, indent=4))
         return transfo
 
-    def to_string(self) -> str:
+    def to_string(self, id: str = None) -> str:
         """Returns the string representation of the reaction
 
+        Parameters
+        ----------
+        id: str
+            ID to write the reaction under, its own if None
+            (e.g. ID of a shared reaction within a pathway)
+
         Returns
         -------
         string: str
@@ -155,7 +239,7 @@ class Reaction(Object):
         """
         return "{class_name} {rxn_name}: {reactants} = {products}".format(
             class_name=type(self).__name__,
-            rxn_name=self.get_id(),
+            rxn_name=self.get_id() if id is None else id,
             reactants=" + ".join(
                 [
                     f"{spe_sto} {spe_id}"
@@ -195,7 +279,41 @@ class Reaction(Object):
             )
         return d
 
+    def _content(self) -> Tuple:
+        """Return the attributes the equality of reactions relies on:
+            - reactants
+            - products
+
+        Returns
+        -------
+        content: Tuple
+            Stoichiometric dictionaries of reactants and products
+        """
+        return (self.__reactants, self.__products)
+
+    def _hash_content(self) -> int:
+        """Compute the hash of the reaction from its stoichiometry,
+        regardless of the order of species
+
+        Returns
+        -------
+        hash: int
+            Hash of the reaction
+        """
+        return hash(
+            (frozenset(self.__reactants.items()), frozenset(self.__products.items()))
+        )
+
+    def _invalidate_hash(self) -> None:
+        """Drop the cached hash of the reaction and record the modification"""
+        super()._invalidate_hash()
+        self._version += 1
+
     ## READ METHODS
+    def is_frozen(self) -> bool:
+        """Returns True if the reaction cannot be modified (see freeze())"""
+        return False
+
     def get_ec_numbers(self) -> List[str]:
         """Returns the list of EC numbers of the reaction.
 
@@ -206,6 +324,96 @@ class Reaction(Object):
         """
         return self.__ec_numbers
 
+    def get_key(self, directed: bool = True) -> Tuple:
+        """Returns a canonical key of the reaction, which depends only on its
+        stoichiometry: two reactions with the same reactants and products have
+        the same key, whatever their IDs, EC numbers and order of species.
+        If 'directed' is False, a reaction and its reverse (A = B and B = A)
+        have the same key.
+
+        Parameters
+        ----------
+        directed: bool
+            Take the direction of the reaction into account
+
+        Returns
+        -------
+        key: Tuple
+            ((reactant_id, coeff)...), ((product_id, coeff)...), sorted by ID.
+            If not directed, sides are sorted as well.
+        """
+        left = tuple(sorted(self.__reactants.items()))
+        right = tuple(sorted(self.__products.items()))
+        if not directed and right < left:
+            return (right, left)
+        return (left, right)
+
+    def get_string_key(self, directed: bool = True) -> str:
+        """Returns the canonical key of the reaction (see get_key()) as a
+        string (see key_to_string()), e.g. to store or hash it
+
+        Parameters
+        ----------
+        directed: bool
+            Take the direction of the reaction into account
+
+        Returns
+        -------
+        key: str
+            Key of the reaction
+        """
+        return Reaction.key_to_string(self.get_key(directed=directed))
+
+    @staticmethod
+    def key_to_string(key: Tuple) -> str:
+        """Returns a canonical key (see get_key()) as a compact JSON string,
+        integral coefficients written as integers (1 and 1.0 give the same
+        string) and non-finite ones as their repr()
+
+        Parameters
+        ----------
+        key: Tuple
+            Canonical key of a reaction
+
+        Returns
+        -------
+        key: str
+            Key of the reaction
+        """
+        return json_dumps(
+            [
+                [[spe_id, Reaction.__key_coeff(spe_sto)] for spe_id, spe_sto in side]
+                for side in key
+            ],
+            separators=(",", ":"),
+        )
+
+    @staticmethod
+    def __key_coeff(spe_sto: float) -> Union[int, float, str]:
+        # int() fails on NaN and infinity
+        if not isfinite(spe_sto):
+            return repr(spe_sto)
+        return int(spe_sto) if spe_sto == int(spe_sto) else spe_sto
+
+    @staticmethod
+    def round_stoichio(spe_sto: float) -> int:
+        """Returns the number of times a species is written in
+        the SMILES string of a reaction, i.e. its stoichiometric
+        coefficient rounded to the nearest integer, at least 1
+
+        Parameters
+        ----------
+        spe_sto: float
+            Stoichiometric coefficient
+
+        Returns
+        -------
+        nb: int
+            Rounded stoichiometric coefficient
+        """
+        _spe_sto = round(spe_sto)
+        return _spe_sto if _spe_sto > 0 else 1
+
     def get_smiles(self) -> str:
         """Builds and returns the SMILES string of the reaction
 
@@ -214,6 +422,8 @@ class Reaction(Object):
         smiles: str
             SMILES string of the reaction
         """
+        # per-species warnings are not emitted in performance mode
+        warn = not is_performance_mode()
 
         def get_smi(spe_id: str, spe_sto: float) -> str:
             check_smiles = (
@@ -222,15 +432,18 @@ class Reaction(Object):
                 and Cache.get(spe_id).get_smiles() != ""
             )
             if check_smiles:
-                _spe_sto = round(spe_sto)
-                _spe_sto = _spe_sto if _spe_sto > 0 else 1
-                if _spe_sto != spe_sto:
+                _spe_sto = Reaction.round_stoichio(spe_sto)
+                if warn and _spe_sto != spe_sto:
                     self.get_logger().warning(
-                        f"Stoichiometric coefficient of compound {spe_id} ({spe_sto}) has been rounded to {_spe_sto}."
+                        "Stoichiometric coefficient of compound %s (%s) has been rounded to %s.",
+                        spe_id,
+                        spe_sto,
+                        _spe_sto,
                     )
                 return [Cache.get(spe_id).get_smiles()] * _spe_sto
             else:
-                self.get_logger().warning(f"Compound {spe_id} has no smiles")
+                if warn:
+                    self.get_logger().warning("Compound %s has no smiles", spe_id)
                 return []
 
         ## LEFT
@@ -266,6 +479,17 @@ class Reaction(Object):
         except AttributeError:
             return None
 
+    def iter_reactants(self) -> Iterator[Tuple[str, int]]:
+        """Iterates over (ID, stoichiometric coefficient) of reactants,
+        in insertion order and without copying them (see get_reactants())
+
+        Returns
+        -------
+        reactants: Iterator[Tuple[str, int]]
+            Iterator over reactants
+        """
+        return iter(self.__reactants.items())
+
     def get_reactant(self, cmpd_id: str) -> int:
         """Returns the stoichiometric coefficient (> 0) of the
         reactant compound with ID = 'cmpd_id'
@@ -333,6 +557,17 @@ class Reaction(Object):
         except AttributeError:
             return None
 
+    def iter_products(self) -> Iterator[Tuple[str, int]]:
+        """Iterates over (ID, stoichiometric coefficient) of products,
+        in insertion order and without copying them (see get_products())
+
+        Returns
+        -------
+        products: Iterator[Tuple[str, int]]
+            Iterator over products
+        """
+        return iter(self.__products.items())
+
     def get_product(self, cmpd_id: str) -> int:
         """Returns the stoichiometric coefficient (> 0) of the
         product compound with ID = 'cmpd_id'
@@ -420,6 +655,16 @@ class Reaction(Object):
             set(list(self.get_reactants().keys()) + list(self.get_products().keys()))
         )
 
+    def get_species_set(self) -> FrozenSet[str]:
+        """Returns the set of species IDs
+
+        Returns
+        -------
+        species: FrozenSet[str]
+            Set of species IDs
+        """
+        return frozenset(self.__reactants).union(self.__products)
+
     def get_specie(self, cmpd_id: str) -> Dict:
         """Return informations about a specie within the current reaction
 
@@ -488,10 +733,10 @@ class Reaction(Object):
         compounds: Dict[str, int]
             Stoichiometric dictionary to set the reactions's reactants to
         """
-        self.__reactants = {}
-        if compounds is not None:
-            for spe_id, spe_sto in compounds.items():
-                self.set_reactant(spe_id, spe_sto)
+        self.__reactants = Reaction.__to_side(compounds)
+        self._invalidate_hash()
+        # registered once set, so that species are pinned by the reaction
+        Reaction.__register_all(self.__reactants)
 
     def set_reactant(self, cmpd_id: str, stoichio: int) -> None:
         """Set the stoichiometric coefficient of the reactant compound
@@ -507,12 +752,9 @@ class Reaction(Object):
         if cmpd_id is None or cmpd_id == "":
             return None
             self.logger.warning(f"Compound ID passed is equal to {cmpd_id}")
-        if self.get_reactants() is None:
-            self.__reactants = {}
         self.__reactants[cmpd_id] = abs(stoichio)
-        if cmpd_id not in Cache.get_list_of_objects():
-            # add to Cache
-            Compound(id=cmpd_id)
+        self._invalidate_hash()
+        Reaction._register_species(cmpd_id)
 
     def set_products(self, compounds: Dict) -> None:
         """Set the products of the reaction
@@ -522,10 +764,9 @@ class Reaction(Object):
         compounds: Dict[str, int]
             Stoichiometric dictionary to set the reactions's products to
         """
-        self.__products = {}
-        if compounds is not None:
-            for spe_id, spe_sto in compounds.items():
-                self.set_product(spe_id, spe_sto)
+        self.__products = Reaction.__to_side(compounds)
+        self._invalidate_hash()
+        Reaction.__register_all(self.__products)
 
     def set_product(self, cmpd_id: str, stoichio: int) -> None:
         """Set the stoichiometric coefficient of the product compound
@@ -541,12 +782,83 @@ class Reaction(Object):
         if cmpd_id is None or cmpd_id == "":
             return None
             self.logger.warning(f"Compound ID passed is equal to {cmpd_id}")
-        if self.get_products() is None:
-            self.__products = {}
         self.__products[cmpd_id] = abs(stoichio)
-        if cmpd_id not in Cache.get_list_of_objects():
+        self._invalidate_hash()
+        Reaction._register_species(cmpd_id)
+
+    @staticmethod
+    def _register_species(cmpd_id: str) -> bool:
+        """Add a placeholder compound with ID 'cmpd_id' to the cache
+        if no compound is registered under this ID yet (deferred within
+        deferred_registration())
+
+        Parameters
+        ----------
+        cmpd_id: str
+            ID of the compound
+
+        Returns
+        -------
+        b: bool
+            True if a placeholder has been added, False otherwise
+        """
+        if Cache.get(cmpd_id) is not None:
+            CompoundRegistry.touch(cmpd_id)
+            return False
+        pending = Reaction.__pending
+        if pending is None:
             # add to Cache
             Compound(id=cmpd_id)
+        elif cmpd_id in pending:
+            return False
+        else:
+            pending.add(cmpd_id)
+        return True
+
+    @staticmethod
+    @contextmanager
+    def deferred_registration() -> Iterator[None]:
+        """Context manager deferring the creation of placeholder compounds
+        of reactions species to its exit, where each missing species gets
+        a single placeholder whatever the number of reactions it is in.
+        Within the context, species without a compound yet are not in the
+        cache (e.g. get_reactants_compounds() returns None for them).
+
+        Example:
+            with Reaction.deferred_registration():
+                reactions = [Reaction.from_dict(rxn) for rxn in rxns]
+        """
+        if Reaction.__pending is not None:
+            # nested, placeholders are built by the outermost context
+            yield
+            return
+        Reaction.__pending = set()
+        try:
+            yield
+        finally:
+            pending = Reaction.__pending
+            Reaction.__pending = None
+            for cmpd_id in pending:
+                if Cache.get(cmpd_id) is None:
+                    Compound(id=cmpd_id)
+
+    @staticmethod
+    def __to_side(compounds: Dict[str, int]) -> Dict[str, int]:
+        # stoichiometric dict of one side of the reaction
+        if compounds is None:
+            return {}
+        return {
+            spe_id: abs(spe_sto)
+            for spe_id, spe_sto in compounds.items()
+            if spe_id is not None and spe_id != ""
+        }
+
+    @staticmethod
+    def __register_all(species: Dict[str, int]) -> None:
+        # looked up once, possibly wrapped by Metrics
+        register = Reaction._register_species
+        for spe_id in species:
+            register(spe_id)
 
     def rename_compound(self, id: str, new_id: str) -> None:
         """Rename a compound in the reaction.
@@ -0,0 +1,187 @@
+"""A class to deduplicate reactions."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterator, List, Tuple, Union
+from logging import Logger, getLogger
+
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+
+class ReactionStore:
+    """Store of unique reactions, interned by their canonical key
+    (see Reaction.get_key()): the first reaction added under a key
+    is the representative of all reactions with the same key.
+
+    Representatives are shared (across pathways, see add_pathway()), and
+    keep the ID they have been added under. They must only be modified
+    through Pathway.edit_reaction(), which modifies a private copy:
+    modifying them in place makes their key in the store stale.
+    """
+
+    def __init__(self, directed: bool = True, logger: Logger = getLogger(__name__)):
+        """
+        Parameters
+        ----------
+        directed: bool
+            If False, a reaction and its reverse (A = B and B = A)
+            are considered as the same reaction
+        logger: Logger
+            The logger object
+        """
+        self.__logger = logger
+        self.__directed = directed
+        # key -> representative reaction
+        self.__reactions: Dict[Tuple, Reaction] = {}
+        # key -> IDs the reaction has been seen under (dict as ordered set)
+        self.__ids: Dict[Tuple, Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__reactions)
+
+    def __iter__(self) -> Iterator[Reaction]:
+        return iter(self.__reactions.values())
+
+    def __contains__(self, rxn: Reaction) -> bool:
+        return self.get_key(rxn) in self.__reactions
+
+    ## READ METHODS
+    def is_directed(self) -> bool:
+        """Returns True if the direction of reactions is taken into account"""
+        return self.__directed
+
+    def get_key(self, rxn: Reaction) -> Tuple:
+        """Returns the canonical key of a reaction in the store
+
+        Parameters
+        ----------
+        rxn: Reaction
+            Reaction to return the key of
+
+        Returns
+        -------
+        key: Tuple
+            Canonical key of the reaction
+        """
+        return rxn.get_key(directed=self.__directed)
+
+    def get(self, rxn: Union[Reaction, Tuple]) -> Reaction:
+        """Returns the representative of a reaction if stored, None otherwise
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+
+        Returns
+        -------
+        reaction: Reaction
+            The representative reaction
+        """
+        key = rxn if isinstance(rxn, tuple) else self.get_key(rxn)
+        return self.__reactions.get(key, None)
+
+    def get_ids(self, rxn: Union[Reaction, Tuple]) -> List[str]:
+        """Returns IDs a reaction has been added under
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+
+        Returns
+        -------
+        ids: List[str]
+            IDs of added reactions with the same key, in order of addition
+        """
+        key = rxn if isinstance(rxn, tuple) else self.get_key(rxn)
+        return list(self.__ids.get(key, {}))
+
+    def is_reversed(self, rxn: Reaction) -> bool:
+        """Returns True if 'rxn' is the reverse of its representative
+        (can only happen if the store is not directed)
+
+        Parameters
+        ----------
+        rxn: Reaction
+            Reaction to check
+
+        Returns
+        -------
+        b: bool
+            True if 'rxn' and its representative have opposite directions
+        """
+        representative = self.get(rxn)
+        if representative is None or representative is rxn:
+            return False
+        return representative.get_key() != rxn.get_key()
+
+    ## WRITE METHODS
+    def add(self, rxn: Reaction) -> Reaction:
+        """Add a reaction to the store and returns its representative,
+        i.e. the first reaction added with the same key
+
+        Parameters
+        ----------
+        rxn: Reaction
+            Reaction to add
+
+        Returns
+        -------
+        reaction: Reaction
+            The representative reaction
+        """
+        key = self.get_key(rxn)
+        representative = self.__reactions.setdefault(key, rxn)
+        self.__ids.setdefault(key, {})[rxn.get_id()] = None
+        return representative
+
+    def add_pathway(self, pathway: Pathway) -> int:
+        """Add reactions of a pathway to the store and replace them in the
+        pathway by their representative, unless they have opposite directions.
+        Reactions keep their ID within the pathway (keys of
+        Pathway.get_reactions()), whatever the ID of their representative.
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to intern reactions of
+
+        Returns
+        -------
+        nb: int
+            Number of reactions replaced in the pathway
+        """
+        nb = 0
+        for rxn_id, rxn in list(pathway.get_reactions().items()):
+            representative = self.add(rxn)
+            if representative is not rxn and not self.is_reversed(rxn):
+                pathway.replace_reaction(rxn_id, representative)
+                nb += 1
+        self.__logger.debug(
+            "%s reaction(s) of pathway %s interned", nb, pathway.get_id()
+        )
+        return nb
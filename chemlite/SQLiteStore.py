@@ -0,0 +1,464 @@
+"""A SQLite storage of compounds, reactions and pathways."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from contextlib import contextmanager
+from json import dumps as json_dumps, loads as json_loads
+from logging import Logger, getLogger
+from os import PathLike, fspath
+from sqlite3 import connect
+
+from brs_utils import Cache
+from chemlite.Compound import Compound
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS compounds (
+    id TEXT PRIMARY KEY,
+    name TEXT, smiles TEXT, inchi TEXT, inchikey TEXT, formula TEXT
+);
+CREATE INDEX IF NOT EXISTS compounds_inchikey ON compounds (inchikey);
+CREATE TABLE IF NOT EXISTS reactions (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    ec_numbers TEXT NOT NULL,
+    UNIQUE (id, key, ec_numbers)
+);
+CREATE INDEX IF NOT EXISTS reactions_key ON reactions (key);
+CREATE TABLE IF NOT EXISTS stoichiometry (
+    reaction INTEGER NOT NULL REFERENCES reactions (pk),
+    compound TEXT NOT NULL,
+    coeff REAL NOT NULL,
+    product INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stoichiometry_reaction ON stoichiometry (reaction);
+CREATE INDEX IF NOT EXISTS stoichiometry_compound ON stoichiometry (compound);
+CREATE TABLE IF NOT EXISTS pathways (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    target_id TEXT
+);
+CREATE INDEX IF NOT EXISTS pathways_id ON pathways (id);
+CREATE INDEX IF NOT EXISTS pathways_target_id ON pathways (target_id);
+CREATE TABLE IF NOT EXISTS pathway_reactions (
+    pathway INTEGER NOT NULL REFERENCES pathways (pk),
+    reaction INTEGER NOT NULL REFERENCES reactions (pk),
+    rxn_id TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pathway_reactions_pathway
+    ON pathway_reactions (pathway);
+CREATE INDEX IF NOT EXISTS pathway_reactions_reaction
+    ON pathway_reactions (reaction);
+"""
+
+COMPOUND_FIELDS = ["id", "name", "smiles", "inchi", "inchikey", "formula"]
+
+
+class SQLiteStore:
+    """Storage of compounds, reactions and pathways in normalized tables
+    of a SQLite file. Objects are added in one transaction per call and
+    queries return iterators that build objects as they are consumed.
+    Reactions are shared by pathways (same ID, EC numbers and canonical
+    key, see Reaction.get_key()), compounds are stored once by ID.
+
+    Compounds already in the cache are returned as they are, with their
+    in-memory changes, only missing ones are built from the database
+    (stored values do not replace live compounds).
+    """
+
+    # maximum number of parameters of a SQLite statement
+    BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        path: Union[str, PathLike],
+        timeout: float = 30.0,
+        logger: Logger = getLogger(__name__),
+    ):
+        """
+        Parameters
+        ----------
+        path: Union[str, PathLike]
+            Path of the database file, created if it does not exist
+        timeout: float
+            Seconds to wait for a lock held by another connection
+        logger: Logger
+            The logger object
+        """
+        self.__logger = logger
+        # transactions are handled explicitly (autocommit otherwise)
+        self.__conn = connect(fspath(path), timeout=timeout, isolation_level=None)
+        self.__conn.execute("PRAGMA journal_mode = WAL")
+        self.__conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the database"""
+        self.__conn.close()
+
+    ## READ METHODS
+    def get_nb_compounds(self) -> int:
+        """Returns the number of stored compounds"""
+        return self.__count("compounds")
+
+    def get_nb_reactions(self) -> int:
+        """Returns the number of stored (distinct) reactions"""
+        return self.__count("reactions")
+
+    def get_nb_pathways(self) -> int:
+        """Returns the number of stored pathways"""
+        return self.__count("pathways")
+
+    def get_compound(self, cmpd_id: str) -> Compound:
+        """Returns the stored compound with ID 'cmpd_id', None if not found"""
+        return next(self.__iter_compounds("WHERE id = ?", (cmpd_id,)), None)
+
+    def find_compounds(self, inchikey: str) -> Iterator[Compound]:
+        """Returns stored compounds with InChIKey 'inchikey'
+
+        Parameters
+        ----------
+        inchikey: str
+            InChIKey of compounds
+
+        Returns
+        -------
+        compounds: Iterator[Compound]
+            Compounds, built as they are iterated over
+        """
+        return self.__iter_compounds("WHERE inchikey = ?", (inchikey,))
+
+    def find_reactions(
+        self, rxn: Union[Reaction, Tuple] = None, compound_id: str = None
+    ) -> Iterator[Reaction]:
+        """Returns stored reactions with the same canonical key as 'rxn'
+        and/or involving compound 'compound_id'
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+        compound_id: str
+            ID of a reactant or product
+
+        Returns
+        -------
+        reactions: Iterator[Reaction]
+            Reactions, built as they are iterated over
+        """
+        where, params = self.__reactions_filter(rxn, compound_id)
+        rows = self.__conn.execute(
+            f"SELECT pk, id, ec_numbers FROM reactions {where} ORDER BY pk", params
+        )
+        for pk, rxn_id, ec_numbers in rows:
+            yield Reaction.from_dict(self.__reaction_dict(pk, rxn_id, ec_numbers))
+
+    def find_pathways(
+        self,
+        id: str = None,
+        target_id: str = None,
+        rxn: Union[Reaction, Tuple] = None,
+        compound_id: str = None,
+    ) -> Iterator[Pathway]:
+        """Returns stored pathways matching all criteria given,
+        all pathways if none is given
+
+        Parameters
+        ----------
+        id: str
+            ID of the pathway
+        target_id: str
+            ID of the target of the pathway
+        rxn: Union[Reaction, Tuple]
+            Reaction of the pathway (compared by canonical key)
+        compound_id: str
+            ID of a compound involved in a reaction of the pathway
+
+        Returns
+        -------
+        pathways: Iterator[Pathway]
+            Pathways, built (with reactions and compounds) as they
+            are iterated over
+        """
+        clauses = []
+        params = []
+        if id is not None:
+            clauses.append("id = ?")
+            params.append(id)
+        if target_id is not None:
+            clauses.append("target_id = ?")
+            params.append(target_id)
+        if rxn is not None or compound_id is not None:
+            where, rxn_params = self.__reactions_filter(rxn, compound_id)
+            clauses.append(
+                "pk IN (SELECT pathway FROM pathway_reactions WHERE reaction IN "
+                f"(SELECT pk FROM reactions {where}))"
+            )
+            params += rxn_params
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.__conn.execute(
+            f"SELECT pk, id, target_id FROM pathways {where} ORDER BY pk", params
+        )
+        for pk, pw_id, pw_target_id in rows:
+            yield self.__load_pathway(pk, pw_id, pw_target_id)
+
+    ## WRITE METHODS
+    def add_compounds(self, compounds: Iterable[Compound]) -> None:
+        """Store compounds, replacing those with the same ID
+
+        Parameters
+        ----------
+        compounds: Iterable[Compound]
+            Compounds to store
+        """
+        with self.__transaction():
+            self.__add_compounds(compounds)
+
+    def add_reactions(self, reactions: Iterable[Reaction]) -> None:
+        """Store reactions, with their compounds if built. Stored values
+        of compounds are not replaced by empty ones (e.g. of placeholders)
+
+        Parameters
+        ----------
+        reactions: Iterable[Reaction]
+            Reactions to store
+        """
+        with self.__transaction():
+            pks: Dict[Tuple, int] = {}
+            for rxn in reactions:
+                self.__add_reaction(rxn, pks)
+
+    def add_pathways(self, pathways: Iterable[Pathway]) -> int:
+        """Store pathways, with their reactions and compounds (stored
+        values of compounds are not replaced by empty ones)
+
+        Parameters
+        ----------
+        pathways: Iterable[Pathway]
+            Pathways to store
+
+        Returns
+        -------
+        nb: int
+            Number of pathways stored
+        """
+        nb = 0
+        with self.__transaction():
+            # reaction -> pk, within the transaction
+            pks: Dict[Tuple, int] = {}
+            for pathway in pathways:
+                pk = self.__conn.execute(
+                    "INSERT INTO pathways (id, target_id) VALUES (?, ?)",
+                    (pathway.get_id(), pathway.get_target_id()),
+                ).lastrowid
+                self.__conn.executemany(
+                    "INSERT INTO pathway_reactions "
+                    "(pathway, reaction, rxn_id, position) VALUES (?, ?, ?, ?)",
+                    [
+                        (pk, self.__add_reaction(rxn, pks), rxn_id, position)
+                        for position, (rxn_id, rxn) in enumerate(
+                            pathway.get_reactions().items()
+                        )
+                    ],
+                )
+                nb += 1
+        self.__logger.debug("%s pathway(s) stored", nb)
+        return nb
+
+    def __add_compounds(
+        self, compounds: Iterable[Compound], replace: bool = True
+    ) -> None:
+        # species of reactions may be empty placeholders: if not 'replace',
+        # stored values are only overwritten by non-empty ones
+        rows = [
+            (
+                compound.get_id(),
+                compound.get_name(),
+                compound.get_smiles(),
+                compound.get_inchi(),
+                compound.get_inchikey(),
+                compound.get_formula(),
+            )
+            for compound in compounds
+        ]
+        if replace:
+            self.__conn.executemany(
+                "INSERT OR REPLACE INTO compounds "
+                f"({', '.join(COMPOUND_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return
+        self.__conn.executemany(
+            "UPDATE compounds SET "
+            + ", ".join(
+                f"{field} = COALESCE(NULLIF(?, ''), {field})"
+                for field in COMPOUND_FIELDS[1:]
+            )
+            + " WHERE id = ?",
+            [row[1:] + row[:1] for row in rows],
+        )
+        self.__conn.executemany(
+            "INSERT OR IGNORE INTO compounds "
+            f"({', '.join(COMPOUND_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def __add_reaction(self, rxn: Reaction, pks: Dict[Tuple, int]) -> int:
+        key = rxn.get_string_key()
+        ec_numbers = json_dumps(rxn.get_ec_numbers())
+        unique = (rxn.get_id(), key, ec_numbers)
+        pk = pks.get(unique)
+        if pk is not None:
+            return pk
+        row = self.__conn.execute(
+            "SELECT pk FROM reactions WHERE id = ? AND key = ? AND ec_numbers = ?",
+            unique,
+        ).fetchone()
+        if row is None:
+            pk = self.__conn.execute(
+                "INSERT INTO reactions (id, key, ec_numbers) VALUES (?, ?, ?)", unique
+            ).lastrowid
+            self.__conn.executemany(
+                "INSERT INTO stoichiometry (reaction, compound, coeff, product) "
+                "VALUES (?, ?, ?, ?)",
+                [(pk, spe_id, spe_sto, 0) for spe_id, spe_sto in rxn.iter_reactants()]
+                + [(pk, spe_id, spe_sto, 1) for spe_id, spe_sto in rxn.iter_products()],
+            )
+            self.__add_compounds(
+                (
+                    compound
+                    for compound in map(Cache.get, rxn.get_species_set())
+                    if compound is not None
+                ),
+                replace=False,
+            )
+        else:
+            pk = row[0]
+        pks[unique] = pk
+        return pk
+
+    def __load_pathway(self, pk: int, pw_id: str, target_id: str) -> Pathway:
+        reactions = {}
+        species = set()
+        rows = self.__conn.execute(
+            "SELECT pr.rxn_id, r.pk, r.id, r.ec_numbers FROM pathway_reactions pr "
+            "JOIN reactions r ON r.pk = pr.reaction "
+            "WHERE pr.pathway = ? ORDER BY pr.position",
+            (pk,),
+        ).fetchall()
+        for rxn_id, rxn_pk, rxn_real_id, ec_numbers in rows:
+            reaction = self.__reaction_dict(rxn_pk, rxn_real_id, ec_numbers)
+            reactions[rxn_id] = reaction
+            species.update(reaction["reactants"])
+            species.update(reaction["products"])
+        return Pathway.from_dict(
+            {
+                "id": pw_id,
+                "reactions": reactions,
+                "species": self.__compounds_dict(species),
+                "target_id": target_id,
+            },
+            logger=self.__logger,
+        )
+
+    def __reaction_dict(self, pk: int, rxn_id: str, ec_numbers: str) -> Dict:
+        reaction = {
+            "id": rxn_id,
+            "ec_numbers": json_loads(ec_numbers),
+            "reactants": {},
+            "products": {},
+        }
+        for compound, coeff, product in self.__conn.execute(
+            "SELECT compound, coeff, product FROM stoichiometry WHERE reaction = ?",
+            (pk,),
+        ):
+            side = reaction["products" if product else "reactants"]
+            side[compound] = int(coeff) if coeff == int(coeff) else coeff
+        return reaction
+
+    def __compounds_dict(self, cmpd_ids: Iterable[str]) -> Dict[str, Dict]:
+        # compounds already in the cache are not built again
+        cmpd_ids = [cmpd_id for cmpd_id in cmpd_ids if Cache.get(cmpd_id) is None]
+        compounds = {}
+        for start in range(0, len(cmpd_ids), self.BATCH_SIZE):
+            batch = cmpd_ids[start : start + self.BATCH_SIZE]
+            for row in self.__conn.execute(
+                f"SELECT {', '.join(COMPOUND_FIELDS)} FROM compounds "
+                f"WHERE id IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                compounds[row[0]] = dict(zip(COMPOUND_FIELDS, row))
+        return compounds
+
+    def __iter_compounds(self, where: str, params: Tuple) -> Iterator[Compound]:
+        rows = self.__conn.execute(
+            f"SELECT {', '.join(COMPOUND_FIELDS)} FROM compounds {where}", params
+        )
+        for row in rows:
+            compound = Cache.get(row[0])
+            if not isinstance(compound, Compound):
+                compound = Compound.from_dict(dict(zip(COMPOUND_FIELDS, row)))
+            yield compound
+
+    def __reactions_filter(
+        self, rxn: Union[Reaction, Tuple], compound_id: str
+    ) -> Tuple[str, List]:
+        clauses = []
+        params = []
+        if rxn is not None:
+            clauses.append("key = ?")
+            params.append(
+                Reaction.key_to_string(rxn)
+                if isinstance(rxn, tuple)
+                else rxn.get_string_key()
+            )
+        if compound_id is not None:
+            clauses.append(
+                "pk IN (SELECT reaction FROM stoichiometry WHERE compound = ?)"
+            )
+            params.append(compound_id)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def __count(self, table: str) -> int:
+        return self.__conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    @contextmanager
+    def __transaction(self) -> Iterator[None]:
+        self.__conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.__conn.execute("ROLLBACK")
+            raise
+        self.__conn.execute("COMMIT")
@@ -0,0 +1,270 @@
+"""Persistent cache of thermodynamic values of reactions."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from contextlib import contextmanager
+from json import dumps as json_dumps, loads as json_loads
+from logging import Logger, getLogger
+from os import PathLike, fspath
+from sqlite3 import OperationalError, connect, sqlite_version, sqlite_version_info
+from time import sleep, time
+
+from chemlite.Reaction import Reaction
+
+
+class ThermoCache:
+    """Persistent cache of thermodynamic values (shaped as
+    constants.DEFAULT_THERMO) of reactions, stored in a SQLite file and
+    keyed by canonical stoichiometry (see Reaction.get_key()), so that
+    values computed once are reused across runs and pathways.
+
+    The database is in WAL mode, so that several processes on the same
+    host can read and write it at the same time, each with its own
+    ThermoCache (connections must not be shared between processes).
+    If 'max_size' is set, least recently used entries are evicted.
+    """
+
+    # maximum number of parameters of a SQLite statement
+    BATCH_SIZE = 500
+    # for upserts (INSERT ... ON CONFLICT DO UPDATE)
+    MIN_SQLITE_VERSION = (3, 24, 0)
+
+    def __init__(
+        self,
+        path: Union[str, PathLike],
+        max_size: int = None,
+        timeout: float = 30.0,
+        logger: Logger = getLogger(__name__),
+    ):
+        """
+        Parameters
+        ----------
+        path: Union[str, PathLike]
+            Path of the database file, created if it does not exist
+        max_size: int
+            Maximum number of entries, unbounded if None
+        timeout: float
+            Seconds to wait for a lock held by another process
+        logger: Logger
+            The logger object
+        """
+        if sqlite_version_info < ThermoCache.MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                "ThermoCache requires SQLite >= "
+                f"{'.'.join(map(str, ThermoCache.MIN_SQLITE_VERSION))}, "
+                f"got {sqlite_version}"
+            )
+        self.__logger = logger
+        self.__max_size = max_size
+        # transactions are handled explicitly (autocommit otherwise)
+        self.__conn = connect(fspath(path), timeout=timeout, isolation_level=None)
+        self.__conn.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+        deadline = time() + timeout
+        while True:
+            try:
+                self.__conn.execute("PRAGMA journal_mode = WAL")
+                break
+            except OperationalError:
+                # the busy timeout does not apply to the change of journal
+                # mode while another process creates the database
+                if time() > deadline:
+                    raise
+                sleep(0.01)
+        self.__conn.execute("PRAGMA synchronous = NORMAL")
+        with self.__transaction():
+            self.__conn.execute(
+                "CREATE TABLE IF NOT EXISTS thermo ("
+                "key TEXT PRIMARY KEY, thermo TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            self.__conn.execute(
+                "CREATE INDEX IF NOT EXISTS thermo_accessed ON thermo (accessed)"
+            )
+            # number of entries, kept up to date by triggers so that entries
+            # are not counted each time some are added
+            self.__conn.execute(
+                "CREATE TABLE IF NOT EXISTS thermo_size (nb INTEGER NOT NULL)"
+            )
+            self.__conn.execute(
+                "INSERT INTO thermo_size SELECT COUNT(*) FROM thermo "
+                "WHERE NOT EXISTS (SELECT 1 FROM thermo_size)"
+            )
+            self.__conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS thermo_insert AFTER INSERT ON thermo "
+                "BEGIN UPDATE thermo_size SET nb = nb + 1; END"
+            )
+            self.__conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS thermo_delete AFTER DELETE ON thermo "
+                "BEGIN UPDATE thermo_size SET nb = nb - 1; END"
+            )
+
+    def __len__(self) -> int:
+        return self.__conn.execute("SELECT nb FROM thermo_size").fetchone()[0]
+
+    def __contains__(self, rxn: Union[Reaction, Tuple]) -> bool:
+        return (
+            self.__conn.execute(
+                "SELECT 1 FROM thermo WHERE key = ?", (self.get_key(rxn),)
+            ).fetchone()
+            is not None
+        )
+
+    def __enter__(self) -> "ThermoCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def get_key(rxn: Union[Reaction, Tuple]) -> str:
+        """Returns the key of a reaction in the cache, i.e. its canonical
+        stoichiometry as a string (see Reaction.key_to_string())
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+
+        Returns
+        -------
+        key: str
+            Key of the reaction
+        """
+        if isinstance(rxn, tuple):
+            return Reaction.key_to_string(rxn)
+        return rxn.get_string_key()
+
+    ## READ METHODS
+    def get(self, rxn: Union[Reaction, Tuple]) -> Dict:
+        """Returns cached thermodynamic values of a reaction
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+
+        Returns
+        -------
+        thermo: Dict
+            Values shaped as constants.DEFAULT_THERMO, None if not cached
+        """
+        return self.get_many([rxn])[0]
+
+    def get_many(self, rxns: Iterable[Union[Reaction, Tuple]]) -> List[Dict]:
+        """Returns cached thermodynamic values of reactions, in one
+        query per batch of ThermoCache.BATCH_SIZE reactions
+
+        Parameters
+        ----------
+        rxns: Iterable[Union[Reaction, Tuple]]
+            Reactions or canonical keys of reactions
+
+        Returns
+        -------
+        thermos: List[Dict]
+            Values of each reaction, None if not cached
+        """
+        keys = [self.get_key(rxn) for rxn in rxns]
+        found: Dict[str, Dict] = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), self.BATCH_SIZE):
+            batch = unique[start : start + self.BATCH_SIZE]
+            rows = self.__conn.execute(
+                "SELECT key, thermo FROM thermo WHERE key IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            found.update((key, json_loads(thermo)) for key, thermo in rows)
+        if found and self.__max_size is not None:
+            # recency is only needed for eviction
+            with self.__transaction():
+                self.__conn.executemany(
+                    "UPDATE thermo SET accessed = ? WHERE key = ?",
+                    [(time(), key) for key in found],
+                )
+        return [found.get(key) for key in keys]
+
+    ## WRITE METHODS
+    def put(self, rxn: Union[Reaction, Tuple], thermo: Dict) -> None:
+        """Cache thermodynamic values of a reaction
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+        thermo: Dict
+            Values shaped as constants.DEFAULT_THERMO
+        """
+        self.put_many([(rxn, thermo)])
+
+    def put_many(self, items: Iterable[Tuple[Union[Reaction, Tuple], Dict]]) -> None:
+        """Cache thermodynamic values of reactions in a single transaction,
+        then evict least recently used entries beyond 'max_size'
+
+        Parameters
+        ----------
+        items: Iterable[Tuple[Union[Reaction, Tuple], Dict]]
+            Reactions (or canonical keys) and their values
+        """
+        now = time()
+        rows = [(self.get_key(rxn), json_dumps(thermo), now) for rxn, thermo in items]
+        with self.__transaction():
+            # updated in place (not deleted then inserted) if already cached
+            self.__conn.executemany(
+                "INSERT INTO thermo (key, thermo, accessed) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "thermo = excluded.thermo, accessed = excluded.accessed",
+                rows,
+            )
+            if self.__max_size is not None:
+                excess = len(self) - self.__max_size
+                if excess > 0:
+                    self.__conn.execute(
+                        "DELETE FROM thermo WHERE rowid IN "
+                        "(SELECT rowid FROM thermo ORDER BY accessed LIMIT ?)",
+                        (excess,),
+                    )
+                    self.__logger.debug("%s thermo entries evicted", excess)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self.__transaction():
+            self.__conn.execute("DELETE FROM thermo")
+
+    def close(self) -> None:
+        """Close the connection to the database"""
+        self.__conn.close()
+
+    @contextmanager
+    def __transaction(self) -> Iterator[None]:
+        # the database is locked at once (BEGIN IMMEDIATE) rather than at
+        # the first write, so that concurrent writers wait instead of failing
+        self.__conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.__conn.execute("ROLLBACK")
+            raise
+        self.__conn.execute("COMMIT")
@@ -0,0 +1,227 @@
+"""Compact storage of thermodynamic values of reactions."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from array import array
+from logging import Logger, getLogger
+from math import isnan, sqrt
+
+from chemlite.constants import DEFAULT_THERMO
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+
+class ThermoStore:
+    """Thermodynamic values (see constants.DEFAULT_THERMO) of reactions,
+    keyed by canonical key (see Reaction.get_key()). Values and errors
+    of each quantity are stored in arrays of doubles, one row per reaction.
+    A reaction not stored whose reverse is stored gets opposite values.
+    """
+
+    QUANTITIES = list(DEFAULT_THERMO)
+
+    def __init__(self, logger: Logger = getLogger(__name__)):
+        """
+        Parameters
+        ----------
+        logger: Logger
+            The logger object
+        """
+        self.__logger = logger
+        # key -> row in arrays
+        self.__rows: Dict[Tuple, int] = {}
+        self.__values = {quantity: array("d") for quantity in self.QUANTITIES}
+        self.__errors = {quantity: array("d") for quantity in self.QUANTITIES}
+        self.__units = {
+            quantity: DEFAULT_THERMO[quantity]["unit"] for quantity in self.QUANTITIES
+        }
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return iter(self.__rows)
+
+    def __contains__(self, rxn: Union[Reaction, Tuple]) -> bool:
+        return self.__get_row(rxn)[0] is not None
+
+    ## READ METHODS
+    def get(self, rxn: Union[Reaction, Tuple]) -> Dict:
+        """Returns thermodynamic values of a reaction
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+
+        Returns
+        -------
+        thermo: Dict
+            Values shaped as constants.DEFAULT_THERMO, None if not stored
+        """
+        row, sign = self.__get_row(rxn)
+        if row is None:
+            return None
+        return {
+            quantity: {
+                "value": sign * self.__values[quantity][row],
+                "error": self.__errors[quantity][row],
+                "unit": self.__units[quantity],
+            }
+            for quantity in self.QUANTITIES
+        }
+
+    def get_unit(self, quantity: str) -> str:
+        """Returns the unit of values of 'quantity'"""
+        return self.__units[quantity]
+
+    def aggregate(self, pathway: Pathway, quantity: str = "dG_prime") -> Dict:
+        """Returns thermodynamic values of 'quantity' over a pathway:
+        sum of values over reactions, error of the sum (errors of
+        reactions are independent) and worst step
+
+        Parameters
+        ----------
+        pathway: Pathway
+            Pathway to aggregate values over
+        quantity: str
+            One of ThermoStore.QUANTITIES
+
+        Returns
+        -------
+        thermo: Dict
+            - value: float, sum of values
+            - error: float, square root of the sum of squared errors
+            - unit: str
+            - worst: str, ID of the reaction with the highest value,
+              None if no value
+            - missing: List[str], IDs of reactions without value
+        """
+        return self.aggregate_pathways([pathway], quantity)[0]
+
+    def aggregate_pathways(
+        self, pathways: Iterable[Pathway], quantity: str = "dG_prime"
+    ) -> List[Dict]:
+        """Returns thermodynamic values of 'quantity' over each pathway
+        (see aggregate()). Rows of reactions shared by pathways (equal
+        content) are looked up once.
+
+        Parameters
+        ----------
+        pathways: Iterable[Pathway]
+            Pathways to aggregate values over
+        quantity: str
+            One of ThermoStore.QUANTITIES
+
+        Returns
+        -------
+        thermos: List[Dict]
+            Aggregated values of each pathway, in order of 'pathways'
+        """
+        values = self.__values[quantity]
+        errors = self.__errors[quantity]
+        unit = self.__units[quantity]
+        # reaction (by content) -> (value, squared error), None if no value
+        pool: Dict[Reaction, Tuple[float, float]] = {}
+        aggregated = []
+        for pathway in pathways:
+            total = 0.0
+            variance = 0.0
+            worst = None
+            worst_value = float("-inf")
+            missing = []
+            for rxn_id, rxn in pathway.get_reactions().items():
+                try:
+                    item = pool[rxn]
+                except KeyError:
+                    row, sign = self.__get_row(rxn)
+                    item = None
+                    if row is not None and not isnan(values[row]):
+                        item = (sign * values[row], errors[row] ** 2)
+                    pool[rxn] = item
+                if item is None:
+                    missing.append(rxn_id)
+                    continue
+                value, sq_error = item
+                total += value
+                variance += sq_error
+                if value > worst_value:
+                    worst, worst_value = rxn_id, value
+            aggregated.append(
+                {
+                    "value": total,
+                    "error": sqrt(variance),
+                    "unit": unit,
+                    "worst": worst,
+                    "missing": missing,
+                }
+            )
+        return aggregated
+
+    ## WRITE METHODS
+    def put(self, rxn: Union[Reaction, Tuple], thermo: Dict) -> None:
+        """Store thermodynamic values of a reaction, replacing previous ones.
+        Quantities missing in 'thermo' are set to NaN.
+
+        Parameters
+        ----------
+        rxn: Union[Reaction, Tuple]
+            Reaction or canonical key of the reaction
+        thermo: Dict
+            Values shaped as constants.DEFAULT_THERMO
+        """
+        key = rxn if isinstance(rxn, tuple) else rxn.get_key()
+        row = self.__rows.get(key)
+        if row is None:
+            row = self.__rows[key] = len(self.__rows)
+            for quantity in self.QUANTITIES:
+                self.__values[quantity].append(float("nan"))
+                self.__errors[quantity].append(float("nan"))
+        for quantity in self.QUANTITIES:
+            item = thermo.get(quantity, DEFAULT_THERMO[quantity])
+            self.__values[quantity][row] = item.get("value", float("nan"))
+            self.__errors[quantity][row] = item.get("error", float("nan"))
+            unit = item.get("unit", "")
+            if unit and unit != self.__units[quantity]:
+                if self.__units[quantity]:
+                    self.__logger.warning(
+                        "Unit of %s changed from %s to %s",
+                        quantity,
+                        self.__units[quantity],
+                        unit,
+                    )
+                self.__units[quantity] = unit
+
+    def __get_row(self, rxn: Union[Reaction, Tuple]) -> Tuple[int, float]:
+        # row of the reaction, or of its reverse with opposite values
+        key = rxn if isinstance(rxn, tuple) else rxn.get_key()
+        row = self.__rows.get(key)
+        if row is not None:
+            return row, 1.0
+        row = self.__rows.get((key[1], key[0]))
+        if row is not None:
+            return row, -1.0
+        return None, 1.0
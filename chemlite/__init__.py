@@ -1,7 +1,54 @@
-from chemlite.Pathway import Pathway
-from chemlite.Reaction import Reaction
-from chemlite.Compound import Compound
-from chemlite.Object import Object
+from importlib import import_module
+from sys import modules
+from types import ModuleType
+
 from chemlite._version import __version__
 
-__all__ = ["Pathway", "Reaction", "Compound", "Object", __version__]
+# Submodules (and their dependencies, e.g. brs_utils) are only imported
+# when one of their objects is first accessed (PEP 562)
+_LAZY = {
+    "Pathway": "chemlite.Pathway",
+    "Reaction": "chemlite.Reaction",
+    "Compound": "chemlite.Compound",
+    "Object": "chemlite.Object",
+    "CompoundIndex": "chemlite.CompoundIndex",
+    "CompoundRegistry": "chemlite.CompoundRegistry",
+    "FrozenReaction": "chemlite.FrozenReaction",
+    "PathwayIndex": "chemlite.PathwayIndex",
+    "PathwayLSH": "chemlite.PathwayLSH",
+    "ReactionStore": "chemlite.ReactionStore",
+    "SQLiteStore": "chemlite.SQLiteStore",
+    "ThermoCache": "chemlite.ThermoCache",
+    "ThermoStore": "chemlite.ThermoStore",
+    "set_performance_mode": "chemlite.settings",
+    "is_performance_mode": "chemlite.settings",
+}
+
+__all__ = [*_LAZY, "__version__"]
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+class _Package(ModuleType):
+    """Keeps classes exported by the package (e.g. chemlite.Reaction)
+    from being shadowed by their homonymous submodule when it is imported."""
+
+    def __setattr__(self, name: str, value) -> None:
+        if isinstance(value, ModuleType) and _LAZY.get(name) == value.__name__:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+modules[__name__].__class__ = _Package
@@ -0,0 +1,144 @@
+"""Concurrent loading of pathways from JSON files."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import AsyncIterator, Dict, Iterable, Union
+from asyncio import get_running_loop
+from collections import deque
+from concurrent.futures import Executor
+from json import loads as json_loads
+from logging import Logger, getLogger
+from os import PathLike, fspath
+from os.path import basename, splitext
+
+from chemlite.Pathway import Pathway
+
+
+def read_pathway(path: Union[str, PathLike]) -> Dict:
+    """Read and decode a JSON pathway file, as written by
+    serializer.dump_pathway() or json.dump(Pathway._to_dict())
+
+    Parameters
+    ----------
+    path: Union[str, PathLike]
+        Path of the file
+
+    Returns
+    -------
+    pathway: Dict
+        Dictionary of the pathway
+    """
+    with open(path, "rb") as fp:
+        return json_loads(fp.read())
+
+
+def load_pathway(
+    path: Union[str, PathLike], logger: Logger = getLogger(__name__)
+) -> Pathway:
+    """Load a pathway from a JSON file. The ID of the pathway is
+    the one in the file if any, the file name without extension otherwise
+
+    Parameters
+    ----------
+    path: Union[str, PathLike]
+        Path of the file
+    logger: Logger
+        The logger object
+
+    Returns
+    -------
+    pathway: Pathway
+        The pathway
+    """
+    return _build_pathway(path, read_pathway(path), logger)
+
+
+async def aload_pathways(
+    paths: Iterable[Union[str, PathLike]],
+    concurrency: int = 16,
+    executor: Executor = None,
+    logger: Logger = getLogger(__name__),
+) -> AsyncIterator[Pathway]:
+    """Load pathways from JSON files concurrently. Files are read and
+    decoded in 'executor' while at most 'concurrency' files are in flight,
+    pathways (and their reactions and compounds) are built in the calling
+    thread and yielded in the order of 'paths'.
+
+    Parameters
+    ----------
+    paths: Iterable[Union[str, PathLike]]
+        Paths of the files, consumed as pathways are loaded
+    concurrency: int
+        Maximum number of files read or decoded at the same time
+    executor: Executor
+        Executor to read and decode files in (e.g. a ProcessPoolExecutor
+        for CPU-bound decoding), the default executor of the loop if None
+    logger: Logger
+        The logger object
+
+    Returns
+    -------
+    pathways: AsyncIterator[Pathway]
+        Loaded pathways
+
+    Example
+    -------
+    async for pathway in aload_pathways(paths, concurrency=32):
+        ...
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    loop = get_running_loop()
+    paths = iter(paths)
+    pending = deque()
+
+    def submit() -> None:
+        while len(pending) < concurrency:
+            try:
+                path = next(paths)
+            except StopIteration:
+                return
+            pending.append((path, loop.run_in_executor(executor, read_pathway, path)))
+
+    try:
+        submit()
+        while pending:
+            path, future = pending.popleft()
+            pathway = await future
+            submit()
+            yield _build_pathway(path, pathway, logger)
+    finally:
+        # the consumer stopped early or loading failed
+        for _, future in pending:
+            future.cancel()
+
+
+def _build_pathway(
+    path: Union[str, PathLike], pathway: Dict, logger: Logger
+) -> Pathway:
+    logger.debug("Build pathway from %s", path)
+    return Pathway.from_dict(
+        pathway, id=splitext(basename(fspath(path)))[0], logger=logger
+    )
@@ -0,0 +1,311 @@
+"""Memory accounting of chemlite objects."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Dict, List, Set
+from collections import Counter
+from inspect import getmembers, getsourcelines, isfunction
+from linecache import getline
+from logging import Logger
+from os import path as os_path
+from sys import getsizeof
+import tracemalloc
+
+from brs_utils import Cache
+from chemlite.Object import Object
+
+# Component reported for each (private) attribute of chemlite objects
+COMPONENTS = {
+    "id": "ids",
+    "target_id": "ids",
+    "smiles": "smiles",
+    "inchi": "inchi",
+    "inchikey": "inchikey",
+    "formula": "formula",
+    "name": "name",
+    "ec_numbers": "ec_numbers",
+    "reactants": "stoichiometry",
+    "products": "stoichiometry",
+    "reactions": "reactions",
+    "logger": "logger",
+}
+
+PACKAGE_DIR = os_path.dirname(os_path.realpath(__file__))
+
+
+def deep_sizeof(obj: object, seen: Set[int] = None) -> int:
+    """Returns the size in bytes of an object and of all objects it refers to
+    through containers and attributes. Objects whose id() is in 'seen' are
+    not counted, so that objects shared by several owners are counted once.
+
+    Loggers are counted shallowly since they are shared by the whole process.
+
+    Parameters
+    ----------
+    obj: object
+        Object to measure
+    seen: Set[int]
+        id() of objects already counted, updated in place
+
+    Returns
+    -------
+    size: int
+        Size in bytes
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += getsizeof(o)
+        if isinstance(o, Logger):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            stack.append(vars(o))
+    return size
+
+
+def memory_footprint(obj: Object, seen: Set[int] = None) -> Dict[str, int]:
+    """Returns the deep memory footprint in bytes of a Compound, a Reaction or
+    a Pathway broken down by component (ids, smiles, stoichiometry, logger...).
+    The 'object' component stands for instances and their attributes dict,
+    'total' is the sum of all components.
+    Reactions of a Pathway are included, compounds (owned by the cache) are not.
+
+    Parameters
+    ----------
+    obj: Object
+        Object to measure
+    seen: Set[int]
+        id() of objects already counted, updated in place
+
+    Returns
+    -------
+    footprint: Dict[str, int]
+        Size in bytes of each component
+    """
+    if seen is None:
+        seen = set()
+    footprint = {}
+    _add_footprint(obj, footprint, seen)
+    footprint["total"] = sum(footprint.values())
+    return footprint
+
+
+def _add_footprint(obj: Object, footprint: Dict[str, int], seen: Set[int]) -> None:
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    attrs = vars(obj)
+    seen.add(id(attrs))
+    footprint["object"] = footprint.get("object", 0) + getsizeof(obj) + getsizeof(attrs)
+    for attr, value in attrs.items():
+        # private attributes are mangled, e.g. '_Compound__smiles'
+        component = COMPONENTS.get(attr.rsplit("__", 1)[-1], "other")
+        if component == "reactions":
+            if id(value) not in seen:
+                seen.add(id(value))
+                footprint[component] = footprint.get(component, 0) + getsizeof(value)
+                for rxn_id, rxn in value.items():
+                    footprint["ids"] = footprint.get("ids", 0) + deep_sizeof(
+                        rxn_id, seen
+                    )
+                    _add_footprint(rxn, footprint, seen)
+        else:
+            footprint[component] = footprint.get(component, 0) + deep_sizeof(
+                value, seen
+            )
+
+
+def registry_footprint() -> Dict[str, int]:
+    """Returns the deep memory footprint in bytes of all compounds stored in
+    the cache, broken down by component (see memory_footprint()).
+    The 'registry' component stands for the IDs the compounds are stored under.
+
+    Returns
+    -------
+    footprint: Dict[str, int]
+        Size in bytes of each component, with the number of compounds
+        under the 'nb_compounds' key
+    """
+    seen = set()
+    footprint = {}
+    ids = Cache.get_list_of_objects()
+    # the cache keeps IDs as dict keys, the list itself is only temporary
+    footprint["registry"] = sum(deep_sizeof(cmpd_id, seen) for cmpd_id in ids)
+    for cmpd_id in ids:
+        _add_footprint(Cache.get(cmpd_id), footprint, seen)
+    footprint["total"] = sum(footprint.values())
+    footprint["nb_compounds"] = len(ids)
+    return footprint
+
+
+class AllocationProfiler:
+    """Context manager tracing memory allocations with tracemalloc and
+    attributing them to the chemlite call sites they come from, e.g.
+    the dicts built by Reaction.get_reactants() or the copies made
+    by Reaction._to_dict().
+
+    Only allocations still alive when the context exits are attributed,
+    so results of the profiled calls have to be kept to be accounted for.
+
+    Example:
+        with AllocationProfiler() as profiler:
+            dicts = [rxn._to_dict() for rxn in reactions]
+        for site in profiler.report(top=5):
+            print(site)
+    """
+
+    def __init__(self, nframes: int = 10):
+        """
+        Parameters
+        ----------
+        nframes: int
+            Number of frames stored per allocation traceback
+        """
+        self.__nframes = nframes
+        self.__traces = None
+        self.__peak = 0
+        self.__was_tracing = False
+        # traces alive when entering the context if already tracing
+        self.__baseline = None
+        self.__traced = 0
+
+    def __enter__(self) -> "AllocationProfiler":
+        self.__was_tracing = tracemalloc.is_tracing()
+        if self.__was_tracing:
+            # traces of the caller are kept, allocations made within the
+            # context are told apart from them on exit
+            self.__baseline = tracemalloc.take_snapshot()
+        else:
+            tracemalloc.start(self.__nframes)
+            self.__baseline = None
+        self.__traced = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc) -> None:
+        traces = tracemalloc.take_snapshot().traces
+        self.__peak = tracemalloc.get_traced_memory()[1] - self.__traced
+        if not self.__was_tracing:
+            tracemalloc.stop()
+            self.__traces = list(traces)
+        else:
+            before = Counter(self.__baseline.traces)
+            self.__baseline = None
+            self.__traces = []
+            for trace in traces:
+                if before[trace] > 0:
+                    before[trace] -= 1
+                else:
+                    self.__traces.append(trace)
+
+    def get_peak(self) -> int:
+        """Returns the peak of traced memory in bytes within the context,
+        over the memory traced when entering it. If tracemalloc was already
+        tracing, the peak may be the one of the caller, before the context."""
+        return max(self.__peak, 0)
+
+    def report(self, top: int = None) -> List[Dict]:
+        """Returns allocations alive at the end of the context grouped by
+        the innermost chemlite call site they come from, biggest first
+
+        Parameters
+        ----------
+        top: int
+            Number of call sites to return (default: all)
+
+        Returns
+        -------
+        sites: List[Dict]
+            For each call site: 'site' (file:line), 'function', 'line'
+            (source code), 'size' (bytes) and 'count' (nb of blocks)
+        """
+        if self.__traces is None:
+            return []
+        sites = {}
+        realpaths = {}
+        for trace in self.__traces:
+            # frames are sorted from the oldest to the most recent
+            for frame in reversed(trace.traceback):
+                if frame.filename not in realpaths:
+                    realpaths[frame.filename] = os_path.realpath(frame.filename)
+                filename = realpaths[frame.filename]
+                if filename.startswith(PACKAGE_DIR):
+                    key = (filename, frame.lineno)
+                    size, count = sites.get(key, (0, 0))
+                    sites[key] = (size + trace.size, count + 1)
+                    break
+        report = [
+            {
+                "site": f"{os_path.relpath(filename, os_path.dirname(PACKAGE_DIR))}:{lineno}",
+                "function": _function_at(filename, lineno),
+                "line": getline(filename, lineno).strip(),
+                "size": size,
+                "count": count,
+            }
+            for (filename, lineno), (size, count) in sites.items()
+        ]
+        report.sort(key=lambda site: site["size"], reverse=True)
+        return report[:top]
+
+
+_FUNCTIONS = None
+
+
+def _function_at(filename: str, lineno: int) -> str:
+    """Returns the qualified name of the chemlite function defined
+    in 'filename' around line 'lineno', None if not found"""
+    global _FUNCTIONS
+    if _FUNCTIONS is None:
+        from chemlite import Compound, Object, Pathway, Reaction
+
+        _FUNCTIONS = []
+        for cls in (Compound, Object, Pathway, Reaction):
+            for _, func in getmembers(cls, isfunction):
+                try:
+                    lines, start = getsourcelines(func)
+                except (OSError, TypeError):
+                    continue
+                _FUNCTIONS.append(
+                    (
+                        os_path.realpath(func.__code__.co_filename),
+                        start,
+                        start + len(lines),
+                        func.__qualname__,
+                    )
+                )
+    for func_file, start, end, name in _FUNCTIONS:
+        if func_file == filename and start <= lineno < end:
+            return name
+    return None
@@ -0,0 +1,186 @@
+"""Merging of compounds with the same structure."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Callable, Dict, Iterable, List, Tuple
+from logging import Logger, getLogger
+
+from brs_utils import Cache
+from chemlite.Compound import Compound
+from chemlite.CompoundIndex import CompoundIndex
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+# Fields the representative is completed with from merged compounds
+FIELDS = ["name", "smiles", "inchi", "inchikey", "formula"]
+
+
+def group_compounds(
+    compounds: Iterable[Compound] = None, relaxed: bool = False
+) -> List[List[Compound]]:
+    """Group compounds by InChIKey, or by first block of InChIKey
+    (connectivity) in relaxed mode. Compounds without InChIKey and
+    groups of a single compound are left out.
+
+    Parameters
+    ----------
+    compounds: Iterable[Compound]
+        Compounds to group, all compounds built so far if None
+    relaxed: bool
+        If True, group compounds by first block of InChIKey
+
+    Returns
+    -------
+    groups: List[List[Compound]]
+        Groups of at least two compounds, in order of first occurrence
+    """
+    field = "inchikey_prefix" if relaxed else "inchikey"
+    if compounds is None:
+        groups = CompoundIndex.get_groups(field).values()
+    else:
+        by_key: Dict[str, List[Compound]] = {}
+        for compound in compounds:
+            inchikey = compound.get_inchikey()
+            if inchikey:
+                if relaxed:
+                    inchikey = CompoundIndex.inchikey_prefix(inchikey)
+                by_key.setdefault(inchikey, []).append(compound)
+        groups = by_key.values()
+    return [group for group in groups if len(group) > 1]
+
+
+def merge_compounds(
+    reactions: Iterable[Reaction] = (),
+    pathways: Iterable[Pathway] = (),
+    compounds: Iterable[Compound] = None,
+    relaxed: bool = False,
+    choose: Callable[[List[Compound]], Compound] = None,
+    remove: bool = True,
+    logger: Logger = getLogger(__name__),
+) -> Dict[str, str]:
+    """Merge compounds with the same structure (see group_compounds())
+    into a representative and rewrite species of reactions, either given
+    or in pathways, and targets of pathways accordingly. Coefficients of
+    merged species on the same side of a reaction are summed.
+
+    Parameters
+    ----------
+    reactions: Iterable[Reaction]
+        Reactions to rewrite in place, TypeError is raised before anything
+        is modified if one of them is frozen
+    pathways: Iterable[Pathway]
+        Pathways to rewrite (target and reactions, replaced by rewritten
+        copies, see Pathway.edit_reaction())
+    compounds: Iterable[Compound]
+        Compounds to merge, all compounds built so far if None
+    relaxed: bool
+        If True, merge compounds with the same first block of InChIKey
+    choose: Callable[[List[Compound]], Compound]
+        Returns the representative of a group of compounds,
+        the first compound built if None
+    remove: bool
+        If True, merged compounds (but representatives) are removed
+        from the cache and indexes
+    logger: Logger
+        The logger object
+
+    Returns
+    -------
+    mapping: Dict[str, str]
+        ID of each merged compound -> ID of its representative
+    """
+    mapping: Dict[str, str] = {}
+    # (merged compound, representative)
+    merged: List[Tuple[Compound, Compound]] = []
+    for group in group_compounds(compounds, relaxed):
+        representative = group[0] if choose is None else choose(group)
+        for compound in group:
+            if compound is not representative:
+                mapping[compound.get_id()] = representative.get_id()
+                merged.append((compound, representative))
+    # reactions given several times are rewritten once
+    reactions = list({id(rxn): rxn for rxn in reactions}.values())
+    # checked before anything is modified (reactions of pathways are
+    # replaced by copies if frozen)
+    for rxn in reactions:
+        if rxn.is_frozen() and _has_species(rxn, mapping):
+            raise TypeError(
+                f"Reaction {rxn.get_id()} is frozen, merge compounds "
+                "in its pathway or in a copy of it"
+            )
+
+    for compound, representative in merged:
+        # complete the representative with what it lacks
+        for field in FIELDS:
+            value = getattr(compound, f"get_{field}")()
+            if value and not getattr(representative, f"get_{field}")():
+                getattr(representative, f"set_{field}")(value)
+
+    nb_rxns = 0
+    if mapping:
+        for rxn in reactions:
+            if _has_species(rxn, mapping):
+                _rewrite_reaction(rxn, mapping)
+                nb_rxns += 1
+        # reactions of pathways may be shared (e.g. with copies of the
+        # pathway), they are replaced by rewritten copies
+        for pathway in pathways:
+            target_id = pathway.get_target_id()
+            if target_id in mapping:
+                pathway.set_target_id(mapping[target_id])
+            for rxn_id, rxn in list(pathway.get_reactions().items()):
+                if _has_species(rxn, mapping):
+                    _rewrite_reaction(pathway.edit_reaction(rxn_id), mapping)
+                    nb_rxns += 1
+
+    # removed once reactions are rewritten, copies of frozen reactions
+    # would register them again otherwise
+    if remove:
+        for compound, _ in merged:
+            CompoundIndex.remove_compound(compound)
+            if Cache.get(compound.get_id()) is compound:
+                Cache.remove_object_by_id(compound.get_id())
+
+    logger.debug(
+        "%s compound(s) merged, %s reaction(s) rewritten", len(mapping), nb_rxns
+    )
+    return mapping
+
+
+def _rewrite_side(species: Iterable, mapping: Dict[str, str]) -> Dict:
+    rewritten: Dict[str, int] = {}
+    for spe_id, spe_sto in species:
+        spe_id = mapping.get(spe_id, spe_id)
+        rewritten[spe_id] = rewritten.get(spe_id, 0) + spe_sto
+    return rewritten
+
+
+def _has_species(rxn: Reaction, mapping: Dict[str, str]) -> bool:
+    return any(spe_id in mapping for spe_id in rxn.get_species_set())
+
+
+def _rewrite_reaction(rxn: Reaction, mapping: Dict[str, str]) -> None:
+    rxn.set_reactants(_rewrite_side(rxn.iter_reactants(), mapping))
+    rxn.set_products(_rewrite_side(rxn.iter_products(), mapping))
@@ -0,0 +1,225 @@
+"""Optional instrumentation of chemlite hot operations."""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Callable, Dict, List, Tuple
+from functools import wraps
+from time import perf_counter
+
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+
+class Metrics:
+    """Counters and timers of chemlite hot operations.
+
+    Instrumentation is done by wrapping methods when enabled and restoring
+    the original ones when disabled, so that it costs nothing when disabled.
+
+    Example:
+        Metrics.enable()
+        ...
+        print(Metrics.summary())
+        print(Metrics.to_prometheus())
+        Metrics.disable()
+    """
+
+    # (class, attribute) of timed operations
+    OPERATIONS: List[Tuple[type, str]] = [
+        (Reaction, "parse"),
+        (Reaction, "get_smiles"),
+        (Reaction, "_to_dict"),
+        (Pathway, "_to_dict"),
+        (Pathway, "__eq__"),
+        (Pathway, "net_reaction"),
+    ]
+
+    __enabled = False
+    __originals: Dict[Tuple[type, str], object] = {}
+    # operation -> [nb of calls, total time, max time]
+    __timers: Dict[str, List] = {}
+    # counter name -> value
+    __counters: Dict[str, int] = {}
+
+    @staticmethod
+    def enable() -> None:
+        """Instrument hot operations. Does nothing if already enabled."""
+        if Metrics.__enabled:
+            return
+        for cls, attr in Metrics.OPERATIONS:
+            Metrics.__patch(cls, attr, Metrics.__timed(f"{cls.__name__}.{attr}"))
+        Metrics.__patch(Reaction, "_register_species", Metrics.__count_lookups)
+        Metrics.__enabled = True
+
+    @staticmethod
+    def disable() -> None:
+        """Restore original (non instrumented) operations.
+        Collected metrics are kept until reset() is called."""
+        for (cls, attr), original in Metrics.__originals.items():
+            setattr(cls, attr, original)
+        Metrics.__originals = {}
+        Metrics.__enabled = False
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Returns True if operations are instrumented, False otherwise"""
+        return Metrics.__enabled
+
+    @staticmethod
+    def reset() -> None:
+        """Reset all counters and timers"""
+        Metrics.__timers = {}
+        Metrics.__counters = {}
+
+    @staticmethod
+    def incr(name: str, value: int = 1) -> None:
+        """Increment the counter 'name' by 'value'
+
+        Parameters
+        ----------
+        name: str
+            Name of the counter
+        value: int
+            Value to add to the counter
+        """
+        Metrics.__counters[name] = Metrics.__counters.get(name, 0) + value
+
+    @staticmethod
+    def get_counters() -> Dict[str, int]:
+        """Returns the counters
+
+        Returns
+        -------
+        counters: Dict[str, int]
+            Value of each counter
+        """
+        return dict(Metrics.__counters)
+
+    @staticmethod
+    def get_timers() -> Dict[str, Dict[str, float]]:
+        """Returns the timers of instrumented operations
+
+        Returns
+        -------
+        timers: Dict[str, Dict[str, float]]
+            For each operation: nb of 'calls', 'total' and 'max' time (in seconds)
+        """
+        return {
+            op: {"calls": calls, "total": total, "max": max_time}
+            for op, (calls, total, max_time) in Metrics.__timers.items()
+        }
+
+    @staticmethod
+    def summary() -> str:
+        """Returns a human readable summary of metrics
+
+        Returns
+        -------
+        summary: str
+            Table of timers followed by counters
+        """
+        lines = [f"{'operation':<24}{'calls':>10}{'total (s)':>14}{'mean (us)':>12}"]
+        for op, timer in sorted(Metrics.get_timers().items()):
+            mean = timer["total"] / timer["calls"] * 1e6 if timer["calls"] else 0
+            lines.append(
+                f"{op:<24}{timer['calls']:>10}{timer['total']:>14.6f}{mean:>12.2f}"
+            )
+        for name, value in sorted(Metrics.__counters.items()):
+            lines.append(f"{name:<24}{value:>10}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def to_prometheus(prefix: str = "chemlite") -> str:
+        """Returns metrics in Prometheus text exposition format
+
+        Parameters
+        ----------
+        prefix: str
+            Prefix of metrics names
+
+        Returns
+        -------
+        text: str
+            Metrics in Prometheus text format
+        """
+        timers = sorted(Metrics.get_timers().items())
+        lines = []
+        for metric, key, kind, descr in [
+            ("calls_total", "calls", "counter", "Number of calls"),
+            ("duration_seconds_total", "total", "counter", "Total time spent"),
+            ("duration_seconds_max", "max", "gauge", "Longest call"),
+        ]:
+            lines.append(f"# HELP {prefix}_{metric} {descr} per operation")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            for op, timer in timers:
+                lines.append(f'{prefix}_{metric}{{operation="{op}"}} {timer[key]}')
+        for name, value in sorted(Metrics.__counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __patch(cls: type, attr: str, wrapper: Callable) -> None:
+        original = cls.__dict__[attr]
+        Metrics.__originals[(cls, attr)] = original
+        if isinstance(original, staticmethod):
+            setattr(cls, attr, staticmethod(wrapper(original.__func__)))
+        else:
+            setattr(cls, attr, wrapper(original))
+
+    @staticmethod
+    def __timed(op: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    elapsed = perf_counter() - start
+                    timer = Metrics.__timers.get(op)
+                    if timer is None:
+                        Metrics.__timers[op] = [1, elapsed, elapsed]
+                    else:
+                        timer[0] += 1
+                        timer[1] += elapsed
+                        if elapsed > timer[2]:
+                            timer[2] = elapsed
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def __count_lookups(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(cmpd_id: str) -> bool:
+            added = func(cmpd_id)
+            Metrics.incr("registry_lookups")
+            if added:
+                Metrics.incr("registry_misses")
+            return added
+
+        return wrapper
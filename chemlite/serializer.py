@@ -0,0 +1,406 @@
+"""Direct serialization of pathways and reactions (JSON, reaction SMILES).
+
+Pathways and reactions are written straight to text or bytes streams,
+without building their _to_dict() representation nor copying stoichiometric
+dictionaries. Output decodes to the same content as _to_dict(), with keys of
+stoichiometric dictionaries and species sorted.
+
+If orjson is installed, it is used to encode pathways (use_orjson=None, the
+default). Both encoders write the same output: compact (no spaces), UTF-8
+(non-ASCII characters not escaped), and null for NaN and infinite numbers.
+
+Reaction SMILES of large sets of reactions are written in a stream,
+resolving each compound once and reporting warnings in a single message.
+"""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import IO, Dict, Iterable, Iterator, List, Tuple, Union
+from io import BufferedIOBase, RawIOBase
+from logging import Logger, getLogger
+from json import dumps as json_dumps
+from json.encoder import encode_basestring as encode_str
+from math import isfinite
+
+from brs_utils import Cache
+from chemlite.Compound import Compound
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps_pathway(pathway: Pathway, full: bool = False, use_orjson: bool = None) -> str:
+    """Returns the JSON representation of a pathway
+
+    Parameters
+    ----------
+    pathway: Pathway
+        Pathway to serialize
+    full: bool
+        Include the ID of the pathway (as Pathway._to_dict(full=True))
+    use_orjson: bool
+        Use orjson (default: if installed), output is the same
+
+    Returns
+    -------
+    json: str
+        JSON string of the pathway
+    """
+    if _use_orjson(use_orjson):
+        return _orjson_dumps(pathway, full).decode()
+    return "".join(_pathway_chunks(pathway, full))
+
+
+def dump_pathway(
+    pathway: Pathway, fp: IO, full: bool = False, use_orjson: bool = None
+) -> None:
+    """Writes the JSON representation of a pathway into a text or bytes stream
+
+    Parameters
+    ----------
+    pathway: Pathway
+        Pathway to serialize
+    fp: IO
+        Text or bytes stream to write into
+    full: bool
+        Include the ID of the pathway (as Pathway._to_dict(full=True))
+    use_orjson: bool
+        Use orjson (default: if installed), output is the same
+    """
+    dump_pathways([pathway], fp, full, use_orjson, sep="")
+
+
+def dump_pathways(
+    pathways: Iterable[Pathway],
+    fp: IO,
+    full: bool = False,
+    use_orjson: bool = None,
+    sep: str = "\n",
+) -> int:
+    """Writes pathways into a text or bytes stream, one JSON document
+    per pathway followed by 'sep' (JSON Lines by default)
+
+    Parameters
+    ----------
+    pathways: Iterable[Pathway]
+        Pathways to serialize
+    fp: IO
+        Text or bytes stream to write into
+    full: bool
+        Include the ID of pathways (as Pathway._to_dict(full=True))
+    use_orjson: bool
+        Use orjson (default: if installed), output is the same
+    sep: str
+        Separator written after each pathway
+
+    Returns
+    -------
+    nb: int
+        Number of pathways written
+    """
+    binary = isinstance(fp, (RawIOBase, BufferedIOBase))
+    fast = _use_orjson(use_orjson)
+    nb = 0
+    for pathway in pathways:
+        if fast:
+            chunk = _orjson_dumps(pathway, full)
+            fp.write(chunk + sep.encode() if binary else chunk.decode() + sep)
+        else:
+            chunk = "".join(_pathway_chunks(pathway, full)) + sep
+            fp.write(chunk.encode() if binary else chunk)
+        nb += 1
+    return nb
+
+
+def dumps_reaction(rxn: Reaction, full: bool = False) -> str:
+    """Returns the JSON representation of a reaction
+
+    Parameters
+    ----------
+    rxn: Reaction
+        Reaction to serialize
+    full: bool
+        Include the ID and EC numbers (as Reaction._to_dict(full=True))
+
+    Returns
+    -------
+    json: str
+        JSON string of the reaction
+    """
+    return "".join(_reaction_chunks(rxn, full))
+
+
+def iter_reactions_smiles(
+    reactions: Iterable[Reaction], report: Dict = None
+) -> Iterator[Tuple[str, str]]:
+    """Iterates over reaction SMILES of reactions. Each compound is resolved
+    once and stoichiometric coefficients are rounded as in
+    Reaction.get_smiles(), but no warning is emitted: species without SMILES
+    and rounded coefficients are counted in 'report' instead.
+
+    Parameters
+    ----------
+    reactions: Iterable[Reaction]
+        Reactions to build SMILES of
+    report: Dict
+        If given, updated in place with the number of 'reactions', and for
+        each species ID the number of reactions where it has been found
+        without SMILES ('missing_smiles') or with a rounded coefficient
+        ('rounded')
+
+    Returns
+    -------
+    smiles: Iterator[Tuple[str, str]]
+        Iterator over (reaction ID, reaction SMILES)
+    """
+    if report is None:
+        report = {}
+    report.setdefault("reactions", 0)
+    missing = report.setdefault("missing_smiles", {})
+    rounded = report.setdefault("rounded", {})
+    # species ID -> SMILES ('' if not available)
+    smiles = {}
+
+    def side_smiles(species: Iterable) -> str:
+        smi = []
+        for spe_id, spe_sto in species:
+            spe_smi = smiles.get(spe_id)
+            if spe_smi is None:
+                compound = Cache.get(spe_id)
+                spe_smi = "" if compound is None else compound.get_smiles() or ""
+                smiles[spe_id] = spe_smi
+            if not spe_smi:
+                missing[spe_id] = missing.get(spe_id, 0) + 1
+                continue
+            _spe_sto = Reaction.round_stoichio(spe_sto)
+            if _spe_sto != spe_sto:
+                rounded[spe_id] = rounded.get(spe_id, 0) + 1
+            smi.extend([spe_smi] * _spe_sto)
+        return ".".join(smi)
+
+    for rxn in reactions:
+        report["reactions"] += 1
+        yield (
+            rxn.get_id(),
+            side_smiles(sorted(rxn.iter_reactants()))
+            + ">>"
+            + side_smiles(sorted(rxn.iter_products())),
+        )
+
+
+def dump_reactions_smiles(
+    reactions: Iterable[Reaction],
+    fp: IO,
+    with_ids: bool = True,
+    sep: str = "\t",
+    logger: Logger = getLogger(__name__),
+) -> Dict:
+    """Writes reaction SMILES of reactions into a text or bytes stream,
+    one reaction per line, and logs a single aggregated warning about
+    species without SMILES and rounded coefficients
+    (see iter_reactions_smiles()).
+
+    Parameters
+    ----------
+    reactions: Iterable[Reaction]
+        Reactions to write SMILES of
+    fp: IO
+        Text or bytes stream to write into
+    with_ids: bool
+        Write the reaction ID before its SMILES
+    sep: str
+        Separator between reaction ID and SMILES
+    logger: Logger
+        The logger object
+
+    Returns
+    -------
+    report: Dict
+        Number of 'reactions' written, and number of reactions where each
+        species has been found without SMILES ('missing_smiles') or with
+        a rounded coefficient ('rounded')
+    """
+    binary = isinstance(fp, (RawIOBase, BufferedIOBase))
+    report = {}
+    for rxn_id, smiles in iter_reactions_smiles(reactions, report):
+        line = f"{rxn_id}{sep}{smiles}\n" if with_ids else f"{smiles}\n"
+        fp.write(line.encode() if binary else line)
+    if report["missing_smiles"] or report["rounded"]:
+        logger.warning(
+            "Reaction SMILES of %s reaction(s): %s species without SMILES (%s), "
+            "coefficients of %s species rounded (%s)",
+            report["reactions"],
+            len(report["missing_smiles"]),
+            ", ".join(sorted(report["missing_smiles"])[:10]),
+            len(report["rounded"]),
+            ", ".join(sorted(report["rounded"])[:10]),
+        )
+    return report
+
+
+def _use_orjson(use_orjson: bool) -> bool:
+    if use_orjson is None:
+        return orjson is not None
+    if use_orjson and orjson is None:
+        raise ImportError("orjson is not installed")
+    return use_orjson
+
+
+def _value(value) -> str:
+    """JSON representation of a scalar, as orjson would write it"""
+    if isinstance(value, str):
+        return encode_str(value)
+    if type(value) is int:
+        return repr(value)
+    if type(value) is float:
+        return _float(value)
+    return json_dumps(value)
+
+
+def _float(value: float) -> str:
+    """JSON representation of a float, as orjson would write it: null if
+    not finite, exponent without '+' or leading zeros (1e16, 1e-7), and
+    decimal notation from 1e-5 (0.000015 rather than 1.5e-05)"""
+    if not isfinite(value):
+        return "null"
+    string = repr(value)
+    if "e" not in string:
+        return string
+    mantissa, exponent = string.split("e")
+    exponent = int(exponent)
+    if exponent == -5:
+        sign = "-" if mantissa.startswith("-") else ""
+        return f"{sign}0.0000{mantissa.lstrip('-').replace('.', '')}"
+    return f"{mantissa}e{exponent}"
+
+
+def _key(key) -> str:
+    """JSON representation of a dict key, as orjson would write it"""
+    return encode_str(key if isinstance(key, str) else json_dumps(key))
+
+
+def _stoichio_chunks(species: Iterable, chunks: List[str]) -> None:
+    chunks.append("{")
+    chunks.append(
+        ",".join(
+            f"{_key(spe_id)}:{_value(spe_sto)}" for spe_id, spe_sto in sorted(species)
+        )
+    )
+    chunks.append("}")
+
+
+def _reaction_chunks(rxn: Reaction, full: bool, chunks: List[str] = None) -> List[str]:
+    if chunks is None:
+        chunks = []
+    chunks.append('{"reactants":')
+    _stoichio_chunks(rxn.iter_reactants(), chunks)
+    chunks.append(',"products":')
+    _stoichio_chunks(rxn.iter_products(), chunks)
+    if full:
+        chunks.append(f',"id":{_value(rxn.get_id())},"ec_numbers":[')
+        chunks.append(",".join(_value(ec) for ec in rxn.get_ec_numbers()))
+        chunks.append("]")
+    chunks.append("}")
+    return chunks
+
+
+def _compound_value(compound: Compound) -> str:
+    if compound is None:
+        return "null"
+    return (
+        f'{{"id":{_value(compound.get_id())},'
+        f'"name":{_value(compound.get_name())},'
+        f'"smiles":{_value(compound.get_smiles())},'
+        f'"inchi":{_value(compound.get_inchi())},'
+        f'"inchikey":{_value(compound.get_inchikey())},'
+        f'"formula":{_value(compound.get_formula())}}}'
+    )
+
+
+def _pathway_chunks(pathway: Pathway, full: bool) -> List[str]:
+    chunks = ['{"reactions":{']
+    species = set()
+    for i, (rxn_id, rxn) in enumerate(pathway.get_reactions().items()):
+        if i:
+            chunks.append(",")
+        chunks.append(f"{_key(rxn_id)}:")
+        _reaction_chunks(rxn, False, chunks)
+        species.update(spe_id for spe_id, _ in rxn.iter_reactants())
+        species.update(spe_id for spe_id, _ in rxn.iter_products())
+    chunks.append('},"species":{')
+    chunks.append(
+        ",".join(
+            f"{_key(spe_id)}:{_compound_value(Cache.get(spe_id))}"
+            for spe_id in sorted(species)
+        )
+    )
+    chunks.append(f'}},"target_id":{_value(pathway.get_target_id())}')
+    if full:
+        chunks.append(f',"id":{_value(pathway.get_id())}')
+    chunks.append("}")
+    return chunks
+
+
+def _orjson_dumps(pathway: Pathway, full: bool) -> bytes:
+    return orjson.dumps(_pathway_obj(pathway, full), option=orjson.OPT_NON_STR_KEYS)
+
+
+def _pathway_obj(pathway: Pathway, full: bool) -> dict:
+    """Lightweight (shallow, no copy of compounds) structure for orjson"""
+    reactions = {}
+    species = set()
+    for rxn_id, rxn in pathway.get_reactions().items():
+        reactants = dict(sorted(rxn.iter_reactants()))
+        products = dict(sorted(rxn.iter_products()))
+        reactions[rxn_id] = {"reactants": reactants, "products": products}
+        species.update(reactants)
+        species.update(products)
+    obj = {
+        "reactions": reactions,
+        "species": {
+            spe_id: _compound_obj(Cache.get(spe_id)) for spe_id in sorted(species)
+        },
+        "target_id": pathway.get_target_id(),
+    }
+    if full:
+        obj["id"] = pathway.get_id()
+    return obj
+
+
+def _compound_obj(compound: Compound) -> Union[dict, None]:
+    if compound is None:
+        return None
+    return {
+        "id": compound.get_id(),
+        "name": compound.get_name(),
+        "smiles": compound.get_smiles(),
+        "inchi": compound.get_inchi(),
+        "inchikey": compound.get_inchikey(),
+        "formula": compound.get_formula(),
+    }
@@ -0,0 +1,54 @@
+"""Global settings of chemlite"""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from os import environ
+
+# Performance mode, can be switched on at startup with CHEMLITE_PERFORMANCE_MODE=1
+_performance_mode = environ.get("CHEMLITE_PERFORMANCE_MODE", "") not in (
+    "",
+    "0",
+    "false",
+    "False",
+)
+
+
+def set_performance_mode(enabled: bool) -> None:
+    """Switch the performance mode on or off. In performance mode,
+    per-call warnings of hot operations (e.g. missing SMILES or rounded
+    stoichiometric coefficients in Reaction.get_smiles()) are not emitted.
+
+    Parameters
+    ----------
+    enabled: bool
+        True to switch the performance mode on, False to switch it off
+    """
+    global _performance_mode
+    _performance_mode = bool(enabled)
+
+
+def is_performance_mode() -> bool:
+    """Returns True if the performance mode is on, False otherwise"""
+    return _performance_mode
@@ -0,0 +1,339 @@
+"""Hash-based partitioning of pathways and reactions into shards.
+
+Pathways (or reactions) are split into N JSON Lines files by a stable hash
+of a key, so that workers can process shards independently and results
+can be merged deterministically. From the command line:
+
+    python -m chemlite.shard split --shards 8 --output-dir shards pathways.jsonl
+    python -m chemlite.shard merge --output results.jsonl results/*.jsonl
+"""
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2018 Institute for Molecular Systems Biology, ETH Zurich.
+# Copyright (c) 2019 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import IO, Dict, Iterable, List, Tuple, Union
+from argparse import ArgumentParser
+from contextlib import ExitStack
+from hashlib import blake2b
+from json import dumps as json_dumps, loads as json_loads
+from os import PathLike, makedirs, path as os_path
+from sys import exit as sys_exit
+
+from chemlite.Pathway import Pathway
+from chemlite.Reaction import Reaction
+from chemlite.serializer import dump_pathways, dumps_reaction
+
+# Keys pathways can be sharded by
+BY = ["target", "key"]
+
+
+def get_shard(key: str, nb_shards: int) -> int:
+    """Returns the shard of a key, the same from one process,
+    machine or Python version to another (BLAKE2b rather than hash())
+
+    Parameters
+    ----------
+    key: str
+        Key to shard
+    nb_shards: int
+        Number of shards
+
+    Returns
+    -------
+    shard: int
+        Shard number, in [0, nb_shards)
+    """
+    digest = blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % nb_shards
+
+
+def get_shard_path(directory: Union[str, PathLike], shard: int, nb_shards: int) -> str:
+    """Returns the path of a shard file in 'directory'"""
+    return os_path.join(directory, f"shard-{shard:05d}-of-{nb_shards:05d}.jsonl")
+
+
+def get_pathway_key(pathway: Union[Pathway, Dict], by: str = "target") -> str:
+    """Returns the key a pathway is sharded by
+
+    Parameters
+    ----------
+    pathway: Union[Pathway, Dict]
+        Pathway, or its dictionary (see Pathway._to_dict())
+    by: str
+        'target' for the target ID (pathways with the same target are in
+        the same shard), 'key' for the canonical key of the pathway, i.e.
+        its target and the canonical keys of its reactions
+
+    Returns
+    -------
+    key: str
+        Key of the pathway
+    """
+    if by not in BY:
+        raise ValueError(f"Unknown shard key '{by}', expected one of {BY}")
+    if isinstance(pathway, Pathway):
+        target_id = pathway.get_target_id()
+    else:
+        target_id = pathway.get("target_id")
+    if by == "target":
+        return json_dumps(target_id)
+    if isinstance(pathway, Pathway):
+        reactions = pathway.get_list_of_reactions()
+    else:
+        reactions = pathway["reactions"].values()
+    keys = sorted(get_reaction_key(rxn) for rxn in reactions)
+    return json_dumps([target_id, keys], separators=(",", ":"))
+
+
+def get_reaction_key(rxn: Union[Reaction, Dict]) -> str:
+    """Returns the key a reaction is sharded by, its canonical key
+    (see Reaction.key_to_string(), 1 and 1.0 coefficients give the same key)
+
+    Parameters
+    ----------
+    rxn: Union[Reaction, Dict]
+        Reaction, or its dictionary (see Reaction._to_dict())
+
+    Returns
+    -------
+    key: str
+        Key of the reaction
+    """
+    if isinstance(rxn, Reaction):
+        return rxn.get_string_key()
+    return Reaction.key_to_string(_get_reaction_key(rxn))
+
+
+def shard_pathways(
+    pathways: Iterable[Pathway],
+    directory: Union[str, PathLike],
+    nb_shards: int,
+    by: str = "target",
+) -> List[int]:
+    """Writes pathways into 'nb_shards' JSON Lines files in 'directory'
+    (see get_shard_path()), each pathway in the shard of its key
+    (see get_pathway_key()), in order of 'pathways' within a shard
+
+    Parameters
+    ----------
+    pathways: Iterable[Pathway]
+        Pathways to shard
+    directory: Union[str, PathLike]
+        Directory to write shards into, created if needed
+    nb_shards: int
+        Number of shards
+    by: str
+        Key pathways are sharded by, one of shard.BY
+
+    Returns
+    -------
+    counts: List[int]
+        Number of pathways written in each shard
+    """
+    return _shard(
+        ((get_pathway_key(pathway, by), pathway) for pathway in pathways),
+        directory,
+        nb_shards,
+        lambda pathway, fp: dump_pathways([pathway], fp, full=True),
+    )
+
+
+def shard_reactions(
+    reactions: Iterable[Reaction],
+    directory: Union[str, PathLike],
+    nb_shards: int,
+) -> List[int]:
+    """Writes reactions (with their ID and EC numbers) into 'nb_shards'
+    JSON Lines files in 'directory', each reaction in the shard of its
+    canonical key
+
+    Parameters
+    ----------
+    reactions: Iterable[Reaction]
+        Reactions to shard
+    directory: Union[str, PathLike]
+        Directory to write shards into, created if needed
+    nb_shards: int
+        Number of shards
+
+    Returns
+    -------
+    counts: List[int]
+        Number of reactions written in each shard
+    """
+    return _shard(
+        ((get_reaction_key(rxn), rxn) for rxn in reactions),
+        directory,
+        nb_shards,
+        lambda rxn, fp: fp.write(dumps_reaction(rxn, full=True) + "\n"),
+    )
+
+
+def shard_lines(
+    lines: Iterable[str],
+    directory: Union[str, PathLike],
+    nb_shards: int,
+    by: str = "target",
+    reactions: bool = False,
+) -> List[int]:
+    """Same as shard_pathways() (or shard_reactions()) for JSON Lines
+    already serialized, written unchanged without building objects
+
+    Parameters
+    ----------
+    lines: Iterable[str]
+        JSON documents of pathways (or reactions), one per line
+    directory: Union[str, PathLike]
+        Directory to write shards into, created if needed
+    nb_shards: int
+        Number of shards
+    by: str
+        Key pathways are sharded by, one of shard.BY
+    reactions: bool
+        Lines are reactions rather than pathways
+
+    Returns
+    -------
+    counts: List[int]
+        Number of documents written in each shard
+    """
+
+    def keyed() -> Iterable[Tuple[str, str]]:
+        for line in lines:
+            line = line.rstrip("\n")
+            if line:
+                obj = json_loads(line)
+                if reactions:
+                    yield get_reaction_key(obj), line
+                else:
+                    yield get_pathway_key(obj, by), line
+
+    return _shard(keyed(), directory, nb_shards, lambda line, fp: fp.write(line + "\n"))
+
+
+def merge_shards(paths: Iterable[Union[str, PathLike]], fp: IO) -> int:
+    """Concatenates shard files (e.g. results of workers) into 'fp',
+    in order of file names whatever the order of 'paths', so that the
+    result does not depend on the order workers end in
+
+    Parameters
+    ----------
+    paths: Iterable[Union[str, PathLike]]
+        Paths of shard files
+    fp: IO
+        Text stream to write into
+
+    Returns
+    -------
+    nb: int
+        Number of lines written
+    """
+    nb = 0
+    for path in sorted(paths, key=lambda path: os_path.basename(path)):
+        with open(path, "r") as shard:
+            for line in shard:
+                if line.strip():
+                    fp.write(line if line.endswith("\n") else line + "\n")
+                    nb += 1
+    return nb
+
+
+def _get_reaction_key(rxn: Dict) -> Tuple:
+    # same as Reaction.get_key(), from a dictionary
+    return (
+        tuple(sorted(rxn.get("reactants", {}).items())),
+        tuple(sorted(rxn.get("products", {}).items())),
+    )
+
+
+def _shard(
+    keyed: Iterable[Tuple[str, object]],
+    directory: Union[str, PathLike],
+    nb_shards: int,
+    write,
+) -> List[int]:
+    if nb_shards < 1:
+        raise ValueError(f"Number of shards must be >= 1, got {nb_shards}")
+    makedirs(directory, exist_ok=True)
+    counts = [0] * nb_shards
+    with ExitStack() as stack:
+        # all shards are written, even empty ones
+        files = [
+            stack.enter_context(open(get_shard_path(directory, i, nb_shards), "w"))
+            for i in range(nb_shards)
+        ]
+        for key, obj in keyed:
+            shard = get_shard(key, nb_shards)
+            write(obj, files[shard])
+            counts[shard] += 1
+    return counts
+
+
+def main(args: List[str] = None) -> int:
+    parser = ArgumentParser(
+        prog="python -m chemlite.shard",
+        description="Split JSON Lines of pathways or reactions into shards "
+        "by a stable hash, or merge shards",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    split = subparsers.add_parser("split", help="split files into shards")
+    split.add_argument("inputs", nargs="+", help="JSON Lines files")
+    split.add_argument("--shards", type=int, required=True, help="number of shards")
+    split.add_argument("--output-dir", required=True)
+    split.add_argument(
+        "--by",
+        choices=BY,
+        default="target",
+        help="shard pathways by target ID or canonical key (default: target)",
+    )
+    split.add_argument("--reactions", action="store_true", help="inputs are reactions")
+    merge = subparsers.add_parser("merge", help="merge shards in a stable order")
+    merge.add_argument("shards", nargs="+", help="shard files")
+    merge.add_argument("--output", required=True)
+    parsed = parser.parse_args(args)
+
+    if parsed.command == "split":
+
+        def lines() -> Iterable[str]:
+            for path in parsed.inputs:
+                with open(path, "r") as fp:
+                    yield from fp
+
+        counts = shard_lines(
+            lines(),
+            parsed.output_dir,
+            parsed.shards,
+            by=parsed.by,
+            reactions=parsed.reactions,
+        )
+        print(f"{sum(counts)} document(s) written into {len(counts)} shard(s)")
+    else:
+        with open(parsed.output, "w") as fp:
+            nb = merge_shards(parsed.shards, fp)
+        print(f"{nb} document(s) merged into {parsed.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys_exit(main())
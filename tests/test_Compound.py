@@ -67,6 +67,19 @@ class Test_Compound(TestCase):
             ),
         )
 
+    def test_hash(self):
+        self.assertEqual(
+            hash(self.compound), hash(Compound.from_dict(self.compound_dict))
+        )
+        self.assertIn(Compound.from_dict(self.compound_dict), {self.compound})
+
+    def test_hash_after_set(self):
+        compound = Compound.from_dict(self.compound_dict)
+        compound.set_smiles("C")
+        self.assertNotEqual(compound, self.compound)
+        compound.set_smiles(self.compound_dict["smiles"])
+        self.assertEqual(hash(compound), hash(self.compound))
+
     def test_eq_wrong_type(self):
         self.assertNotEqual(self.compound, 0)
 
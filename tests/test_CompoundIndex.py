@@ -0,0 +1,98 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+
+from chemlite import Compound, CompoundIndex
+
+
+class Test_CompoundIndex(TestCase):
+
+    def setUp(self):
+        # indexes are global, compounds of other tests are left out
+        CompoundIndex.clear()
+        self.inchikey = "LFQSCWFLJHTTHZ-UHFFFAOYSA-N"
+        self.compound = Compound(
+            id="INDEX_ETHANOL",
+            smiles="CCO",
+            inchikey=self.inchikey,
+            formula="C2H6O",
+            name="ethanol",
+        )
+        self.isomer = Compound(
+            id="INDEX_ETHANOL_ISOMER",
+            inchikey="LFQSCWFLJHTTHZ-UHFFFAOYSA-O",
+            formula="C2H6O",
+        )
+
+    def tearDown(self):
+        CompoundIndex.clear()
+
+    def test_find_by_inchikey(self):
+        self.assertListEqual(
+            CompoundIndex.find_by_inchikey(self.inchikey), [self.compound]
+        )
+        self.assertListEqual(CompoundIndex.find_by_inchikey("WRONG"), [])
+
+    def test_find_by_inchikey_prefix(self):
+        self.assertListEqual(
+            CompoundIndex.find_by_inchikey_prefix(self.inchikey),
+            [self.compound, self.isomer],
+        )
+        self.assertListEqual(
+            CompoundIndex.find_by_inchikey_prefix("LFQSCWFLJHTTHZ"),
+            [self.compound, self.isomer],
+        )
+
+    def test_find_by_smiles(self):
+        self.assertListEqual(CompoundIndex.find_by_smiles("CCO"), [self.compound])
+
+    def test_find_by_formula(self):
+        self.assertListEqual(
+            CompoundIndex.find_by_formula("C2H6O"), [self.compound, self.isomer]
+        )
+
+    def test_find_by_name(self):
+        self.assertListEqual(CompoundIndex.find_by_name("ethanol"), [self.compound])
+
+    def test_empty_values_not_indexed(self):
+        self.assertListEqual(CompoundIndex.find_by_smiles(""), [])
+
+    def test_setter(self):
+        self.compound.set_smiles("OCC")
+        self.assertListEqual(CompoundIndex.find_by_smiles("CCO"), [])
+        self.assertListEqual(CompoundIndex.find_by_smiles("OCC"), [self.compound])
+
+    def test_set_inchikey(self):
+        self.compound.set_inchikey("XXXXXXXXXXXXXX-UHFFFAOYSA-N")
+        self.assertListEqual(CompoundIndex.find_by_inchikey(self.inchikey), [])
+        self.assertListEqual(
+            CompoundIndex.find_by_inchikey_prefix(self.inchikey), [self.isomer]
+        )
+        self.assertListEqual(
+            CompoundIndex.find_by_inchikey_prefix("XXXXXXXXXXXXXX"), [self.compound]
+        )
+
+    def test_set_id(self):
+        self.compound.set_id("INDEX_ETHANOL_RENAMED")
+        found = CompoundIndex.find_by_smiles("CCO")
+        self.assertListEqual(found, [self.compound])
+        self.assertEqual(found[0].get_id(), "INDEX_ETHANOL_RENAMED")
+
+    def test_set_id_rejected(self):
+        with self.assertRaises(ValueError):
+            self.compound.set_id("")
+        self.assertListEqual(CompoundIndex.find_by_smiles("CCO"), [self.compound])
+
+    def test_replaced_compound(self):
+        compound = Compound(id="INDEX_ETHANOL", smiles="C(O)C")
+        self.assertListEqual(CompoundIndex.find_by_smiles("CCO"), [])
+        self.assertListEqual(CompoundIndex.find_by_smiles("C(O)C"), [compound])
+        self.assertListEqual(CompoundIndex.find_by_name("ethanol"), [])
+
+    def test_get_groups(self):
+        groups = CompoundIndex.get_groups("inchikey_prefix")
+        self.assertListEqual(groups["LFQSCWFLJHTTHZ"], [self.compound, self.isomer])
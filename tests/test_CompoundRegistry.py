@@ -0,0 +1,141 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from copy import deepcopy
+from gc import collect
+from pickle import dumps, loads
+
+from brs_utils import Cache
+from chemlite import Compound, CompoundIndex, CompoundRegistry, Pathway, Reaction
+
+
+class Test_CompoundRegistry(TestCase):
+
+    def setUp(self):
+        # compounds left by previous tests are evicted first
+        CompoundRegistry.set_capacity(1)
+        CompoundRegistry.set_capacity(None)
+
+    def tearDown(self):
+        CompoundRegistry.set_capacity(None)
+
+    def fill(self, prefix, nb):
+        return [Compound(id=f"{prefix}_{i}", name=f"{prefix}_{i}") for i in range(nb)]
+
+    def test_unbounded(self):
+        self.assertIsNone(CompoundRegistry.get_capacity())
+        self.fill("REG_UNBOUNDED", 10)
+        self.assertEqual(CompoundRegistry.get_nb_compounds(), 0)
+        self.assertListEqual(CompoundRegistry.evict(), [])
+        self.assertIsNotNone(Cache.get("REG_UNBOUNDED_0"))
+
+    def test_set_capacity(self):
+        self.assertRaises(ValueError, CompoundRegistry.set_capacity, 0)
+        self.fill("REG_CAPACITY", 10)
+        CompoundRegistry.set_capacity(8)
+        self.assertEqual(CompoundRegistry.get_capacity(), 8)
+        self.assertLessEqual(CompoundRegistry.get_nb_compounds(), 8)
+
+    def test_lru(self):
+        CompoundRegistry.set_capacity(8)
+        compounds = self.fill("REG_LRU", 8)
+        # REG_LRU_0 is used by a reaction, then the reaction is dropped
+        Reaction(id="rxn", reactants={"REG_LRU_0": 1})
+        collect()
+        self.fill("REG_LRU_NEW", 1)
+        # evicted down to 6 compounds, least recently used first
+        self.assertEqual(CompoundRegistry.get_nb_compounds(), 6)
+        for compound in compounds[1:4]:
+            self.assertIsNone(Cache.get(compound.get_id()))
+            self.assertNotIn(compound, CompoundIndex.find_by_name(compound.get_id()))
+        for cmpd_id in ["REG_LRU_0", "REG_LRU_4", "REG_LRU_NEW_0"]:
+            self.assertIsNotNone(Cache.get(cmpd_id))
+
+    def test_pinned(self):
+        CompoundRegistry.set_capacity(4)
+        rxn = Reaction(
+            id="rxn",
+            reactants={f"REG_RXN_{i}": 1 for i in range(4)},
+            products={"REG_RXN_4": 1},
+        )
+        pathway = Pathway(id="pathway")
+        pathway.set_target_id("REG_TARGET")
+        Compound(id="REG_TARGET")
+        self.fill("REG_PINNED", 10)
+        pinned = CompoundRegistry.get_pinned_ids()
+        self.assertSetEqual(pinned, {f"REG_RXN_{i}" for i in range(5)} | {"REG_TARGET"})
+        for cmpd_id in pinned:
+            self.assertIsNotNone(Cache.get(cmpd_id))
+        # the last compound built is never evicted
+        self.assertIsNotNone(Cache.get("REG_PINNED_9"))
+        # compounds are released with their reaction and pathway
+        del rxn, pathway
+        collect()
+        self.assertSetEqual(CompoundRegistry.get_pinned_ids(), set())
+        CompoundRegistry.evict()
+        self.assertLessEqual(CompoundRegistry.get_nb_compounds(), 3)
+
+    def test_existing_reactions(self):
+        # reactions built before the capacity is set are tracked
+        rxn = Reaction(id="rxn", reactants={"REG_EXISTING": 1})
+        copy = rxn.copy()
+        CompoundRegistry.set_capacity(1)
+        self.fill("REG_OTHER", 4)
+        self.assertIsNotNone(Cache.get("REG_EXISTING"))
+        del rxn
+        collect()
+        self.assertIn("REG_EXISTING", CompoundRegistry.get_pinned_ids())
+        self.assertIsNotNone(copy)
+
+    def test_copies(self):
+        rxn = Reaction(id="rxn", reactants={"REG_COPY_A": 1}, products={})
+        pathway = Pathway(id="pathway")
+        pathway.set_target_id("REG_COPY_T")
+        Compound(id="REG_COPY_T")
+        CompoundRegistry.set_capacity(1)
+        copies = [deepcopy(rxn), loads(dumps(rxn)), deepcopy(pathway)]
+        # pinned by copies only
+        del rxn, pathway
+        collect()
+        self.fill("REG_COPY_OTHER", 4)
+        self.assertIsNotNone(Cache.get("REG_COPY_A"))
+        self.assertIsNotNone(Cache.get("REG_COPY_T"))
+        del copies[:2]
+        collect()
+        self.assertNotIn("REG_COPY_A", CompoundRegistry.get_pinned_ids())
+        self.assertIn("REG_COPY_T", CompoundRegistry.get_pinned_ids())
+
+    def test_suspended(self):
+        CompoundRegistry.set_capacity(4)
+        with CompoundRegistry.suspended():
+            self.fill("REG_SUSPENDED", 10)
+            self.assertEqual(CompoundRegistry.get_nb_compounds(), 10)
+            self.assertIn("REG_SUSPENDED_0", CompoundRegistry.get_pinned_ids())
+        # evicted on exit
+        self.assertLessEqual(CompoundRegistry.get_nb_compounds(), 4)
+        self.assertSetEqual(CompoundRegistry.get_pinned_ids(), set())
+
+    def test_from_dict_over_capacity(self):
+        CompoundRegistry.set_capacity(8)
+        species = {f"REG_FROM_DICT_{i}": {"smiles": "C" * (i + 1)} for i in range(10)}
+        pathway = Pathway.from_dict(
+            {
+                "id": "pathway",
+                "reactions": {
+                    f"rxn_{i}": {
+                        "reactants": {f"REG_FROM_DICT_{i}": 1},
+                        "products": {f"REG_FROM_DICT_{i+1}": 1},
+                    }
+                    for i in range(9)
+                },
+                "species": species,
+                "target_id": "REG_FROM_DICT_9",
+            }
+        )
+        self.assertEqual(len(pathway.get_reactions_ids()), 9)
+        for spe_id, compound in species.items():
+            self.assertEqual(Cache.get(spe_id).get_smiles(), compound["smiles"])
@@ -0,0 +1,127 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from copy import deepcopy
+from pickle import dumps, loads
+
+from chemlite import FrozenReaction, Pathway, Reaction
+
+
+class Test_FrozenReaction(TestCase):
+
+    def setUp(self):
+        self.reactants = {"MNXM1": 1, "CMPD_A": 2}
+        self.products = {"CMPD_B": 1}
+        self.rxn = Reaction(
+            id="frozen_rxn",
+            ec_numbers=["1.1.1.1"],
+            reactants=self.reactants,
+            products=self.products,
+        )
+        self.frozen = self.rxn.freeze()
+
+    def test_freeze(self):
+        self.assertIsInstance(self.frozen, FrozenReaction)
+        self.assertTrue(self.frozen.is_frozen())
+        self.assertFalse(self.rxn.is_frozen())
+        self.assertEqual(self.frozen.get_id(), self.rxn.get_id())
+        self.assertListEqual(self.frozen.get_ec_numbers(), ["1.1.1.1"])
+        self.assertDictEqual(self.frozen.get_reactants(), self.rxn.get_reactants())
+        self.assertListEqual(
+            self.frozen.get_species_ids(), ["CMPD_A", "CMPD_B", "MNXM1"]
+        )
+        self.assertDictEqual(self.frozen.get_products(), self.products)
+        self.assertIs(self.frozen.freeze(), self.frozen)
+
+    def test_eq_hash(self):
+        self.assertEqual(self.frozen, self.rxn)
+        self.assertEqual(self.rxn, self.frozen)
+        self.assertEqual(hash(self.frozen), hash(self.rxn))
+        self.assertEqual(len({self.rxn, self.frozen}), 1)
+
+    def test_intern(self):
+        same = deepcopy(self.rxn)
+        self.assertIs(same.freeze(), self.frozen)
+        self.assertIs(FrozenReaction.intern(self.frozen), self.frozen)
+        other_id = Reaction(
+            id="other",
+            ec_numbers=["1.1.1.1"],
+            reactants=self.reactants,
+            products=self.products,
+        )
+        self.assertIsNot(other_id.freeze(), self.frozen)
+        other_ec = deepcopy(self.rxn)
+        other_ec.set_ec_numbers([])
+        self.assertIsNot(other_ec.freeze(), self.frozen)
+
+    def test_intern_weak(self):
+        nb = FrozenReaction.get_nb_interned()
+        Reaction(id="tmp", reactants={"MNXM1": 1}, products={"X": 1}).freeze()
+        self.assertEqual(FrozenReaction.get_nb_interned(), nb)
+
+    def test_intern_pathway(self):
+        pathways = []
+        for i in range(3):
+            pathway = Pathway(id=f"frozen_pathway_{i}")
+            pathway.add_reaction(deepcopy(self.rxn))
+            pathways.append(pathway)
+        self.assertListEqual(
+            [FrozenReaction.intern_pathway(pathway) for pathway in pathways],
+            [1, 1, 1],
+        )
+        for pathway in pathways:
+            self.assertIs(pathway.get_reaction("frozen_rxn"), self.frozen)
+        self.assertEqual(FrozenReaction.intern_pathway(pathways[0]), 0)
+
+    def test_immutable(self):
+        for method, args in [
+            ("set_id", ("id",)),
+            ("set_ec_numbers", ([],)),
+            ("add_ec_number", ("2.2.2.2",)),
+            ("set_reactants", ({},)),
+            ("set_reactant", ("MNXM1", 3)),
+            ("set_products", ({},)),
+            ("set_product", ("CMPD_B", 3)),
+            ("add_reactant", ("MNXM1", 1)),
+            ("rename_compound", ("MNXM1", "MNXM2")),
+            ("mult_stoichio_coeff", (2,)),
+        ]:
+            with self.subTest(method=method):
+                with self.assertRaises(TypeError):
+                    getattr(self.frozen, method)(*args)
+        self.frozen.get_ec_numbers().append("2.2.2.2")
+        self.assertListEqual(self.frozen.get_ec_numbers(), ["1.1.1.1"])
+        self.assertEqual(self.frozen, self.rxn)
+
+    def test_cached(self):
+        self.assertEqual(self.frozen.get_key(), self.rxn.get_key())
+        self.assertEqual(
+            self.frozen.get_key(directed=False), self.rxn.get_key(directed=False)
+        )
+        self.assertEqual(
+            self.frozen.get_species_set(), frozenset(["MNXM1", "CMPD_A", "CMPD_B"])
+        )
+        self.assertEqual(self.frozen.get_species_set(), self.rxn.get_species_set())
+
+    def test_copy(self):
+        rxn = self.frozen.copy()
+        self.assertFalse(rxn.is_frozen())
+        rxn.set_reactant("MNXM1", 3)
+        self.assertEqual(self.frozen.get_reactant("MNXM1"), 1)
+
+    def test_pathway_edit_reaction(self):
+        pathway = Pathway(id="frozen_pathway")
+        pathway.add_reaction(self.frozen)
+        rxn = pathway.edit_reaction("frozen_rxn")
+        self.assertFalse(rxn.is_frozen())
+        pathway.rename_compound("MNXM1", "MNXM1_bis")
+        self.assertIn("MNXM1", self.frozen.get_species_set())
+
+    def test_pickle(self):
+        frozen = loads(dumps(self.frozen))
+        self.assertEqual(frozen, self.frozen)
+        self.assertTrue(frozen.is_frozen())
@@ -46,6 +46,15 @@ class Test_Object(TestCase):
         obj = Object(id)
         self.assertNotEqual(obj, 0)
 
+    def test_hash(self):
+        self.assertEqual(hash(self.object), hash(Object(id=self.id)))
+        self.assertEqual(len({self.object, Object(id=self.id)}), 1)
+
+    def test_hash_set_id(self):
+        new_id = "new_id"
+        self.object.set_id(new_id)
+        self.assertEqual(hash(self.object), hash(Object(id=new_id)))
+
     def test_get(self):
         self.assertEqual(self.object.get_id(), self.id)
 
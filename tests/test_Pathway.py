@@ -5,6 +5,7 @@ Created on May 28 2021
 """
 
 from unittest import TestCase
+from unittest.mock import patch
 from copy import deepcopy
 from os import path as os_path
 from json import load as jsload
@@ -13,6 +14,7 @@ from chemlite import (
     Pathway,
     Reaction,
     Compound,
+    ReactionStore,
 )
 
 HERE = os_path.dirname(os_path.realpath(__file__))
@@ -75,6 +77,79 @@ class Test_Pathway(TestCase):
             old_id in self.pathway.get_reaction(self.rxn.get_id()).get_species_ids()
         )
 
+    def test_rename_compound_in_place(self):
+        # reactions of a pathway never copied are renamed in place,
+        # for every holder of them
+        old_id = self.rxn.get_reactants_ids()[0]
+        self.pathway.rename_compound(old_id, "NEW_CMPD_ID")
+        self.assertIs(self.pathway.get_reaction(self.rxn.get_id()), self.rxn)
+        self.assertIn("NEW_CMPD_ID", self.rxn.get_species_ids())
+        self.assertNotIn(old_id, self.rxn.get_species_ids())
+
+    def test_copy(self):
+        clone = self.pathway.copy(id="clone")
+        self.assertEqual(clone.get_id(), "clone")
+        self.assertEqual(clone, self.pathway)
+        # reactions are shared
+        for rxn_id, rxn in self.pathway.get_reactions().items():
+            self.assertIs(clone.get_reaction(rxn_id), rxn)
+
+    def test_copy_replace_reaction(self):
+        clone = self.pathway.copy()
+        other = Reaction(id="rxn_5", reactants={"MNXM1": 1}, products={"MNXM4": 1})
+        clone.replace_reaction("rxn_3", other)
+        self.assertIs(clone.get_reaction("rxn_3"), other)
+        self.assertIs(self.pathway.get_reaction("rxn_3"), self.reactions["rxn_3"])
+        self.assertIs(clone.get_reaction("rxn_2"), self.reactions["rxn_2"])
+        clone.del_reaction("rxn_2")
+        self.assertIn("rxn_2", self.pathway.get_reactions_ids())
+        self.assertNotEqual(clone, self.pathway)
+
+    def test_copy_edit_reaction(self):
+        clone = self.pathway.copy()
+        rxn = clone.edit_reaction("rxn_4")
+        self.assertIsNot(rxn, self.rxn)
+        # edited once, then owned by the clone
+        self.assertIs(clone.edit_reaction("rxn_4"), rxn)
+        rxn.set_reactant("MNXM4", 2)
+        self.assertEqual(self.rxn.get_reactant("MNXM4"), 1)
+        self.assertIs(clone.get_reaction("rxn_3"), self.reactions["rxn_3"])
+        # the original pathway copies the reaction as well
+        self.assertIsNot(self.pathway.edit_reaction("rxn_3"), self.reactions["rxn_3"])
+        self.assertIsNone(clone.edit_reaction("rxn_0"))
+
+    def test_edit_reaction_shared(self):
+        # reactions added to a pathway may be shared, copied when edited once
+        rxn = self.pathway.edit_reaction("rxn_4")
+        self.assertIsNot(rxn, self.rxn)
+        self.assertIs(self.pathway.edit_reaction("rxn_4"), rxn)
+        # as well as reactions taken from another pathway
+        clone = self.pathway.copy()
+        clone.replace_reaction("rxn_1", clone.get_reaction("rxn_2"))
+        clone.edit_reaction("rxn_1").set_reactant("MNXM1", 3)
+        self.assertIs(self.pathway.get_reaction("rxn_2"), self.reactions["rxn_2"])
+        self.assertNotEqual(self.reactions["rxn_2"].get_reactant("MNXM1"), 3)
+
+    def test_edit_reaction_interned(self):
+        store = ReactionStore()
+        pathway = Pathway(id="other")
+        for rxn in self.reactions.values():
+            pathway.add_reaction(deepcopy(rxn))
+        store.add_pathway(self.pathway)
+        store.add_pathway(pathway)
+        shared = pathway.get_reaction("rxn_2")
+        self.assertIs(self.pathway.get_reaction("rxn_2"), shared)
+        pathway.edit_reaction("rxn_2").set_reactant("MNXM1", 3)
+        self.assertIs(self.pathway.get_reaction("rxn_2"), shared)
+        self.assertNotEqual(shared.get_reactant("MNXM1"), 3)
+
+    def test_copy_rename_compound(self):
+        clone = self.pathway.copy()
+        clone.rename_compound("MNXM4", "NEW_CMPD_ID")
+        self.assertIn("NEW_CMPD_ID", clone.get_reaction("rxn_4").get_species_ids())
+        self.assertIn("MNXM4", self.rxn.get_species_ids())
+        self.assertIs(clone.get_reaction("rxn_1"), self.reactions["rxn_1"])
+
     def test_replace_reaction(self):
         _rxn = deepcopy(self.rxn)
         rxn = Reaction(_rxn.get_id())
@@ -186,6 +261,13 @@ class Test_Pathway(TestCase):
             [rxn.get_id() for rxn in self.reactions.values()] + [rxn.get_id()],
         )
 
+    def test_add_reaction_lazy_debug(self):
+        rxn = Reaction(id="rxn")
+        with patch.object(Reaction, "to_string") as to_string:
+            self.pathway.add_reaction(rxn)
+            self.pathway.replace_reaction(rxn.get_id(), rxn)
+        to_string.assert_not_called()
+
     def test_add_reaction_with_id(self):
         rxn = Reaction(id="rxn")
         other_id = "other_" + rxn.get_id()
@@ -220,6 +302,20 @@ class Test_Pathway(TestCase):
             },
         )
 
+    def test_from_dict(self):
+        pathway = Pathway.from_dict(self.pathway._to_dict(full=True))
+        self.assertEqual(pathway.get_id(), self.id)
+        self.assertEqual(pathway, self.pathway)
+        self.assertListEqual(
+            pathway.get_reactions_ids(), self.pathway.get_reactions_ids()
+        )
+
+    def test_from_dict_id(self):
+        pathway = Pathway.from_dict(self.pathway._to_dict(), id="other")
+        self.assertEqual(pathway.get_id(), "other")
+        self.assertEqual(pathway.get_target_id(), self.target_id)
+        self.assertEqual(pathway, self.pathway)
+
     def test__to_dict_full(self):
         list_of_list_of_species = [
             rxn.get_species_ids() for rxn in self.reactions.values()
@@ -268,6 +364,43 @@ class Test_Pathway(TestCase):
         pathway.set_target_id(self.target_id)
         self.assertEqual(self.pathway, pathway)
 
+    def test_hash(self):
+        pathway = Pathway(id="pathway_test")
+        for rxn in reversed(list(self.reactions.values())):
+            pathway.add_reaction(deepcopy(rxn))
+        pathway.set_target_id(self.target_id)
+        self.assertEqual(hash(pathway), hash(self.pathway))
+        self.assertEqual(len({pathway, self.pathway}), 1)
+
+    def test_hash_after_modification(self):
+        _hash = hash(self.pathway)
+        self.pathway.set_target_id("OTHER_TARGET")
+        self.assertNotEqual(hash(self.pathway), _hash)
+        self.pathway.set_target_id(self.target_id)
+        self.assertEqual(hash(self.pathway), _hash)
+        self.pathway.del_reaction(self.rxn.get_id())
+        self.assertNotEqual(hash(self.pathway), _hash)
+
+    def test_hash_after_reaction_modification(self):
+        pathway = deepcopy(self.pathway)
+        self.assertEqual(hash(pathway), hash(self.pathway))
+        pathway.get_reaction(self.rxn.get_id()).add_product("MNXM1", 1)
+        self.assertNotEqual(hash(pathway), hash(self.pathway))
+        self.assertNotEqual(pathway, self.pathway)
+
+    def test_hash_cached(self):
+        hash(self.pathway)
+        with patch.object(
+            Pathway, "_hash_content", autospec=True, side_effect=Pathway._hash_content
+        ) as hash_content:
+            # reactions outside the pathway do not invalidate its hash
+            Reaction(id="unrelated", reactants={"MNXM1": 1})
+            hash(self.pathway)
+            self.assertEqual(hash_content.call_count, 0)
+            self.rxn.add_product("MNXM1", 1)
+            hash(self.pathway)
+            self.assertEqual(hash_content.call_count, 1)
+
     def test_not_equal_reactions(self):
         pathway = deepcopy(Pathway(id=self.id))
         pathway.add_reaction(Reaction(id="test_1"))
@@ -309,6 +442,150 @@ class Test_Pathway(TestCase):
             },
         )
 
+    def test_get_topology(self):
+        topology = self.pathway.get_topology()
+        self.assertListEqual(topology["order"], ["rxn_1", "rxn_2", "rxn_3", "rxn_4"])
+        # MNXM1 is recycled: produced by rxn_4, consumed by rxn_3 and rxn_2
+        self.assertListEqual(topology["cycles"], [["rxn_2", "rxn_3", "rxn_4"]])
+        self.assertDictEqual(topology["branches"], {"MNXM1": ["rxn_3", "rxn_2"]})
+        self.assertDictEqual(
+            topology["depths"], {"rxn_4": 1, "rxn_3": 2, "rxn_2": 3, "rxn_1": 4}
+        )
+        self.assertListEqual(topology["unreachable"], [])
+        self.assertListEqual(
+            self.pathway.get_ordered_reactions_ids(), topology["order"]
+        )
+
+    def test_get_topology_cycle(self):
+        pathway = Pathway(id="cycle")
+        for rxn_id, reactants, products in [
+            ("rxn_c", {"C": 1}, {"T": 1}),
+            ("rxn_b", {"B": 1}, {"C": 1, "X": 1}),
+            ("rxn_x", {"X": 1}, {"B": 1}),
+            ("rxn_a", {"A": 1}, {"B": 1}),
+            ("rxn_y", {"Y": 1}, {"Z": 1}),
+        ]:
+            pathway.add_reaction(
+                Reaction(id=rxn_id, reactants=reactants, products=products)
+            )
+        pathway.set_target_id("T")
+        topology = pathway.get_topology()
+        self.assertListEqual(
+            topology["order"], ["rxn_a", "rxn_x", "rxn_b", "rxn_c", "rxn_y"]
+        )
+        self.assertListEqual(topology["cycles"], [["rxn_x", "rxn_b"]])
+        self.assertDictEqual(
+            topology["depths"], {"rxn_c": 1, "rxn_b": 2, "rxn_x": 3, "rxn_a": 3}
+        )
+        self.assertListEqual(topology["unreachable"], ["rxn_y"])
+
+    def test_get_topology_no_target(self):
+        pathway = Pathway(id="no_target")
+        pathway.add_reaction(self.rxn)
+        topology = pathway.get_topology()
+        self.assertListEqual(topology["order"], ["rxn_4"])
+        self.assertDictEqual(topology["depths"], {})
+        self.assertListEqual(topology["unreachable"], [])
+
+    def test_get_topology_cached(self):
+        topology = self.pathway.get_topology()
+        self.assertIs(self.pathway.get_topology(), topology)
+        # reactions outside the pathway do not invalidate its topology
+        Reaction(id="unrelated", reactants={"MNXM1": 1})
+        self.assertIs(self.pathway.get_topology(), topology)
+        self.pathway.del_reaction("rxn_1")
+        topology = self.pathway.get_topology()
+        self.assertListEqual(topology["order"], ["rxn_2", "rxn_3", "rxn_4"])
+        self.pathway.set_target_id("CMPD_0000000003")
+        self.assertDictEqual(
+            self.pathway.get_topology()["depths"],
+            {"rxn_3": 1, "rxn_2": 2, "rxn_4": 2},
+        )
+        # reactions modified in place
+        self.rxn.set_products({self.target_id: 1})
+        self.assertListEqual(self.pathway.get_topology()["cycles"], [])
+
+    def test_diff_equal(self):
+        self.assertDictEqual(
+            self.pathway.diff(self.pathway.copy()),
+            {
+                "added": [],
+                "removed": [],
+                "changed": [],
+                "renamed": {},
+                "target_id": None,
+                "net_reaction": {},
+            },
+        )
+
+    def test_diff(self):
+        other = self.pathway.copy()
+        # changed
+        rxn = other.edit_reaction("rxn_4")
+        rxn.set_product("MNXM1", 3)
+        # renamed
+        other.add_reaction(self.reactions["rxn_3"], "rxn_3_bis")
+        other.del_reaction("rxn_3")
+        # removed
+        other.del_reaction("rxn_1")
+        # added
+        other.add_reaction(
+            Reaction(id="rxn_5", reactants={"MNXM1": 1}, products={"MNXM4": 1})
+        )
+        other.set_target_id("MNXM4")
+        diff = self.pathway.diff(other)
+        self.assertListEqual(diff["added"], ["rxn_5"])
+        self.assertListEqual(diff["removed"], ["rxn_1"])
+        self.assertListEqual(diff["changed"], ["rxn_4"])
+        self.assertDictEqual(diff["renamed"], {"rxn_3": "rxn_3_bis"})
+        self.assertTupleEqual(diff["target_id"], (self.target_id, "MNXM4"))
+        # net reaction delta is the difference of net reactions
+        expected = other.net_reaction()
+        for spe_id, spe_sto in self.pathway.net_reaction().items():
+            expected[spe_id] = expected.get(spe_id, 0) - spe_sto
+        self.assertDictEqual(
+            diff["net_reaction"],
+            {spe_id: spe_sto for spe_id, spe_sto in expected.items() if spe_sto},
+        )
+
+    def test_diff_same_content(self):
+        # reactions with the same content are matched by ID first
+        pathway = Pathway(id="diff")
+        pathway.add_reaction(self.rxn, "rxn_a")
+        pathway.add_reaction(self.rxn, "rxn_b")
+        other = Pathway(id="diff_other")
+        other.add_reaction(self.rxn, "rxn_b")
+        diff = pathway.diff(other)
+        self.assertListEqual(diff["removed"], ["rxn_a"])
+        self.assertDictEqual(diff["renamed"], {})
+        self.assertDictEqual(
+            diff["net_reaction"],
+            {spe_id: -spe_sto for spe_id, spe_sto in self.rxn.get_species().items()},
+        )
+
+    def test_net_reactions(self):
+        other = self.pathway.copy()
+        other.del_reaction("rxn_1")
+        # same content under another ID
+        other.add_reaction(deepcopy(self.rxn), "rxn_4_bis")
+        empty = Pathway(id="empty")
+        self.assertListEqual(
+            Pathway.net_reactions([self.pathway, other, empty]),
+            [self.pathway.net_reaction(), other.net_reaction(), {}],
+        )
+
+    def test_net_reactions_species(self):
+        self.assertListEqual(
+            Pathway.net_reactions([self.pathway], species=["MNXM1", "MNXM4"]),
+            [
+                {
+                    spe_id: spe_sto
+                    for spe_id, spe_sto in self.pathway.net_reaction().items()
+                    if spe_id in ("MNXM1", "MNXM4")
+                }
+            ],
+        )
+
     def test_pseudo_reaction(self):
         self.assertEqual(
             self.pathway.pseudo_reaction(),
@@ -0,0 +1,82 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+
+from chemlite import Pathway, PathwayIndex, Reaction
+
+
+class Test_PathwayIndex(TestCase):
+
+    def setUp(self):
+        self.r1 = Reaction(id="r1", reactants={"A": 1}, products={"B": 1})
+        self.r2 = Reaction(id="r2", reactants={"B": 1}, products={"C": 1})
+        self.r3 = Reaction(id="r3", reactants={"C": 1}, products={"D": 1})
+        self.r1_rev = Reaction(id="r1_rev", reactants={"B": 1}, products={"A": 1})
+        self.pathways = []
+        for i, reactions in enumerate(
+            [[self.r1, self.r2], [self.r2, self.r3], [self.r1, self.r2, self.r3]]
+            + [[self.r3]] * 10
+            + [[self.r1_rev]]
+        ):
+            pathway = Pathway(id=f"index_{i}")
+            for rxn in reactions:
+                pathway.add_reaction(rxn)
+            self.pathways.append(pathway)
+        self.index = PathwayIndex()
+        self.index.add_pathways(self.pathways)
+
+    def test_add(self):
+        self.assertEqual(len(self.index), len(self.pathways))
+        self.assertListEqual(list(self.index), self.pathways)
+        self.assertIs(self.index.get_pathway(1), self.pathways[1])
+        pathway = Pathway(id="index_new")
+        self.assertEqual(self.index.add(pathway), len(self.pathways))
+
+    def test_find_all(self):
+        self.assertListEqual(
+            self.index.find_all(reactions=[self.r1, self.r2]),
+            [self.pathways[0], self.pathways[2]],
+        )
+        self.assertListEqual(
+            self.index.find_all(reactions=[self.r2], compounds=["D"]),
+            [self.pathways[1], self.pathways[2]],
+        )
+        # reactions are matched by content, whatever their IDs
+        same = Reaction(id="other", reactants={"A": 1}, products={"B": 1})
+        self.assertListEqual(
+            self.index.find_all(reactions=[same.get_key()]),
+            [self.pathways[0], self.pathways[2]],
+        )
+        self.assertListEqual(self.index.find_all(compounds=["A", "D", "X"]), [])
+        self.assertListEqual(self.index.find_all(), [])
+
+    def test_find_any(self):
+        self.assertListEqual(
+            self.index.find_any(reactions=[self.r1], compounds=["A"]),
+            [self.pathways[0], self.pathways[2], self.pathways[-1]],
+        )
+        self.assertListEqual(self.index.find_any(compounds=["X"]), [])
+        self.assertEqual(len(self.index.find_any(compounds=["D"])), 12)
+
+    def test_find_after_add(self):
+        self.assertEqual(len(self.index.find_all(reactions=[self.r1])), 2)
+        pathway = Pathway(id="index_new")
+        pathway.add_reaction(self.r1)
+        self.index.add(pathway)
+        self.assertListEqual(
+            self.index.find_all(reactions=[self.r1]),
+            [self.pathways[0], self.pathways[2], pathway],
+        )
+
+    def test_undirected(self):
+        index = PathwayIndex(directed=False)
+        index.add_pathways(self.pathways)
+        self.assertFalse(index.is_directed())
+        self.assertListEqual(
+            index.find_all(reactions=[self.r1_rev.get_key()]),
+            [self.pathways[0], self.pathways[2], self.pathways[-1]],
+        )
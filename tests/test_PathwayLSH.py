@@ -0,0 +1,115 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from subprocess import run
+from sys import executable
+from os import environ
+
+from chemlite import Pathway, PathwayLSH, Reaction
+
+
+def make_pathway(id, start, nb):
+    pathway = Pathway(id=id)
+    for i in range(start, start + nb):
+        pathway.add_reaction(
+            Reaction(id=f"rxn_{i}", reactants={f"C{i}": 1}, products={f"C{i + 1}": 1})
+        )
+    return pathway
+
+
+class Test_PathwayLSH(TestCase):
+
+    def setUp(self):
+        self.pathway = make_pathway("lsh_0", 0, 20)
+        # one reaction out of 20 differs
+        self.near = make_pathway("lsh_1", 0, 19)
+        self.near.add_reaction(
+            Reaction(id="rxn_x", reactants={"C19": 1}, products={"X": 1})
+        )
+        self.same = make_pathway("lsh_2", 0, 20)
+        self.far = make_pathway("lsh_3", 100, 20)
+        self.lsh = PathwayLSH()
+        self.lsh.add_pathways([self.pathway, self.near, self.same, self.far])
+
+    def test_wrong_bands(self):
+        with self.assertRaises(ValueError):
+            PathwayLSH(num_perm=128, bands=30)
+
+    def test_get_shingles(self):
+        pathway = make_pathway("lsh_shingles", 0, 1)
+        self.assertSetEqual(
+            self.lsh.get_shingles(pathway),
+            {'R[[["C0",1]],[["C1",1]]]', "SC0", "SC1"},
+        )
+
+    def test_get_shingles_float_coefficients(self):
+        # 1.0 coefficients from a parsed reaction, 1 from a dict
+        parsed = Pathway(id="lsh_parsed")
+        parsed.add_reaction(Reaction.from_string("1 C0 = 1 C1", id="rxn_0"))
+        built = Pathway.from_dict(
+            {
+                "id": "lsh_built",
+                "reactions": {"rxn_0": {"reactants": {"C0": 1}, "products": {"C1": 1}}},
+            }
+        )
+        self.assertEqual(parsed, built)
+        self.assertSetEqual(self.lsh.get_shingles(parsed), self.lsh.get_shingles(built))
+        lsh = PathwayLSH()
+        lsh.add_pathways([parsed, built])
+        self.assertListEqual(
+            lsh.get_near_duplicates(threshold=0.99), [(parsed, built, 1.0)]
+        )
+
+    def test_get_signature(self):
+        signature = self.lsh.get_signature(self.pathway)
+        self.assertEqual(len(signature), 128)
+        self.assertEqual(signature, self.lsh.get_signature(self.same))
+        self.assertEqual(PathwayLSH.jaccard(signature, signature), 1.0)
+        self.assertLess(
+            PathwayLSH.jaccard(signature, self.lsh.get_signature(self.far)), 0.1
+        )
+
+    def test_get_signature_stable(self):
+        # independent of PYTHONHASHSEED
+        code = (
+            "from chemlite import Pathway, PathwayLSH, Reaction;"
+            "p = Pathway(id='p');"
+            "p.add_reaction(Reaction(id='r', reactants={'A': 1}, products={'B': 2}));"
+            "print(PathwayLSH(num_perm=4, bands=2).get_signature(p))"
+        )
+        outputs = {
+            run(
+                [executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**environ, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2")
+        }
+        self.assertEqual(len(outputs), 1)
+
+    def test_query(self):
+        result = self.lsh.query(self.pathway, k=2)
+        self.assertListEqual([pathway for pathway, _ in result], [self.same, self.near])
+        self.assertEqual(result[0][1], 1.0)
+        self.assertGreater(result[1][1], 0.7)
+        self.assertEqual(len(self.lsh.query(self.pathway, k=1)), 1)
+        self.assertListEqual(self.lsh.query(make_pathway("lsh_4", 500, 5)), [])
+
+    def test_get_near_duplicates(self):
+        pairs = self.lsh.get_near_duplicates(threshold=0.99)
+        self.assertListEqual(pairs, [(self.pathway, self.same, 1.0)])
+        pairs = self.lsh.get_near_duplicates(threshold=0.7)
+        self.assertListEqual(
+            [(first, second) for first, second, _ in pairs],
+            [
+                (self.pathway, self.near),
+                (self.pathway, self.same),
+                (self.near, self.same),
+            ],
+        )
@@ -5,12 +5,16 @@ Created on May 28 2021
 """
 
 from unittest import TestCase
+from unittest.mock import patch
 from copy import deepcopy
+from logging import getLogger, DEBUG, INFO
 from os import path as os_path
 from json import load as jsload
+from sys import modules
 from brs_utils import Cache
 
 from chemlite import Reaction, Compound
+from chemlite.settings import set_performance_mode
 
 HERE = os_path.dirname(os_path.realpath(__file__))
 DATA_PATH = os_path.join(HERE, "data")
@@ -62,6 +66,29 @@ class Test_Reaction(TestCase):
             },
         )
 
+    def test_copy(self):
+        rxn = self.rxn.copy()
+        self.assertIsNot(rxn, self.rxn)
+        self.assertEqual(rxn, self.rxn)
+        self.assertEqual(rxn.get_id(), self.id)
+        self.assertIs(rxn.get_logger(), self.rxn.get_logger())
+        rxn.set_reactant("MNXM1", 2)
+        rxn.add_ec_number("1.1.1.1")
+        self.assertEqual(self.rxn.get_reactant("MNXM1"), 1)
+        self.assertListEqual(self.rxn.get_ec_numbers(), self.ec_numbers)
+        self.assertNotEqual(rxn, self.rxn)
+
+    def test_from_dict(self):
+        rxn = Reaction.from_dict(self.rxn._to_dict(full=True))
+        self.assertEqual(rxn, self.rxn)
+        self.assertEqual(rxn.get_id(), self.id)
+        self.assertListEqual(rxn.get_ec_numbers(), self.ec_numbers)
+
+    def test_from_dict_id(self):
+        rxn = Reaction.from_dict(self.rxn._to_dict(), id="other")
+        self.assertEqual(rxn.get_id(), "other")
+        self.assertDictEqual(rxn.get_products(), self.products)
+
     def test__to_dict_full(self):
         self.assertEqual(
             self.rxn._to_dict(full=True),
@@ -90,6 +117,27 @@ class Test_Reaction(TestCase):
         rxn.add_reactant(compound_id="c", stoichio=1)
         self.assertNotEqual(rxn, self.rxn)
 
+    def test_hash(self):
+        rxn = Reaction(
+            id="rxn_test_hash",
+            reactants=dict(reversed(list(self.reactants.items()))),
+            products=self.products,
+        )
+        self.assertEqual(hash(rxn), hash(self.rxn))
+        self.assertEqual(len({rxn, self.rxn, deepcopy(self.rxn)}), 1)
+
+    def test_hash_after_modification(self):
+        rxn = deepcopy(self.rxn)
+        hash(rxn)
+        rxn.add_reactant(compound_id="c", stoichio=1)
+        self.assertNotEqual(hash(rxn), hash(self.rxn))
+        rxn.set_reactants(self.reactants)
+        self.assertEqual(hash(rxn), hash(self.rxn))
+
+    def test_hash_not_pickled(self):
+        hash(self.rxn)
+        self.assertIsNone(self.rxn.__getstate__()["_Object__hash"])
+
     def test_eq_wrong_type(self):
         self.assertNotEqual(self.rxn, 0)
 
@@ -164,6 +212,37 @@ class Test_Reaction(TestCase):
             self.reactions["float"]["dict"],
         )
 
+    def test_parse_debug_disabled(self):
+        logger = getLogger("test_parse_debug_disabled")
+        logger.setLevel(INFO)
+        with patch.object(modules["chemlite.Reaction"], "json_dumps") as json_dumps:
+            Reaction.parse(self.reactions["float"]["string"], logger)
+        json_dumps.assert_not_called()
+
+    def test_parse_debug_enabled(self):
+        logger = getLogger("test_parse_debug_enabled")
+        logger.setLevel(DEBUG)
+        with self.assertLogs(logger, DEBUG) as logs:
+            Reaction.parse(self.reactions["float"]["string"], logger)
+        self.assertIn("INPUT TRANSFORMATION", logs.output[0])
+
+    def test_get_smiles_warning(self):
+        self.rxn.add_reactant(compound_id="CMPD_0000000003_wo_smiles", stoichio=1)
+        with self.assertLogs(self.rxn.get_logger(), "WARNING") as logs:
+            self.rxn.get_smiles()
+        self.assertIn("CMPD_0000000003_wo_smiles", logs.output[0])
+
+    def test_get_smiles_performance_mode(self):
+        self.rxn.add_reactant(compound_id="CMPD_0000000003_wo_smiles", stoichio=1)
+        set_performance_mode(True)
+        try:
+            with patch.object(self.rxn.get_logger(), "warning") as warning:
+                smiles = self.rxn.get_smiles()
+        finally:
+            set_performance_mode(False)
+        warning.assert_not_called()
+        self.assertEqual(smiles, self.reactions["smiles"]["string"])
+
     def test_get_products_compounds(self):
         self.assertListEqual(
             self.rxn.get_products_compounds(),
@@ -335,3 +414,40 @@ class Test_Reaction(TestCase):
                 "MNXM23": 1,
             },
         )
+
+    def test_get_string_key(self):
+        rxn = Reaction(id="rxn", reactants={"B": 2.0, "A": 1}, products={"C": 1.0})
+        self.assertEqual(rxn.get_string_key(), '[[["A",1],["B",2]],[["C",1]]]')
+        self.assertEqual(
+            rxn.get_string_key(directed=False), '[[["A",1],["B",2]],[["C",1]]]'
+        )
+        self.assertEqual(Reaction.key_to_string(rxn.get_key()), rxn.get_string_key())
+        self.assertEqual(
+            Reaction.key_to_string(((("A", 0.5),), (("B", float("nan")),))),
+            '[[["A",0.5]],[["B","nan"]]]',
+        )
+
+    def test_register_species(self):
+        rxn = Reaction(
+            id="rxn", reactants={"REGISTERED_0": 2, "": 1, None: 1}, products={}
+        )
+        self.assertDictEqual(rxn.get_reactants(), {"REGISTERED_0": 2})
+        self.assertIsInstance(Cache.get("REGISTERED_0"), Compound)
+        # existing compounds are kept
+        self.assertIs(Cache.get("MNXM1"), self.species["MNXM1"])
+
+    def test_deferred_registration(self):
+        with Reaction.deferred_registration():
+            rxn = Reaction(
+                id="rxn",
+                reactants={"DEFERRED_0": 1, "MNXM1": 1},
+                products={"DEFERRED_1": 1},
+            )
+            with Reaction.deferred_registration():
+                Reaction(id="other", reactants={"DEFERRED_0": 1})
+            # placeholders are built when leaving the outermost context
+            self.assertIsNone(Cache.get("DEFERRED_0"))
+            self.assertDictEqual(rxn.get_reactants(), {"DEFERRED_0": 1, "MNXM1": 1})
+        for cmpd_id in ["DEFERRED_0", "DEFERRED_1"]:
+            self.assertIsInstance(Cache.get(cmpd_id), Compound)
+        self.assertIs(Cache.get("MNXM1"), self.species["MNXM1"])
@@ -0,0 +1,105 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+
+from chemlite import Pathway, Reaction, ReactionStore
+
+
+class Test_ReactionStore(TestCase):
+
+    def setUp(self):
+        self.rxn = Reaction(
+            id="rxn_1",
+            reactants={"CMPD_A": 1, "MNXM1": 1},
+            products={"CMPD_B": 1},
+        )
+        self.same = Reaction(
+            id="rxn_2",
+            reactants={"MNXM1": 1.0, "CMPD_A": 1},
+            products={"CMPD_B": 1},
+        )
+        self.reverse = Reaction(
+            id="rxn_3",
+            reactants={"CMPD_B": 1},
+            products={"CMPD_A": 1, "MNXM1": 1},
+        )
+        self.other = Reaction(
+            id="rxn_4", reactants={"CMPD_B": 1}, products={"CMPD_C": 1}
+        )
+
+    def test_get_key(self):
+        self.assertEqual(self.rxn.get_key(), self.same.get_key())
+        self.assertNotEqual(self.rxn.get_key(), self.reverse.get_key())
+        self.assertEqual(
+            self.rxn.get_key(),
+            ((("CMPD_A", 1), ("MNXM1", 1)), (("CMPD_B", 1),)),
+        )
+
+    def test_get_key_undirected(self):
+        self.assertEqual(
+            self.rxn.get_key(directed=False), self.reverse.get_key(directed=False)
+        )
+        self.assertNotEqual(
+            self.rxn.get_key(directed=False), self.other.get_key(directed=False)
+        )
+
+    def test_add(self):
+        store = ReactionStore()
+        self.assertIs(store.add(self.rxn), self.rxn)
+        self.assertIs(store.add(self.same), self.rxn)
+        self.assertIs(store.add(self.reverse), self.reverse)
+        self.assertEqual(len(store), 2)
+        self.assertIn(self.same, store)
+        self.assertNotIn(self.other, store)
+        self.assertListEqual(store.get_ids(self.rxn), ["rxn_1", "rxn_2"])
+        self.assertListEqual(list(store), [self.rxn, self.reverse])
+
+    def test_add_undirected(self):
+        store = ReactionStore(directed=False)
+        store.add(self.rxn)
+        self.assertIs(store.add(self.reverse), self.rxn)
+        self.assertEqual(len(store), 1)
+        self.assertTrue(store.is_reversed(self.reverse))
+        self.assertFalse(store.is_reversed(self.same))
+        self.assertFalse(store.is_reversed(self.rxn))
+
+    def test_get(self):
+        store = ReactionStore()
+        store.add(self.rxn)
+        self.assertIs(store.get(self.same), self.rxn)
+        self.assertIs(store.get(self.same.get_key()), self.rxn)
+        self.assertIsNone(store.get(self.other))
+        self.assertListEqual(store.get_ids(self.other), [])
+
+    def test_add_pathway(self):
+        store = ReactionStore(directed=False)
+        store.add(self.rxn)
+        pathway = Pathway(id="store_pathway")
+        pathway.add_reaction(self.same)
+        pathway.add_reaction(self.reverse)
+        pathway.add_reaction(self.other)
+        self.assertEqual(store.add_pathway(pathway), 1)
+        self.assertIs(pathway.get_reaction("rxn_2"), self.rxn)
+        self.assertIs(pathway.get_reaction("rxn_3"), self.reverse)
+        self.assertIs(pathway.get_reaction("rxn_4"), self.other)
+        self.assertEqual(len(store), 2)
+
+    def test_add_pathway_ids(self):
+        store = ReactionStore()
+        store.add(self.rxn)
+        pathway = Pathway(id="store_pathway_ids")
+        pathway.add_reaction(self.same)
+        pathway.set_target_id("CMPD_B")
+        store.add_pathway(pathway)
+        self.assertIs(pathway.get_reaction("rxn_2"), self.rxn)
+        self.assertListEqual(pathway.get_reactions_ids(), ["rxn_2"])
+        self.assertEqual(pathway.get_target_rxn_id(), "rxn_2")
+        self.assertIn("Reaction rxn_2: ", pathway.to_string())
+        self.assertNotIn("rxn_1", pathway.to_string())
+        # the representative is left untouched by edits of the pathway
+        pathway.edit_reaction("rxn_2").add_product("CMPD_C", 1)
+        self.assertIs(store.get(self.same), self.rxn)
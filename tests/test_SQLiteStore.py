@@ -0,0 +1,152 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from os import path as os_path
+from json import load as jsload
+from tempfile import TemporaryDirectory
+from types import GeneratorType
+
+from brs_utils import Cache
+from chemlite import Compound, CompoundIndex, Pathway, Reaction, SQLiteStore
+
+HERE = os_path.dirname(os_path.realpath(__file__))
+DATA_PATH = os_path.join(HERE, "data")
+
+
+class Test_SQLiteStore(TestCase):
+
+    def setUp(self):
+        with open(os_path.join(DATA_PATH, "compounds.json"), "r") as fp:
+            species = jsload(fp)
+        self.species = {spe_id: Compound(**species[spe_id]) for spe_id in species}
+        self.rxn = Reaction(
+            id="rxn_1",
+            ec_numbers=["4.1.1.63"],
+            reactants={"CMPD_0000000010": 1, "MNXM1": 1},
+            products={"CMPD_0000000003": 1, "MNXM13": 1.5},
+        )
+        self.rxn_2 = Reaction(
+            id="rxn_2",
+            reactants={"CMPD_0000000003": 1, "MNXM4": 1},
+            products={"TARGET_0000000001": 1, "MNXM1": 2},
+        )
+        self.pathways = []
+        for i, target_id in enumerate(["TARGET_0000000001", "CMPD_0000000003"]):
+            pathway = Pathway(id=f"sqlite_{i}")
+            pathway.add_reaction(self.rxn)
+            if i == 0:
+                pathway.add_reaction(self.rxn_2)
+            pathway.set_target_id(target_id)
+            self.pathways.append(pathway)
+        self.tmpdir = TemporaryDirectory()
+        self.store = SQLiteStore(os_path.join(self.tmpdir.name, "chemlite.db"))
+        self.store.add_pathways(self.pathways)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_add_pathways(self):
+        self.assertEqual(self.store.get_nb_pathways(), 2)
+        # reactions shared by pathways are stored once
+        self.assertEqual(self.store.get_nb_reactions(), 2)
+        self.assertEqual(self.store.get_nb_compounds(), 6)
+
+    def test_find_pathways(self):
+        pathways = self.store.find_pathways()
+        self.assertIsInstance(pathways, GeneratorType)
+        self.assertListEqual(list(pathways), self.pathways)
+        self.assertListEqual(
+            list(self.store.find_pathways(target_id="CMPD_0000000003")),
+            [self.pathways[1]],
+        )
+        pathway = next(self.store.find_pathways(id="sqlite_0"))
+        self.assertListEqual(pathway.get_reactions_ids(), ["rxn_1", "rxn_2"])
+        self.assertListEqual(
+            pathway.get_reaction("rxn_1").get_ec_numbers(), ["4.1.1.63"]
+        )
+        self.assertEqual(pathway.get_reaction("rxn_1").get_product("MNXM13"), 1.5)
+
+    def test_find_pathways_by_reaction(self):
+        same = Reaction(
+            id="other",
+            reactants=self.rxn.get_reactants(),
+            products=self.rxn.get_products(),
+        )
+        self.assertEqual(len(list(self.store.find_pathways(rxn=same))), 2)
+        self.assertListEqual(
+            list(
+                self.store.find_pathways(rxn=self.rxn_2, target_id="TARGET_0000000001")
+            ),
+            [self.pathways[0]],
+        )
+        self.assertListEqual(
+            list(self.store.find_pathways(compound_id="MNXM4")), [self.pathways[0]]
+        )
+        self.assertListEqual(list(self.store.find_pathways(compound_id="X")), [])
+
+    def test_find_reactions(self):
+        self.assertListEqual(list(self.store.find_reactions(rxn=self.rxn)), [self.rxn])
+        self.assertListEqual(
+            list(self.store.find_reactions(compound_id="MNXM1")),
+            [self.rxn, self.rxn_2],
+        )
+        rxn = next(self.store.find_reactions(rxn=self.rxn_2.get_key()))
+        self.assertEqual(rxn.get_id(), "rxn_2")
+
+    def test_compounds(self):
+        compound = self.species["CMPD_0000000003"]
+        self.assertEqual(self.store.get_compound("CMPD_0000000003"), compound)
+        self.assertIsNone(self.store.get_compound("X"))
+        self.assertListEqual(
+            list(self.store.find_compounds(compound.get_inchikey())), [compound]
+        )
+        new = Compound(id="sqlite_cmpd", inchikey="AAAA-BBBB-C")
+        self.store.add_compounds([new])
+        self.assertEqual(self.store.get_compound("sqlite_cmpd"), new)
+
+    def test_compounds_cached(self):
+        # live compounds are returned with their in-memory changes
+        compound = self.species["CMPD_0000000003"]
+        compound.set_name("edited")
+        self.assertIs(self.store.get_compound("CMPD_0000000003"), compound)
+        next(self.store.find_pathways(id="sqlite_0"))
+        self.assertIs(Cache.get("CMPD_0000000003"), compound)
+        self.assertEqual(compound.get_name(), "edited")
+        # missing ones are built from the database
+        CompoundIndex.remove_compound(self.species["MNXM4"])
+        Cache.remove_object_by_id("MNXM4")
+        next(self.store.find_pathways(id="sqlite_0"))
+        self.assertIsNot(Cache.get("MNXM4"), self.species["MNXM4"])
+        self.assertEqual(Cache.get("MNXM4"), self.species["MNXM4"])
+
+    def test_add_reactions(self):
+        rxn = Reaction(id="rxn_3", reactants={"MNXM1": 1}, products={"MNXM4": 1})
+        self.store.add_reactions([rxn, self.rxn])
+        self.assertEqual(self.store.get_nb_reactions(), 3)
+
+    def test_add_reactions_placeholders(self):
+        compound = self.species["CMPD_0000000003"]
+        CompoundIndex.remove_compound(compound)
+        Cache.remove_object_by_id("CMPD_0000000003")
+        # the compound is replaced by an empty placeholder in the cache
+        rxn = Reaction.from_string("1 CMPD_0000000003 = 1 sqlite_new", id="rxn_3")
+        self.assertEqual(Cache.get("CMPD_0000000003").get_smiles(), "")
+        self.store.add_reactions([rxn])
+        self.assertEqual(self.store.get_nb_compounds(), 7)
+        self.assertListEqual(
+            [
+                cmpd.get_id()
+                for cmpd in self.store.find_compounds(compound.get_inchikey())
+            ],
+            ["CMPD_0000000003"],
+        )
+
+    def test_rollback(self):
+        with self.assertRaises(AttributeError):
+            self.store.add_pathways([Pathway(id="sqlite_2"), None])
+        self.assertEqual(self.store.get_nb_pathways(), 2)
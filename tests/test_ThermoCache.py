@@ -0,0 +1,118 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from multiprocessing import get_context
+from os import path as os_path
+from sys import modules
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from chemlite import Reaction, ThermoCache
+from chemlite.constants import DEFAULT_THERMO
+
+
+def thermo(value):
+    return {
+        **DEFAULT_THERMO,
+        "dG_prime": {"value": value, "error": 1.0, "unit": "kJ/mol"},
+    }
+
+
+def put_values(path, start):
+    with ThermoCache(path) as cache:
+        for i in range(start, start + 50):
+            cache.put((((f"A{i}", 1),), ((f"B{i}", 1),)), thermo(float(i)))
+
+
+class Test_ThermoCache(TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.path = os_path.join(self.tmpdir.name, "thermo.db")
+        self.rxn = Reaction(id="r1", reactants={"A": 1, "B": 2.0}, products={"C": 1})
+        self.other = Reaction(id="r2", reactants={"C": 1}, products={"D": 1})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_get_key(self):
+        self.assertEqual(ThermoCache.get_key(self.rxn), '[[["A",1],["B",2]],[["C",1]]]')
+        same = Reaction(id="r3", reactants={"B": 2, "A": 1.0}, products={"C": 1})
+        self.assertEqual(ThermoCache.get_key(same), ThermoCache.get_key(self.rxn))
+
+    def test_get_key_not_finite(self):
+        key = ((("A", float("nan")),), (("B", float("inf")),))
+        self.assertEqual(ThermoCache.get_key(key), '[[["A","nan"]],[["B","inf"]]]')
+
+    def test_sqlite_version(self):
+        with patch.object(
+            modules["chemlite.ThermoCache"], "sqlite_version_info", (3, 23, 1)
+        ):
+            with self.assertRaises(RuntimeError):
+                ThermoCache(self.path)
+
+    def test_put_get(self):
+        with ThermoCache(self.path) as cache:
+            self.assertIsNone(cache.get(self.rxn))
+            cache.put(self.rxn, thermo(-5.0))
+            self.assertIn(self.rxn, cache)
+            self.assertNotIn(self.other, cache)
+            self.assertEqual(cache.get(self.rxn)["dG_prime"]["value"], -5.0)
+        # persistent
+        with ThermoCache(self.path) as cache:
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.get(self.rxn.get_key())["dG_prime"]["value"], -5.0)
+
+    def test_many(self):
+        with ThermoCache(self.path) as cache:
+            cache.put_many(
+                [
+                    ((((f"A{i}", 1),), ((f"B{i}", 1),)), thermo(float(i)))
+                    for i in range(1200)
+                ]
+            )
+            keys = [(((f"A{i}", 1),), ((f"B{i}", 1),)) for i in range(0, 1300, 100)]
+            values = cache.get_many(keys + keys[:1])
+            self.assertListEqual(
+                [value and value["dG_prime"]["value"] for value in values],
+                [float(i) for i in range(0, 1200, 100)] + [None, 0.0],
+            )
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        with ThermoCache(self.path, max_size=2) as cache:
+            cache.put(self.rxn, thermo(1.0))
+            cache.put(self.other, thermo(2.0))
+            # self.rxn is used, self.other becomes the least recently used
+            cache.get(self.rxn)
+            third = Reaction(id="r3", reactants={"D": 1}, products={"E": 1})
+            cache.put(third, thermo(3.0))
+            self.assertEqual(len(cache), 2)
+            self.assertIn(self.rxn, cache)
+            self.assertIn(third, cache)
+            self.assertNotIn(self.other, cache)
+
+    def test_put_many_invalid(self):
+        with ThermoCache(self.path) as cache:
+            with self.assertRaises(TypeError):
+                cache.put_many([(self.rxn, thermo(1.0)), (self.other, object())])
+            self.assertEqual(len(cache), 0)
+
+    def test_concurrent_processes(self):
+        context = get_context("spawn")
+        processes = [
+            context.Process(target=put_values, args=(self.path, start))
+            for start in range(0, 200, 50)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertListEqual([process.exitcode for process in processes], [0] * 4)
+        with ThermoCache(self.path) as cache:
+            self.assertEqual(len(cache), 200)
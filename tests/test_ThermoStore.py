@@ -0,0 +1,86 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from math import isnan, sqrt
+
+from chemlite import Pathway, Reaction, ThermoStore
+
+
+def thermo(value, error, unit="kJ/mol"):
+    return {
+        "dG0_prime": {"value": value - 1, "error": error, "unit": unit},
+        "dGm_prime": {"value": value + 1, "error": error, "unit": unit},
+        "dG_prime": {"value": value, "error": error, "unit": unit},
+    }
+
+
+class Test_ThermoStore(TestCase):
+
+    def setUp(self):
+        self.r1 = Reaction(id="r1", reactants={"A": 1}, products={"B": 1})
+        self.r2 = Reaction(id="r2", reactants={"B": 1}, products={"C": 1})
+        self.r3 = Reaction(id="r3", reactants={"C": 1}, products={"D": 1})
+        self.r1_rev = Reaction(id="r1_rev", reactants={"B": 1}, products={"A": 1})
+        self.store = ThermoStore()
+        self.store.put(self.r1, thermo(-10.0, 3.0))
+        self.store.put(self.r2.get_key(), thermo(5.0, 4.0))
+        self.pathway = Pathway(id="thermo")
+        for rxn in (self.r1, self.r2, self.r3):
+            self.pathway.add_reaction(rxn)
+
+    def test_get(self):
+        self.assertEqual(len(self.store), 2)
+        self.assertIn(self.r1, self.store)
+        self.assertNotIn(self.r3, self.store)
+        self.assertDictEqual(self.store.get(self.r1), thermo(-10.0, 3.0))
+        self.assertIsNone(self.store.get(self.r3))
+        self.assertEqual(self.store.get_unit("dG_prime"), "kJ/mol")
+
+    def test_get_reverse(self):
+        self.assertIn(self.r1_rev, self.store)
+        self.assertEqual(self.store.get(self.r1_rev)["dG_prime"]["value"], 10.0)
+        self.assertEqual(self.store.get(self.r1_rev)["dG_prime"]["error"], 3.0)
+
+    def test_put_replace(self):
+        self.store.put(self.r1, {"dG_prime": {"value": 1.0, "error": 0.5}})
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get(self.r1)["dG_prime"]["value"], 1.0)
+        self.assertTrue(isnan(self.store.get(self.r1)["dG0_prime"]["value"]))
+
+    def test_put_unit_changed(self):
+        with self.assertLogs(level="WARNING"):
+            self.store.put(self.r3, thermo(0.0, 0.0, unit="kcal/mol"))
+        self.assertEqual(self.store.get_unit("dG_prime"), "kcal/mol")
+
+    def test_aggregate(self):
+        self.assertDictEqual(
+            self.store.aggregate(self.pathway),
+            {
+                "value": -5.0,
+                "error": 5.0,
+                "unit": "kJ/mol",
+                "worst": "r2",
+                "missing": ["r3"],
+            },
+        )
+        self.assertEqual(
+            self.store.aggregate(self.pathway, quantity="dG0_prime")["value"], -7.0
+        )
+
+    def test_aggregate_pathways(self):
+        other = Pathway(id="thermo_other")
+        other.add_reaction(self.r1_rev)
+        other.add_reaction(self.r1)
+        empty = Pathway(id="thermo_empty")
+        aggregated = self.store.aggregate_pathways([self.pathway, other, empty])
+        self.assertListEqual([item["value"] for item in aggregated], [-5.0, 0.0, 0.0])
+        self.assertListEqual(
+            [item["error"] for item in aggregated], [5.0, sqrt(18), 0.0]
+        )
+        self.assertListEqual(
+            [item["worst"] for item in aggregated], ["r2", "r1_rev", None]
+        )
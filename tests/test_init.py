@@ -0,0 +1,53 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from subprocess import run
+from sys import executable
+
+import chemlite
+
+
+def run_python(code: str) -> str:
+    return run(
+        [executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+class Test_init(TestCase):
+
+    def test_lazy_import(self):
+        self.assertEqual(
+            run_python(
+                "import sys, chemlite;"
+                "print(sorted(m for m in sys.modules if m.startswith(('chemlite', 'brs_utils'))))"
+            ),
+            "['chemlite', 'chemlite._version']",
+        )
+
+    def test_classes_not_shadowed_by_submodules(self):
+        self.assertEqual(
+            run_python(
+                "import chemlite.Pathway, chemlite.Reaction;"
+                "from chemlite import Pathway, Reaction, Compound;"
+                "print(Pathway.__name__, Reaction.__name__, Compound.__name__)"
+            ),
+            "Pathway Reaction Compound",
+        )
+
+    def test_getattr(self):
+        from chemlite.Reaction import Reaction
+
+        self.assertIs(chemlite.Reaction, Reaction)
+
+    def test_getattr_unknown(self):
+        with self.assertRaises(AttributeError):
+            chemlite.unknown
+
+    def test_all(self):
+        for name in chemlite.__all__:
+            self.assertTrue(hasattr(chemlite, name))
+        self.assertIn("Reaction", dir(chemlite))
@@ -0,0 +1,94 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from os import path as os_path
+from tempfile import TemporaryDirectory
+
+from brs_utils import Cache
+from chemlite import Pathway, Reaction
+from chemlite.loader import aload_pathways, load_pathway
+from chemlite.serializer import dump_pathway
+
+
+async def collect(paths, **kwargs):
+    return [pathway async for pathway in aload_pathways(paths, **kwargs)]
+
+
+class Test_loader(TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.pathways = []
+        self.paths = []
+        for i in range(10):
+            pathway = Pathway(id=f"loader_{i}")
+            pathway.add_reaction(
+                Reaction(
+                    id=f"rxn_{i}",
+                    reactants={"MNXM1": 1, f"CMPD_{i}": 1},
+                    products={f"CMPD_{i + 1}": 2},
+                )
+            )
+            pathway.set_target_id(f"CMPD_{i + 1}")
+            path = os_path.join(self.tmpdir.name, f"{pathway.get_id()}.json")
+            with open(path, "w") as fp:
+                dump_pathway(pathway, fp)
+            self.pathways.append(pathway)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_pathway(self):
+        pathway = load_pathway(self.paths[0])
+        # no ID in the file, named after it
+        self.assertEqual(pathway.get_id(), "loader_0")
+        self.assertEqual(pathway, self.pathways[0])
+
+    def test_load_pathway_missing_species(self):
+        pathway = Pathway(id="loader_missing")
+        pathway.add_reaction(
+            Reaction(id="rxn", reactants={"LOADER_MISSING": 1}, products={"X": 1})
+        )
+        # species missing from the cache are serialized as null
+        Cache.remove_object_by_id("LOADER_MISSING")
+        path = os_path.join(self.tmpdir.name, "missing.json")
+        with open(path, "w") as fp:
+            dump_pathway(pathway, fp, full=True)
+        self.assertEqual(load_pathway(path), pathway)
+        # replaced by a placeholder
+        self.assertIsNotNone(Cache.get("LOADER_MISSING"))
+
+    def test_aload_pathways(self):
+        pathways = run(collect(self.paths, concurrency=3))
+        self.assertListEqual(pathways, self.pathways)
+        self.assertListEqual(
+            [pathway.get_id() for pathway in pathways],
+            [pathway.get_id() for pathway in self.pathways],
+        )
+
+    def test_aload_pathways_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pathways = run(collect(iter(self.paths), executor=executor))
+        self.assertListEqual(pathways, self.pathways)
+
+    def test_aload_pathways_break(self):
+        async def first():
+            async for pathway in aload_pathways(self.paths, concurrency=2):
+                return pathway
+
+        self.assertEqual(run(first()), self.pathways[0])
+
+    def test_aload_pathways_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            run(collect(self.paths + ["missing.json"]))
+
+    def test_aload_pathways_wrong_concurrency(self):
+        with self.assertRaises(ValueError):
+            run(collect(self.paths, concurrency=0))
@@ -0,0 +1,102 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+import tracemalloc
+from sys import getsizeof
+
+from chemlite import Pathway, Reaction, Compound
+from chemlite.memory import (
+    deep_sizeof,
+    memory_footprint,
+    registry_footprint,
+    AllocationProfiler,
+)
+
+
+class Test_memory(TestCase):
+
+    def setUp(self):
+        self.cmpd = Compound(id="MEM_CMPD_1", smiles="CCO", inchikey="LFQSCWFLJHTTHZ")
+        self.rxn = Reaction(
+            id="mem_rxn_1",
+            ec_numbers=["1.1.1.1"],
+            reactants={"MEM_CMPD_1": 1, "MEM_CMPD_2": 2},
+            products={"MEM_CMPD_3": 1},
+        )
+        self.pathway = Pathway(id="mem_pathway")
+        self.pathway.add_reaction(self.rxn)
+
+    def test_deep_sizeof(self):
+        s = "a string"
+        self.assertEqual(deep_sizeof([s, s]), getsizeof([s, s]) + getsizeof(s))
+
+    def test_deep_sizeof_seen(self):
+        s = "a string"
+        seen = set()
+        deep_sizeof(s, seen)
+        self.assertEqual(deep_sizeof([s], seen), getsizeof([s]))
+
+    def test_memory_footprint_compound(self):
+        footprint = memory_footprint(self.cmpd)
+        for component in ["ids", "smiles", "inchikey", "logger", "object"]:
+            self.assertIn(component, footprint)
+        self.assertGreaterEqual(footprint["smiles"], getsizeof("CCO"))
+        self.assertEqual(
+            footprint["total"],
+            sum(size for key, size in footprint.items() if key != "total"),
+        )
+
+    def test_memory_footprint_reaction(self):
+        footprint = memory_footprint(self.rxn)
+        self.assertGreater(footprint["stoichiometry"], 0)
+        self.assertGreater(footprint["ec_numbers"], 0)
+
+    def test_memory_footprint_pathway(self):
+        rxn_footprint = memory_footprint(self.rxn)
+        footprint = memory_footprint(self.pathway)
+        self.assertGreater(footprint["reactions"], 0)
+        self.assertEqual(footprint["stoichiometry"], rxn_footprint["stoichiometry"])
+        self.assertGreater(footprint["total"], rxn_footprint["total"])
+
+    def test_registry_footprint(self):
+        footprint = registry_footprint()
+        self.assertGreaterEqual(footprint["nb_compounds"], 3)
+        self.assertGreater(footprint["smiles"], 0)
+        self.assertGreater(footprint["registry"], 0)
+
+    def test_allocation_profiler(self):
+        with AllocationProfiler() as profiler:
+            dicts = [self.rxn._to_dict() for _ in range(100)]
+        self.assertEqual(len(dicts), 100)
+        report = profiler.report()
+        self.assertIn("Reaction._to_dict", [site["function"] for site in report])
+        self.assertTrue(all(site["site"].startswith("chemlite") for site in report))
+        self.assertGreater(profiler.get_peak(), 0)
+
+    def test_allocation_profiler_outer_tracing(self):
+        tracemalloc.start(10)
+        try:
+            before = [self.rxn.copy() for _ in range(100)]
+            nb_traces = len(tracemalloc.take_snapshot().traces)
+            with AllocationProfiler() as profiler:
+                dicts = [self.rxn._to_dict() for _ in range(100)]
+            # traces of the caller are kept
+            self.assertTrue(tracemalloc.is_tracing())
+            self.assertGreaterEqual(len(tracemalloc.take_snapshot().traces), nb_traces)
+            # and not attributed to the context
+            functions = [site["function"] for site in profiler.report()]
+            self.assertIn("Reaction._to_dict", functions)
+            self.assertNotIn("Reaction.copy", functions)
+            self.assertEqual(len(before) + len(dicts), 200)
+        finally:
+            tracemalloc.stop()
+
+    def test_allocation_profiler_top(self):
+        with AllocationProfiler() as profiler:
+            dicts = [self.rxn._to_dict() for _ in range(100)]
+        self.assertEqual(len(dicts), 100)
+        self.assertEqual(len(profiler.report(top=1)), 1)
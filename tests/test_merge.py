@@ -0,0 +1,124 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+
+from brs_utils import Cache
+from chemlite import Compound, Pathway, Reaction, CompoundIndex, FrozenReaction
+from chemlite.merge import group_compounds, merge_compounds
+
+INCHIKEY = "MERGETESTAAAAA-UHFFFAOYSA-N"
+
+
+class Test_merge(TestCase):
+
+    def setUp(self):
+        self.cmpd = Compound(id="MERGE_A", inchikey=INCHIKEY, smiles="O")
+        self.mnx = Compound(id="MERGE_B", inchikey=INCHIKEY, name="H2O")
+        self.relaxed = Compound(
+            id="MERGE_B_ISO", inchikey="MERGETESTAAAAA-UHFFFAOYSA-O"
+        )
+        self.other = Compound(id="MERGE_C", inchikey="MERGETESTCCCCC-UHFFFAOYSA-N")
+        self.rxn = Reaction(
+            id="rxn_1",
+            reactants={"MERGE_A": 1, "MERGE_B": 2, "MERGE_C": 1},
+            products={"MERGE_D": 1},
+        )
+        self.rxn_2 = Reaction(
+            id="rxn_2", reactants={"MERGE_D": 1}, products={"MERGE_B": 1}
+        )
+        self.pathway = Pathway(id="pathway")
+        self.pathway.set_target_id("MERGE_B")
+        self.pathway.add_reaction(self.rxn)
+        self.pathway.add_reaction(self.rxn_2)
+
+    def tearDown(self):
+        for compound in (self.cmpd, self.mnx, self.relaxed, self.other):
+            CompoundIndex.remove_compound(compound)
+            Cache.remove_object_by_id(compound.get_id())
+
+    def test_group_compounds(self):
+        compounds = [self.cmpd, self.mnx, self.relaxed, self.other]
+        self.assertListEqual(group_compounds(compounds), [[self.cmpd, self.mnx]])
+        self.assertListEqual(
+            group_compounds(compounds, relaxed=True),
+            [[self.cmpd, self.mnx, self.relaxed]],
+        )
+        self.assertIn([self.cmpd, self.mnx], group_compounds())
+
+    def test_merge_compounds(self):
+        mapping = merge_compounds(
+            pathways=[self.pathway], compounds=[self.cmpd, self.mnx, self.other]
+        )
+        self.assertDictEqual(mapping, {"MERGE_B": "MERGE_A"})
+        # coefficients of merged species are summed
+        self.assertDictEqual(
+            self.pathway.get_reaction("rxn_1").get_reactants(),
+            {"MERGE_A": 3, "MERGE_C": 1},
+        )
+        self.assertDictEqual(
+            self.pathway.get_reaction("rxn_2").get_products(), {"MERGE_A": 1}
+        )
+        self.assertEqual(self.pathway.get_target_id(), "MERGE_A")
+        # reactions of pathways are copied before being rewritten
+        self.assertDictEqual(self.rxn_2.get_products(), {"MERGE_B": 1})
+        # representative completed, merged compound removed
+        self.assertEqual(self.cmpd.get_name(), "H2O")
+        self.assertIsNone(Cache.get("MERGE_B"))
+        self.assertListEqual(CompoundIndex.find_by_inchikey(INCHIKEY), [self.cmpd])
+
+    def test_merge_compounds_copy(self):
+        copy = self.pathway.copy()
+        merge_compounds(pathways=[copy], compounds=[self.cmpd, self.mnx])
+        self.assertDictEqual(
+            copy.get_reaction("rxn_1").get_reactants(),
+            {"MERGE_A": 3, "MERGE_C": 1},
+        )
+        # the original pathway is left untouched
+        self.assertIs(self.pathway.get_reaction("rxn_1"), self.rxn)
+        self.assertEqual(self.rxn.get_reactant("MERGE_B"), 2)
+        self.assertEqual(self.pathway.get_target_id(), "MERGE_B")
+
+    def test_merge_compounds_frozen(self):
+        FrozenReaction.intern_pathway(self.pathway)
+        frozen = self.pathway.get_reaction("rxn_1")
+        self.assertTrue(frozen.is_frozen())
+        # frozen reactions given as such cannot be rewritten, nothing is merged
+        self.assertRaises(
+            TypeError,
+            merge_compounds,
+            reactions=[frozen],
+            compounds=[self.cmpd, self.mnx],
+        )
+        self.assertIs(Cache.get("MERGE_B"), self.mnx)
+        # those of pathways are replaced by rewritten copies
+        merge_compounds(pathways=[self.pathway], compounds=[self.cmpd, self.mnx])
+        self.assertDictEqual(
+            self.pathway.get_reaction("rxn_1").get_reactants(),
+            {"MERGE_A": 3, "MERGE_C": 1},
+        )
+        self.assertEqual(frozen.get_reactant("MERGE_B"), 2)
+        self.assertIsNone(Cache.get("MERGE_B"))
+
+    def test_merge_compounds_relaxed_choose(self):
+        mapping = merge_compounds(
+            reactions=[self.rxn],
+            compounds=[self.cmpd, self.mnx, self.relaxed],
+            relaxed=True,
+            choose=lambda group: group[1],
+            remove=False,
+        )
+        self.assertDictEqual(mapping, {"MERGE_A": "MERGE_B", "MERGE_B_ISO": "MERGE_B"})
+        self.assertDictEqual(self.rxn.get_reactants(), {"MERGE_C": 1, "MERGE_B": 3})
+        # reactions not given are left untouched
+        self.assertDictEqual(self.rxn_2.get_products(), {"MERGE_B": 1})
+        self.assertIs(Cache.get("MERGE_A"), self.cmpd)
+
+    def test_merge_compounds_nothing(self):
+        self.assertDictEqual(
+            merge_compounds(reactions=[self.rxn], compounds=[self.other]), {}
+        )
+        self.assertEqual(self.rxn.get_reactant("MERGE_B"), 2)
@@ -0,0 +1,105 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+
+from chemlite import Pathway, Reaction
+from chemlite.metrics import Metrics
+
+
+class Test_Metrics(TestCase):
+
+    def setUp(self):
+        Metrics.reset()
+        self.rxn = Reaction(
+            id="metrics_rxn",
+            reactants={"METRICS_CMPD_1": 1},
+            products={"METRICS_CMPD_2": 1},
+        )
+        self.pathway = Pathway(id="metrics_pathway")
+        self.pathway.add_reaction(self.rxn)
+
+    def tearDown(self):
+        Metrics.disable()
+        Metrics.reset()
+
+    def test_disabled(self):
+        parse = Reaction.__dict__["parse"]
+        Reaction.parse("A = B")
+        self.assertFalse(Metrics.is_enabled())
+        self.assertDictEqual(Metrics.get_timers(), {})
+        self.assertIs(Reaction.__dict__["parse"], parse)
+
+    def test_enable_disable(self):
+        parse = Reaction.__dict__["parse"]
+        eq = Pathway.__dict__["__eq__"]
+        Metrics.enable()
+        Metrics.enable()
+        self.assertTrue(Metrics.is_enabled())
+        self.assertIsNot(Reaction.__dict__["parse"], parse)
+        Metrics.disable()
+        self.assertIs(Reaction.__dict__["parse"], parse)
+        self.assertIs(Pathway.__dict__["__eq__"], eq)
+
+    def test_timers(self):
+        Metrics.enable()
+        Reaction.parse("A = B")
+        Reaction.parse("A = C")
+        self.rxn.get_smiles()
+        self.pathway._to_dict()
+        self.assertEqual(self.pathway, self.pathway)
+        self.pathway.net_reaction()
+        timers = Metrics.get_timers()
+        self.assertEqual(timers["Reaction.parse"]["calls"], 2)
+        self.assertEqual(timers["Reaction.get_smiles"]["calls"], 1)
+        self.assertEqual(timers["Reaction._to_dict"]["calls"], 1)
+        self.assertEqual(timers["Pathway._to_dict"]["calls"], 1)
+        self.assertEqual(timers["Pathway.__eq__"]["calls"], 1)
+        self.assertEqual(timers["Pathway.net_reaction"]["calls"], 1)
+        self.assertGreaterEqual(
+            timers["Reaction.parse"]["total"], timers["Reaction.parse"]["max"]
+        )
+
+    def test_results_unchanged(self):
+        expected = Reaction.parse("2 A + B = C")
+        Metrics.enable()
+        self.assertDictEqual(Reaction.parse("2 A + B = C"), expected)
+
+    def test_registry_counters(self):
+        Metrics.enable()
+        Reaction(
+            id="metrics_rxn_2",
+            reactants={"METRICS_CMPD_1": 1},
+            products={"METRICS_CMPD_NEW": 1},
+        )
+        counters = Metrics.get_counters()
+        self.assertEqual(counters["registry_lookups"], 2)
+        self.assertEqual(counters["registry_misses"], 1)
+
+    def test_reset(self):
+        Metrics.enable()
+        Reaction.parse("A = B")
+        Metrics.reset()
+        self.assertDictEqual(Metrics.get_timers(), {})
+        self.assertDictEqual(Metrics.get_counters(), {})
+
+    def test_summary(self):
+        Metrics.enable()
+        Reaction.parse("A = B")
+        Metrics.incr("custom")
+        summary = Metrics.summary()
+        self.assertIn("Reaction.parse", summary)
+        self.assertIn("custom", summary)
+
+    def test_to_prometheus(self):
+        Metrics.enable()
+        Reaction.parse("A = B")
+        Reaction(id="metrics_rxn_3", reactants={"METRICS_CMPD_1": 1})
+        text = Metrics.to_prometheus()
+        self.assertIn("# TYPE chemlite_calls_total counter", text)
+        self.assertIn('chemlite_calls_total{operation="Reaction.parse"} 1', text)
+        self.assertIn("chemlite_registry_lookups_total 1", text)
+        self.assertTrue(text.endswith("\n"))
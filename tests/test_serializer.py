@@ -0,0 +1,190 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase, skipIf
+from io import BytesIO, StringIO
+from json import dumps as json_dumps, loads as json_loads
+from os import path as os_path
+from json import load as jsload
+
+from chemlite import Pathway, Reaction, Compound
+from chemlite.settings import set_performance_mode
+from chemlite.serializer import (
+    dumps_pathway,
+    dump_pathway,
+    dump_pathways,
+    dumps_reaction,
+    dump_reactions_smiles,
+    iter_reactions_smiles,
+    orjson,
+)
+
+HERE = os_path.dirname(os_path.realpath(__file__))
+DATA_PATH = os_path.join(HERE, "data")
+
+
+class Test_serializer(TestCase):
+
+    def setUp(self):
+        with open(os_path.join(DATA_PATH, "compounds.json"), "r") as fp:
+            species = jsload(fp)
+        for spe_id in species:
+            Compound(**species[spe_id])
+        self.pathway = Pathway(id="serializer_pathway")
+        self.pathway.add_reaction(
+            Reaction(
+                id="rxn_2",
+                ec_numbers=["4.1.1.63"],
+                reactants={"CMPD_0000000010": 1, "MNXM1": 1},
+                products={"MNXM13": 1, "CMPD_0000000003": 1.5},
+            )
+        )
+        self.pathway.add_reaction(
+            Reaction(
+                id="rxn_1",
+                reactants={"MNXM337": 2},
+                products={"CMPD_0000000025": 1, "MNXM23": 1},
+            )
+        )
+        self.pathway.set_target_id("CMPD_0000000003")
+
+    def test_dumps_pathway(self):
+        self.assertDictEqual(
+            json_loads(dumps_pathway(self.pathway, use_orjson=False)),
+            self.pathway._to_dict(),
+        )
+
+    def test_dumps_pathway_full(self):
+        self.assertDictEqual(
+            json_loads(dumps_pathway(self.pathway, full=True, use_orjson=False)),
+            self.pathway._to_dict(full=True),
+        )
+
+    def test_dumps_pathway_sorted(self):
+        json = dumps_pathway(self.pathway, use_orjson=False)
+        self.assertLess(json.index('"CMPD_0000000003":1.5'), json.index('"MNXM13":1'))
+
+    def test_dumps_pathway_non_str_rxn_id(self):
+        pathway = Pathway(id="serializer_pathway_int")
+        pathway.add_reaction(Reaction(id=0, reactants={"MNXM1": 1}))
+        self.assertDictEqual(
+            json_loads(dumps_pathway(pathway, use_orjson=False)),
+            json_loads(json_dumps(pathway._to_dict())),
+        )
+
+    def test_dump_pathway_text(self):
+        fp = StringIO()
+        dump_pathway(self.pathway, fp, use_orjson=False)
+        self.assertDictEqual(json_loads(fp.getvalue()), self.pathway._to_dict())
+
+    def test_dump_pathway_bytes(self):
+        fp = BytesIO()
+        dump_pathway(self.pathway, fp, use_orjson=False)
+        self.assertDictEqual(json_loads(fp.getvalue()), self.pathway._to_dict())
+
+    def test_dump_pathways(self):
+        fp = StringIO()
+        self.assertEqual(
+            dump_pathways([self.pathway, self.pathway], fp, use_orjson=False), 2
+        )
+        lines = fp.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        for line in lines:
+            self.assertDictEqual(json_loads(line), self.pathway._to_dict())
+        fp = StringIO()
+        dump_pathways([self.pathway], fp, full=True, use_orjson=False)
+        self.assertDictEqual(
+            json_loads(fp.getvalue()), self.pathway._to_dict(full=True)
+        )
+
+    def test_dumps_reaction(self):
+        rxn = self.pathway.get_reaction("rxn_2")
+        self.assertDictEqual(json_loads(dumps_reaction(rxn)), rxn._to_dict())
+        self.assertDictEqual(
+            json_loads(dumps_reaction(rxn, full=True)), rxn._to_dict(full=True)
+        )
+
+    def test_iter_reactions_smiles(self):
+        reactions = self.pathway.get_list_of_reactions()
+        set_performance_mode(True)
+        try:
+            expected = [(rxn.get_id(), rxn.get_smiles()) for rxn in reactions]
+        finally:
+            set_performance_mode(False)
+        report = {}
+        self.assertListEqual(list(iter_reactions_smiles(reactions, report)), expected)
+        self.assertEqual(report["reactions"], 2)
+        self.assertDictEqual(report["rounded"], {"CMPD_0000000003": 1})
+
+    def test_dump_reactions_smiles(self):
+        reactions = self.pathway.get_list_of_reactions() + [
+            Reaction(id="rxn_3", reactants={"SERIALIZER_NO_SMILES": 1})
+        ]
+        fp = StringIO()
+        with self.assertLogs("chemlite.serializer", "WARNING") as logs:
+            report = dump_reactions_smiles(reactions, fp)
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("SERIALIZER_NO_SMILES", logs.output[0])
+        self.assertDictEqual(report["missing_smiles"], {"SERIALIZER_NO_SMILES": 1})
+        lines = fp.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[2], "rxn_3\t>>")
+        self.assertEqual(
+            lines[0].split("\t")[1],
+            next(iter_reactions_smiles(reactions[:1]))[1],
+        )
+
+    def test_dump_reactions_smiles_bytes_wo_ids(self):
+        fp = BytesIO()
+        dump_reactions_smiles(self.pathway.get_list_of_reactions()[1:], fp, False)
+        self.assertEqual(fp.getvalue().count(b">>"), 1)
+        self.assertNotIn(b"rxn_1", fp.getvalue())
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_dumps_pathway_orjson(self):
+        self.assertDictEqual(
+            json_loads(dumps_pathway(self.pathway, full=True, use_orjson=True)),
+            self.pathway._to_dict(full=True),
+        )
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_dump_pathways_orjson(self):
+        fp = BytesIO()
+        dump_pathways([self.pathway], fp, full=True, use_orjson=True)
+        self.assertDictEqual(
+            json_loads(fp.getvalue()), self.pathway._to_dict(full=True)
+        )
+
+    def test_dumps_pathway_not_finite(self):
+        pathway = Pathway(id="serializer_pathway_nan")
+        pathway.add_reaction(
+            Reaction(id="rxn", reactants={"MNXM1": float("nan")}, products={})
+        )
+        self.assertIn('"MNXM1":null', dumps_pathway(pathway, use_orjson=False))
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_dumps_pathway_same_as_orjson(self):
+        Compound(id="SERIALIZER_NON_ASCII", name="β-carotène\n")
+        pathway = Pathway(id="serializer_pathway_orjson")
+        pathway.add_reaction(
+            Reaction(
+                id="rxn",
+                reactants={"SERIALIZER_NON_ASCII": 1.5e-5, "MNXM1": float("nan")},
+                products={"MNXM2": 1e20, "MNXM4": 2.5e-7, "MNXM5": float("inf")},
+            )
+        )
+        pathway.add_reaction(self.pathway.get_reaction("rxn_2"))
+        pathway.set_target_id("MNXM2")
+        for full in (False, True):
+            self.assertEqual(
+                dumps_pathway(pathway, full, use_orjson=False),
+                dumps_pathway(pathway, full, use_orjson=True),
+            )
+
+    @skipIf(orjson is not None, "orjson is installed")
+    def test_use_orjson_not_installed(self):
+        with self.assertRaises(ImportError):
+            dumps_pathway(self.pathway, use_orjson=True)
@@ -0,0 +1,21 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+
+from chemlite.settings import set_performance_mode, is_performance_mode
+
+
+class Test_settings(TestCase):
+
+    def tearDown(self):
+        set_performance_mode(False)
+
+    def test_set_performance_mode(self):
+        set_performance_mode(True)
+        self.assertTrue(is_performance_mode())
+        set_performance_mode(False)
+        self.assertFalse(is_performance_mode())
@@ -0,0 +1,147 @@
+"""
+Created on Oct 19 2026
+
+@author: Joan Hérisson
+"""
+
+from unittest import TestCase
+from glob import glob
+from io import StringIO
+from json import loads
+from os import path as os_path
+from tempfile import TemporaryDirectory
+
+from chemlite import Pathway, Reaction
+from chemlite.serializer import dumps_pathway, dumps_reaction
+from chemlite.shard import (
+    get_pathway_key,
+    get_reaction_key,
+    get_shard,
+    get_shard_path,
+    main,
+    merge_shards,
+    shard_lines,
+    shard_pathways,
+    shard_reactions,
+)
+
+
+class Test_shard(TestCase):
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.pathways = []
+        for i in range(40):
+            pathway = Pathway(id=f"shard_{i}")
+            pathway.add_reaction(
+                Reaction(
+                    id=f"rxn_{i}",
+                    reactants={"MNXM1": 1, f"CMPD_{i}": 1},
+                    products={f"CMPD_{i + 1}": 2},
+                )
+            )
+            # 10 targets, 4 pathways each
+            pathway.set_target_id(f"TARGET_{i % 10}")
+            self.pathways.append(pathway)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_shards(self, directory, nb_shards):
+        return [
+            [loads(line) for line in open(get_shard_path(directory, i, nb_shards))]
+            for i in range(nb_shards)
+        ]
+
+    def test_get_shard(self):
+        # stable across processes (not hash())
+        self.assertEqual(get_shard("TARGET", 1000), get_shard("TARGET", 1000))
+        self.assertEqual(get_shard("TARGET", 1), 0)
+        shards = {get_shard(str(i), 8) for i in range(1000)}
+        self.assertSetEqual(shards, set(range(8)))
+
+    def test_get_reaction_key(self):
+        rxn = Reaction(id="rxn", reactants={"A": 1, "B": 2.5}, products={"C": 1})
+        same = Reaction(id="other", reactants={"B": 2.5, "A": 1.0}, products={"C": 1})
+        self.assertEqual(get_reaction_key(rxn), get_reaction_key(same))
+        obj = loads(dumps_reaction(rxn, full=True))
+        self.assertEqual(get_reaction_key(rxn), get_reaction_key(obj))
+
+    def test_get_pathway_key(self):
+        pathway = self.pathways[0]
+        obj = loads(dumps_pathway(pathway, full=True))
+        for by in ["target", "key"]:
+            self.assertEqual(get_pathway_key(pathway, by), get_pathway_key(obj, by))
+        self.assertNotEqual(
+            get_pathway_key(pathway, "key"), get_pathway_key(self.pathways[10], "key")
+        )
+        self.assertEqual(
+            get_pathway_key(pathway, "target"),
+            get_pathway_key(self.pathways[10], "target"),
+        )
+        self.assertRaises(ValueError, get_pathway_key, pathway, "id")
+
+    def test_shard_pathways(self):
+        counts = shard_pathways(self.pathways, self.tmpdir.name, 4)
+        self.assertEqual(sum(counts), len(self.pathways))
+        self.assertEqual(len(glob(os_path.join(self.tmpdir.name, "*.jsonl"))), 4)
+        shards = self.read_shards(self.tmpdir.name, 4)
+        self.assertListEqual([len(shard) for shard in shards], counts)
+        # pathways with the same target are in the same shard
+        targets = [{obj["target_id"] for obj in shard} for shard in shards]
+        self.assertEqual(sum(map(len, targets)), 10)
+        self.assertRaises(ValueError, shard_pathways, self.pathways, "x", 0)
+
+    def test_shard_lines(self):
+        # same shards from objects or their serialization
+        lines = [dumps_pathway(pathway, full=True) + "\n" for pathway in self.pathways]
+        for by in ["target", "key"]:
+            objects = os_path.join(self.tmpdir.name, f"objects_{by}")
+            text = os_path.join(self.tmpdir.name, f"text_{by}")
+            shard_pathways(self.pathways, objects, 3, by=by)
+            shard_lines(lines, text, 3, by=by)
+            self.assertListEqual(
+                self.read_shards(objects, 3), self.read_shards(text, 3)
+            )
+
+    def test_shard_reactions(self):
+        reactions = [
+            rxn for pathway in self.pathways for rxn in pathway.get_list_of_reactions()
+        ]
+        counts = shard_reactions(reactions, self.tmpdir.name, 5)
+        self.assertEqual(sum(counts), len(reactions))
+        ids = {
+            obj["id"]
+            for shard in self.read_shards(self.tmpdir.name, 5)
+            for obj in shard
+        }
+        self.assertSetEqual(ids, {rxn.get_id() for rxn in reactions})
+
+    def test_merge_shards(self):
+        shard_pathways(self.pathways, self.tmpdir.name, 4)
+        paths = sorted(glob(os_path.join(self.tmpdir.name, "*.jsonl")))
+        merged, reversed_ = StringIO(), StringIO()
+        self.assertEqual(merge_shards(paths, merged), len(self.pathways))
+        merge_shards(paths[::-1], reversed_)
+        # deterministic whatever the order of shards
+        self.assertEqual(merged.getvalue(), reversed_.getvalue())
+        self.assertSetEqual(
+            {loads(line)["id"] for line in merged.getvalue().splitlines()},
+            {pathway.get_id() for pathway in self.pathways},
+        )
+
+    def test_main(self):
+        inputs = os_path.join(self.tmpdir.name, "pathways.jsonl")
+        with open(inputs, "w") as fp:
+            for pathway in self.pathways:
+                fp.write(dumps_pathway(pathway, full=True) + "\n")
+        shards = os_path.join(self.tmpdir.name, "shards")
+        self.assertEqual(
+            main(["split", "--shards", "3", "--output-dir", shards, inputs]), 0
+        )
+        paths = glob(os_path.join(shards, "*.jsonl"))
+        self.assertEqual(len(paths), 3)
+        output = os_path.join(self.tmpdir.name, "merged.jsonl")
+        main(["merge", "--output", output, *paths])
+        with open(output) as fp:
+            self.assertEqual(len(fp.readlines()), len(self.pathways))